@@ -7,6 +7,7 @@ including the API, Request, and Response classes.
 
 from . import ext
 from .__version__ import __version__
+from .concurrency import inline
 from .core import (
     API,
     DependencyCycleError,
@@ -42,5 +43,6 @@ __all__ = [
     "Path",
     "Form",
     "File",
+    "inline",
     "ext",
 ]
@@ -20,7 +20,6 @@ from starlette.middleware.errors import ServerErrorMiddleware
 from starlette.middleware.exceptions import ExceptionMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
-from starlette.middleware.sessions import SessionMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 from starlette.responses import JSONResponse, PlainTextResponse
 from starlette.responses import Response as StarletteResponse
@@ -28,6 +27,8 @@ from starlette.types import ASGIApp
 
 from . import status_codes
 from .background import BackgroundQueue
+from .concurrency import INLINE_WARN_THRESHOLD
+from .concurrency import inline as _mark_inline
 from .errors import (
     INTERNAL_SERVER_ERROR,
     PROBLEM_JSON,
@@ -42,6 +43,7 @@ from .routes import Router, _is_pydantic_model
 from .routing import _AUTH_UNSET as _ROUTER_AUTH_UNSET
 from .routing import Router as _IncludableRouter
 from .routing import _normalize_prefix, _prefix_scoped_hook
+from .scheduling import CronSchedule, ScheduledTask
 from .staticfiles import StaticFiles
 from .statics import DEFAULT_CORS_PARAMS, DEFAULT_OPENAPI_THEME
 from .templates import Templates
@@ -283,6 +285,7 @@ class API:
         openapi=None,
         openapi_servers=None,
         openapi_route="/schema.yml",
+        openapi_file=None,
         static_dir=_UNSET,
         static_route="/static",
         templates_dir="templates",
@@ -299,6 +302,7 @@ class API:
         gzip=True,
         request_id=False,
         enable_logging=False,
+        access_log=None,
         trust_proxy_headers=False,
         redirect_slashes=True,
         max_request_size=None,
@@ -307,6 +311,8 @@ class API:
         request_timeout=None,
         ws_idle_timeout=None,
         trace_dispatch=False,
+        slow_request_threshold=None,
+        inline_warn_threshold=INLINE_WARN_THRESHOLD,
         sessions="auto",
         session_backend=None,
         session_cookie=None,
@@ -314,12 +320,24 @@ class API:
         session_same_site="lax",
         session_max_age=14 * 24 * 3600,
         metrics_route=None,
+        metrics_buckets=None,
+        metrics_dir=None,
+        server_timing=False,
+        profiling_route=None,
+        profiling_auth=None,
+        loop_monitor=False,
+        max_loop_lag=None,
+        max_in_flight=None,
         health_route=None,
         encoder=None,
         json_ensure_ascii=False,
         problem_details=True,
         problem_handler=None,
         auth=None,
+        rate_limit_backend=None,
+        background=None,
+        background_loop="thread",
+        background_shutdown_timeout=None,
     ):
         """Create a new Responder API instance.
 
@@ -332,6 +350,7 @@ class API:
         :param license: License information dict (``name``, ``url``).
         :param openapi: The OpenAPI version string (e.g. ``"3.0.2"``). Enables OpenAPI schema generation.
         :param openapi_route: The URL path for the OpenAPI schema (default ``"/schema.yml"``).
+        :param openapi_file: Path to a prebuilt OpenAPI document (``.json`` or YAML), e.g. from ``responder openapi``. It is loaded once at startup and served instead of a schema generated from the routes. Enables OpenAPI.
         :param static_dir: Directory for static files (default ``"static"``). Mounted at ``static_route`` only if the directory exists — it is never created implicitly. A ``static_dir`` passed explicitly that doesn't exist raises ``FileNotFoundError``. Set to ``None`` to disable.
         :param static_route: URL prefix for serving static files (default ``"/static"``).
         :param templates_dir: Directory for Jinja2 templates (default ``"templates"``).
@@ -348,6 +367,7 @@ class API:
         :param gzip: If ``True`` (the default), compress responses with GZip.
         :param request_id: If ``True``, add ``X-Request-ID`` headers to all responses.
         :param enable_logging: If ``True``, enable structured logging with per-request context (request ID, method, path, client IP).
+        :param access_log: ``True`` or an :class:`~responder.ext.logging.AccessLog` to write the access log from a background thread instead of the event loop: JSON lines on stderr by default, with per-route and per-status sampling, and entries dropped (and counted) rather than blocking when a burst overflows its queue. Implies ``enable_logging``'s request context.
         :param trust_proxy_headers: If ``True``, the client IP recorded by ``enable_logging`` is read from ``X-Forwarded-For``/``X-Real-IP`` instead of the TCP peer. Only enable this behind a reverse proxy that sets those headers itself — otherwise a client can spoof its own logged IP.
         :param redirect_slashes: If ``True`` (the default), requests that miss only by a trailing slash are redirected (``307``) to the matching route.
         :param max_request_size: Maximum request body size in bytes. Bodies larger than this get a ``413`` response. ``None`` (the default) means unlimited.
@@ -356,24 +376,42 @@ class API:
         :param request_timeout: Seconds a handler may run before the request is answered with ``504 Gateway Timeout``. ``None`` (the default) means unlimited.
         :param ws_idle_timeout: Seconds a WebSocket may wait for the next inbound message before the server closes it (code ``1001``). The deadline resets on every message received, so it bounds *idle* time, not total connection lifetime. ``None`` (the default) means unlimited.
         :param trace_dispatch: If ``True``, emit debug logs for the documented route-dispatch order (before hooks, auth, dependencies, handler, after hooks).
+        :param slow_request_threshold: Seconds after which a still-running HTTP request is logged once (logger ``responder.slow``) with its route pattern, request ID, coroutine stack and, for sync handlers, the worker thread's stack. Requests are tracked by request ID, so this turns on ``request_id`` unless ``enable_logging`` is set. ``None`` (the default) disables it.
+        :param inline_warn_threshold: Under ``debug=True``, log a warning when a sync callable marked :func:`~responder.inline` (or a route with ``inline=True``) runs longer than this many seconds on the event loop (default ``0.005``). Ignored outside debug mode, where inline calls are not timed.
         :param secret_key: Signing key for cookie sessions. Defaults to ``None``: with ``sessions="auto"`` a random per-process key is generated (with a warning); the old public ``"NOTASECRET"`` default is rejected. Set this (or the ``RESPONDER_SECRET_KEY`` env var) for stable, multi-worker sessions.
         :param sessions: ``"auto"`` (default) enables cookie sessions, auto-generating an ephemeral key if none is set; ``True`` requires a real ``secret_key`` (raises otherwise); ``False`` disables sessions entirely (``req.session`` then raises).
-        :param session_backend: Store session data server-side (e.g. ``MemorySessionBackend()``, ``RedisSessionBackend()`` from ``responder.ext.sessions``) with only an opaque ID in the cookie. ``None`` (the default) keeps signed cookie-payload sessions.
+        :param session_backend: Store session data server-side (e.g. ``MemorySessionBackend()``, ``RedisSessionBackend()`` from ``responder.ext.sessions``) with only an opaque ID in the cookie. Wrap it in ``WriteBehindSessionBackend`` to flush writes in the background, in batches. ``None`` (the default) keeps signed cookie-payload sessions.
         :param session_cookie: Name of the session cookie. ``None`` (the default) keeps the underlying middleware's default name.
         :param session_https_only: Mark the session cookie ``Secure`` (only sent over HTTPS). ``None`` (the default) means Secure in production and off under ``debug``.
         :param session_same_site: ``SameSite`` policy for the session cookie: ``"lax"`` (default), ``"strict"``, or ``"none"`` (requires a Secure cookie).
         :param session_max_age: Session lifetime in seconds (default 14 days).
         :param metrics_route: URL path (e.g. ``"/metrics"``) serving request counts and latency histograms in Prometheus text format.
+        :param metrics_buckets: Latency histogram bucket bounds (seconds) for ``metrics_route``: a sequence applied to every route, or a mapping of route pattern to bounds for per-route buckets (other routes keep the defaults).
+        :param metrics_dir: Directory shared by all worker processes. When set, each worker records into memory-mapped files there and ``metrics_route`` serves the total across workers. Empty it before starting the workers (see :func:`responder.ext.metrics.reset_metrics_dir`).
+        :param server_timing: Report per-stage dispatch times (before hooks, auth, dependencies, handler, after hooks, response) in a ``Server-Timing`` response header. ``True`` for every request, a sample rate such as ``0.01``, or a predicate receiving the Starlette ``HTTPConnection`` (e.g. to only answer trusted internal callers). Works with or without ``metrics_route``, which always records the stage times as histograms.
+        :param profiling_route: URL path (e.g. ``"/debug/profile"``) of an on-demand sampling profiler: a ``GET`` samples every thread's stack for ``?seconds=`` at ``?rate=`` samples per second and returns collapsed stacks or ``?format=speedscope`` JSON (see :mod:`responder.ext.profiling`). Nothing runs until it is requested.
+        :param profiling_auth: Auth helper protecting ``profiling_route`` (e.g. ``BearerAuth(tokens=[...])``). Defaults to the app-level ``auth``; outside ``debug`` mode one of them is required.
+        :param loop_monitor: If ``True`` (or a configured :class:`~responder.ext.overload.LoopLagMonitor`), sample event-loop lag while the app runs: exported as ``responder_event_loop_lag_seconds`` with ``metrics_route``, and the loop thread's stack is logged (logger ``responder.loop``) whenever a callback blocks the loop for longer than ``slow_callback`` (default ``0.1`` seconds).
+        :param max_loop_lag: Load shedding: answer new requests with ``503`` (and ``Retry-After``) while the latest loop-lag sample exceeds this many seconds. Implies ``loop_monitor``. The health and metrics routes are always admitted.
+        :param max_in_flight: Load shedding: answer new requests with ``503`` while this many requests are already in flight.
         :param health_route: URL path (e.g. ``"/health"``) serving an aggregated readiness check (``200``/``503``); see :meth:`add_health_check`.
         :param encoder: Optional ``obj -> serializable`` callable applied across **all** response formats (JSON, YAML, MessagePack) to serialize otherwise-unsupported types. Tried first, then falls back to the built-in conversions for ``datetime``, ``UUID``, ``Decimal``, ``set``, dataclasses, and Pydantic models.
         :param json_ensure_ascii: If ``True``, escape non-ASCII in JSON as ``\\uXXXX``; ``False`` (the default since 6.0) emits raw UTF-8.
         :param problem_details: If ``True`` (the default), framework-generated errors use RFC 9457-style ``application/problem+json`` responses. Pass ``False`` to keep the legacy JSON/plain-text negotiation.
         :param problem_handler: Optional synchronous callable that can enrich or replace each problem-details payload. It receives ``(payload, request, exc)``; returning ``None`` means the payload was mutated in place.
         :param auth: Optional app-level auth helper or list of helpers. Routes inherit it by default; pass ``auth=None`` on a route to make that route public.
+        :param rate_limit_backend: Store for the per-route ``rate_limit=`` budgets (see :class:`~responder.ext.ratelimit.Limit`). Defaults to an in-process :class:`~responder.ext.ratelimit.GCRABackend`; pass a :class:`~responder.ext.ratelimit.SharedMemoryBackend` or Redis backend to share budgets between workers.
+        :param background: Optional preconfigured :class:`BackgroundQueue` (e.g. ``BackgroundQueue(max_pending=1000, on_full="drop")``) to use as ``api.background``. Defaults to an unbounded queue.
+        :param background_loop: Where ``async def`` background tasks run: ``"thread"`` (the default) uses a dedicated, persistent background event-loop thread; ``"server"`` schedules them onto the server's own event loop once the app has started.
+        :param background_shutdown_timeout: Seconds to wait at shutdown for in-flight async background tasks before cancelling them. ``None`` (the default) waits for them to finish.
         """  # noqa: E501
-        self.background = BackgroundQueue()
+        if background_loop not in ("thread", "server"):
+            raise ValueError("background_loop= must be 'thread' or 'server'")
+        self.background = background if background is not None else BackgroundQueue()
+        self._background_shutdown_timeout = background_shutdown_timeout
         self.auth_policies = {}
         self._auth = _as_tuple(auth)
+        self.rate_limit_backend = rate_limit_backend
 
         # Resolved below if cookie sessions are enabled (else stays None).
         self.secret_key = None
@@ -397,11 +435,14 @@ class API:
             ws_idle_timeout=ws_idle_timeout,
             trace_dispatch=trace_dispatch,
             problem_details=problem_details,
+            inline_warn_threshold=inline_warn_threshold if debug else None,
         )
         self.router.api = self
 
         # Drain in-flight background tasks on shutdown rather than abandoning
         # them when the process exits.
+        if background_loop == "server":
+            self.add_event_handler("startup", self._bind_background_loop)
         self.add_event_handler("shutdown", self._drain_background_tasks)
 
         static_dir_explicit = static_dir is not _UNSET
@@ -458,17 +499,73 @@ class API:
         }
         self._gzip = gzip
         self._cors_params = self.cors_params if cors else None
-        self._enable_logging = bool(enable_logging)
+        self._access_log = None
+        if access_log:
+            from .ext.logging import AccessLog
+
+            self._access_log = access_log if access_log is not True else AccessLog()
+            self.add_event_handler("shutdown", self._access_log.stop)
+        self._enable_logging = bool(enable_logging) or self._access_log is not None
         self._request_id = bool(request_id)
+        if slow_request_threshold is not None and slow_request_threshold <= 0:
+            raise ValueError("slow_request_threshold must be positive")
+        self._slow_request_threshold = slow_request_threshold
         self._trust_proxy_headers = bool(trust_proxy_headers)
         self._metrics = None
+        self._server_timing = server_timing
         self._session_mw: _MW | None = None
 
+        self.loop_monitor = None
+        if loop_monitor or max_loop_lag is not None:
+            from .ext.overload import LoopLagMonitor
+
+            if isinstance(loop_monitor, LoopLagMonitor):
+                self.loop_monitor = loop_monitor
+            else:
+                self.loop_monitor = LoopLagMonitor()
+            self.add_event_handler("startup", self.loop_monitor.start)
+            self.add_event_handler("shutdown", self.loop_monitor.stop)
+        self._admission = None
+        if max_loop_lag is not None or max_in_flight is not None:
+            from .ext.overload import AdmissionController
+
+            self._admission = AdmissionController(
+                max_lag=max_loop_lag,
+                max_in_flight=max_in_flight,
+                monitor=self.loop_monitor,
+            )
+        self._metrics_route = metrics_route
+
         if metrics_route:
-            from .ext.metrics import MetricsCollector
+            from .ext.metrics import (
+                BUCKETS,
+                MetricsCollector,
+                access_log_lines,
+                admission_lines,
+                background_queue_lines,
+                loop_lag_lines,
+                scheduled_task_lines,
+            )
 
-            self.metrics = MetricsCollector()
+            if isinstance(metrics_buckets, Mapping):
+                buckets, route_buckets = BUCKETS, metrics_buckets
+            else:
+                buckets = BUCKETS if metrics_buckets is None else metrics_buckets
+                route_buckets = None
+            self.metrics = MetricsCollector(
+                buckets=buckets,
+                route_buckets=route_buckets,
+                multiprocess_dir=metrics_dir,
+            )
             self._metrics = self.metrics
+            self.metrics.add_source(lambda: background_queue_lines(self.background))
+            self.metrics.add_source(lambda: scheduled_task_lines(self.router.scheduler))
+            if (monitor := self.loop_monitor) is not None:
+                self.metrics.add_source(lambda: loop_lag_lines(monitor))
+            if (admission := self._admission) is not None:
+                self.metrics.add_source(lambda: admission_lines(admission))
+            if (access_log := self._access_log) is not None:
+                self.metrics.add_source(lambda: access_log_lines(access_log))
 
             def _metrics_view(req, resp):
                 resp.headers["Content-Type"] = "text/plain; version=0.0.4"
@@ -476,6 +573,19 @@ class API:
 
             self.add_route(metrics_route, _metrics_view, static=False)
 
+        if profiling_route:
+            from .ext.profiling import profiling_view
+
+            if profiling_auth is None and not self._auth and not debug:
+                raise ValueError(
+                    "profiling_route exposes stack traces; protect it with "
+                    "profiling_auth= (or an app-level auth=), or use debug=True."
+                )
+            auth_option = {} if profiling_auth is None else {"auth": profiling_auth}
+            self.route(
+                profiling_route, methods=["GET"], include_in_schema=False, **auth_option
+            )(profiling_view())
+
         self._health_checks: dict[str, Callable] = {}
         self._health_route = health_route
         self._health_route_added = False
@@ -512,7 +622,10 @@ class API:
                 "max_age": session_max_age,
             }
             if session_backend is not None:
-                from .ext.sessions import ServerSessionMiddleware
+                from .ext.sessions import (
+                    ServerSessionMiddleware,
+                    WriteBehindSessionBackend,
+                )
 
                 opts = dict(common_opts)
                 if session_cookie is not None:
@@ -520,8 +633,11 @@ class API:
                 self._session_mw = _MW(
                     ServerSessionMiddleware, {"backend": session_backend, **opts}
                 )
+                if isinstance(session_backend, WriteBehindSessionBackend):
+                    self.add_event_handler("startup", session_backend.start)
+                    self.add_event_handler("shutdown", session_backend.stop)
             else:
-                from .ext.sessions import resolve_secret_key
+                from .ext.sessions import CookieSessionMiddleware, resolve_secret_key
 
                 self.secret_key = resolve_secret_key(
                     secret_key, sessions=sessions, debug=debug
@@ -530,10 +646,10 @@ class API:
                 if session_cookie is not None:
                     opts["session_cookie"] = session_cookie
                 self._session_mw = _MW(
-                    SessionMiddleware, {"secret_key": self.secret_key, **opts}
+                    CookieSessionMiddleware, {"secret_key": self.secret_key, **opts}
                 )
 
-        if openapi or docs_route:
+        if openapi or docs_route or openapi_file:
             try:
                 from .ext.openapi import OpenAPISchema
             except ImportError as ex:
@@ -556,6 +672,7 @@ class API:
                 static_route=static_route,
                 openapi_theme=openapi_theme,
                 servers=openapi_servers,
+                openapi_file=openapi_file,
             )
             for auth_scheme in self._auth:
                 if _auth_has_security_scheme(auth_scheme):
@@ -787,9 +904,9 @@ class API:
     def build_middleware_stack(self) -> ASGIApp:
         """Assemble the full ASGI stack from the collected configuration.
 
-        Outermost → innermost: logging/request-id → metrics → ServerError →
-        user middleware → trusted-host → hsts → cors → sessions → gzip →
-        ExceptionMiddleware → router. ServerErrorMiddleware is the outermost
+        Outermost → innermost: logging/request-id → metrics → admission →
+        ServerError → user middleware → trusted-host → hsts → cors → sessions →
+        gzip → ExceptionMiddleware → router. ServerErrorMiddleware is the outermost
         *application* layer (it catches errors from every middleware below it),
         while the observability tier wraps even it so a rendered 500 still
         carries ``X-Request-ID`` and is logged with its real status.
@@ -830,20 +947,38 @@ class API:
         for mw in reversed(self._user_middleware):  # index 0 wrapped last = outermost
             app = mw.cls(app, **mw.options)
         app = ServerErrorMiddleware(app, handler=error_handler, debug=debug)
-        if self._metrics is not None:
+        if self._admission is not None:
+            from .ext.overload import AdmissionMiddleware
+
+            # Routes are registered by now, including a lazily added health route.
+            health = self._health_route or "/health"
+            if not self._health_route_added:
+                health = None
+            self._admission.exempt = frozenset(
+                path for path in (health, self._metrics_route) if path
+            )
+            app = AdmissionMiddleware(app, self._admission)
+        if self._metrics is not None or self._server_timing:
             from .ext.metrics import MetricsMiddleware
 
-            app = MetricsMiddleware(app, collector=self._metrics)
+            app = MetricsMiddleware(
+                app, collector=self._metrics, server_timing=self._server_timing
+            )
         if self._enable_logging:
             from .ext.logging import LoggingMiddleware
 
             app = LoggingMiddleware(
-                app, trust_proxy_headers=self._trust_proxy_headers
+                app,
+                trust_proxy_headers=self._trust_proxy_headers,
+                slow_request_threshold=self._slow_request_threshold,
+                access_log=self._access_log,
             )
-        elif self._request_id:
+        elif self._request_id or self._slow_request_threshold is not None:
             from .ext.logging import RequestIDMiddleware
 
-            app = RequestIDMiddleware(app)
+            app = RequestIDMiddleware(
+                app, slow_request_threshold=self._slow_request_threshold
+            )
         return app
 
     def add_middleware(self, middleware_cls, **middleware_config):
@@ -1093,9 +1228,104 @@ class API:
 
         self.router.add_event_handler(event_type, handler)
 
+    def every(
+        self,
+        seconds,
+        *,
+        jitter=0,
+        run_on_startup=False,
+        skip_if_running=True,
+        name=None,
+    ):
+        """Decorator that runs a function every ``seconds`` while the app is up.
+
+        The schedule starts after the startup handlers and is cancelled before
+        the shutdown handlers. Sync functions run in the thread pool.
+
+        Usage::
+
+            @api.every(60, jitter=10, run_on_startup=True)
+            async def refresh_exchange_rates():
+                ...
+
+        :param seconds: Interval between run starts.
+        :param jitter: Up to this many extra seconds, chosen at random per run,
+                       so replicas don't fire in lockstep.
+        :param run_on_startup: Also run once immediately at startup.
+        :param skip_if_running: Skip a run while the previous one is still
+                                going (default) instead of overlapping.
+        :param name: Label for logs and metrics. Defaults to the qualname.
+        """
+        if seconds <= 0:
+            raise ValueError("every() needs a positive interval")
+
+        def decorator(func):
+            self.router.scheduler.add(
+                ScheduledTask(
+                    func,
+                    interval=seconds,
+                    jitter=jitter,
+                    run_on_startup=run_on_startup,
+                    skip_if_running=skip_if_running,
+                    name=name,
+                )
+            )
+            return func
+
+        return decorator
+
+    def cron(
+        self,
+        expression,
+        *,
+        jitter=0,
+        run_on_startup=False,
+        skip_if_running=True,
+        name=None,
+    ):
+        """Decorator that runs a function on a cron schedule (local time).
+
+        Usage::
+
+            @api.cron("*/5 * * * *")
+            def precompute_dashboard():
+                ...
+
+        :param expression: A five-field cron expression or an alias such as
+                           ``"@hourly"``; invalid expressions raise
+                           ``ValueError`` immediately.
+        :param jitter: Up to this many extra seconds of random delay per run.
+        :param run_on_startup: Also run once immediately at startup.
+        :param skip_if_running: Skip a run while the previous one is still
+                                going (default) instead of overlapping.
+        :param name: Label for logs and metrics. Defaults to the qualname.
+        """
+        schedule = CronSchedule(expression)
+
+        def decorator(func):
+            self.router.scheduler.add(
+                ScheduledTask(
+                    func,
+                    cron=schedule,
+                    jitter=jitter,
+                    run_on_startup=run_on_startup,
+                    skip_if_running=skip_if_running,
+                    name=name,
+                )
+            )
+            return func
+
+        return decorator
+
+    async def _bind_background_loop(self):
+        """Startup handler: run async background tasks on the server's loop."""
+        self.background.bind_loop(asyncio.get_running_loop())
+
     async def _drain_background_tasks(self):
         """Shutdown handler: drain the background pool off the event loop."""
-        await run_in_threadpool(self.background.shutdown)
+        await run_in_threadpool(
+            self.background.shutdown, timeout=self._background_shutdown_timeout
+        )
 
     def add_security_scheme(self, name, scheme=None, *, default=False):
         """Register an OpenAPI security scheme (enables Swagger's Authorize button).
@@ -1160,6 +1390,8 @@ class API:
         after=None,
         auth=_UNSET,
         dependencies=None,
+        inline=False,
+        rate_limit=None,
         **options,
     ):
         """Decorator for creating new routes around function and class definitions.
@@ -1200,7 +1432,22 @@ class API:
                 params = req.state.validated_params
                 resp.media = {"q": params.q, "limit": params.limit}
 
-        """
+        A cheap, non-blocking sync handler can skip the thread-pool hop with
+        ``inline=True`` — it then runs directly on the event loop::
+
+            @api.route("/ping", inline=True)
+            def ping(req, resp):
+                resp.text = "pong"
+
+        ``rate_limit=`` takes one or more
+        :class:`~responder.ext.ratelimit.Limit` windows (or rate strings),
+        checked together right after authentication::
+
+            @api.route("/search", rate_limit=[Limit("10/s"), Limit("1000/h", key="user")])
+            async def search(req, resp):
+                ...
+
+        """  # noqa: E501
 
         def decorator(f):
             auth_is_explicit = auth is not _UNSET
@@ -1290,11 +1537,28 @@ class API:
                 f._openapi_meta = meta
             if not include_in_schema:
                 f._include_in_schema = False
+            if inline:
+                _mark_inline(f)
+            if rate_limit is not None:
+                f._route_rate_limit = self._route_limiter(route, rate_limit, route_auth)
             self.add_route(route, f, **options)
             return f
 
         return decorator
 
+    def _route_limiter(self, route, rate_limit, route_auth):
+        from .ext.ratelimit import GCRABackend, RouteLimiter
+
+        if self.rate_limit_backend is None:
+            self.rate_limit_backend = GCRABackend()
+        return RouteLimiter(
+            _as_tuple(rate_limit),
+            backend=self.rate_limit_backend,
+            route=route,
+            trust_proxy_headers=self._trust_proxy_headers,
+            auth=route_auth,
+        )
+
     def get(self, route=None, **options):
         """Register a route for ``GET`` (sugar for ``route(methods=["GET"])``)."""
         return self.route(route, methods=["GET"], **options)
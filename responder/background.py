@@ -1,19 +1,430 @@
 import asyncio
 import concurrent.futures
+import contextlib
+import functools
+import heapq
+import importlib
 import inspect
+import itertools
 import multiprocessing
+import pickle
+import threading
+import time
 import traceback
+import weakref
 
 from starlette.concurrency import run_in_threadpool
 
-__all__ = ["BackgroundQueue"]
+__all__ = ["BackgroundFuture", "BackgroundQueue", "BackgroundQueueFull", "PRIORITIES"]
+
+#: Named priority classes; lower ranks run first. Plain ints are accepted too.
+PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+
+_ON_FULL = ("block", "drop", "raise")
+_EXECUTORS = ("thread", "process")
+
+
+class BackgroundQueueFull(RuntimeError):
+    """Raised by a full ``BackgroundQueue(on_full="raise")`` on submission."""
+
+
+def _priority_rank(priority):
+    if isinstance(priority, int) and not isinstance(priority, bool):
+        return priority
+    try:
+        return PRIORITIES[priority]
+    except KeyError:
+        raise ValueError(
+            f"Unknown priority {priority!r}; use one of {sorted(PRIORITIES)} "
+            "or an int (lower runs first)"
+        ) from None
+
+
+class BackgroundFuture(concurrent.futures.Future):
+    """A ``concurrent.futures.Future`` that can also be awaited.
+
+    Returned for every submitted task, so a handler can either ignore it
+    (fire and forget) or ``await`` the result without blocking the event
+    loop. ``timing`` holds the task's :class:`TaskTiming`.
+    """
+
+    timing: "TaskTiming"
+
+    def __await__(self):
+        return asyncio.wrap_future(self).__await__()
+
+
+def _resolve(module, qualname):
+    target = importlib.import_module(module)
+    for part in qualname.split("."):
+        target = getattr(target, part)
+    return target
+
+
+def _call(f, args, kwargs):
+    return f(*args, **kwargs)
+
+
+def _call_by_name(module, qualname, args, kwargs):
+    """Process-pool trampoline for functions shadowed by their decorator.
+
+    ``@api.background.cpu_task`` rebinds the module-level name to the wrapper,
+    so the original function can't be pickled by reference. Resolve the name
+    in the worker process and call what it wraps.
+    """
+    target = _resolve(module, qualname)
+    return getattr(target, "__wrapped__", target)(*args, **kwargs)
+
+
+# How each function submitted to the process pool is called there, decided
+# once per function: ``_call`` by reference, or ``_call_by_name``.
+_PROCESS_CALLS: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _process_trampoline(f):
+    """How to call ``f`` in a worker process, checking it can be pickled.
+
+    Only the function is checked, once (and cached), so a bad task fails in
+    the caller with a clear error. Its arguments are pickled only by the
+    executor; one that can't be fails the task's future instead.
+    """
+    try:
+        return _PROCESS_CALLS[f]
+    except (KeyError, TypeError):  # not cached yet, or not weak-referenceable
+        pass
+    by_name = False
+    try:
+        pickle.dumps(f)
+    except Exception as exc:
+        module = getattr(f, "__module__", None)
+        qualname = getattr(f, "__qualname__", "")
+        try:
+            shadow = _resolve(module, qualname)
+        except Exception:
+            shadow = None
+        if getattr(shadow, "__wrapped__", None) is not f:
+            raise TypeError(
+                f"Cannot run {f!r} in the process pool: the function must be "
+                f"picklable ({exc}). Define it at module level."
+            ) from exc
+        by_name = True
+    call = _call_by_name if by_name else _call
+    with contextlib.suppress(TypeError):
+        _PROCESS_CALLS[f] = call
+    return call
+
+
+def _process_call(f, args, kwargs):
+    """Return ``(trampoline, payload)`` for the process pool."""
+    if _process_trampoline(f) is _call_by_name:
+        return _call_by_name, (f.__module__, f.__qualname__, args, kwargs)
+    return _call, (f, args, kwargs)
+
+
+def _on_event_loop():
+    """Whether the calling thread is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _copy_outcome(source, target):
+    if target.done():  # e.g. the caller cancelled it first
+        return
+    if source.cancelled():
+        # A still-pending target can simply be cancelled; a running one can't.
+        if not target.cancel():
+            target.set_exception(concurrent.futures.CancelledError())
+    elif source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class _Batcher:
+    """Buffers calls to one ``@batch`` function and submits them as lists.
+
+    A batch is submitted when it reaches ``max_size`` items or ``max_delay``
+    seconds after its first item arrived, whichever comes first.
+    """
+
+    def __init__(self, queue, f, max_size, max_delay, priority):
+        self.queue = queue
+        self.f = f
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.priority = priority
+        self._items = []
+        self._futures = []
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def add(self, item):
+        future = BackgroundFuture()
+        with self._lock:
+            if self.queue._closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._items.append(item)
+            self._futures.append(future)
+            if len(self._items) >= self.max_size:
+                batch = self._take()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch is not None:
+            self._submit(*batch)
+        return future
+
+    def _take(self):
+        items, futures = self._items, self._futures
+        self._items, self._futures = [], []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return items, futures
+
+    def flush(self):
+        """Submit whatever is buffered now."""
+        with self._lock:
+            items, futures = self._take()
+        if items:
+            self._submit(items, futures)
+
+    def _submit(self, items, futures):
+        try:
+            result = self.queue.submit(self.f, (items,), priority=self.priority)
+        except BaseException as exc:
+            for future in futures:
+                future.set_exception(exc)
+            return
+
+        def resolve(result):
+            if not result.cancelled() and result.exception() is not None:
+                traceback.print_exception(result.exception())
+            for future in futures:
+                _copy_outcome(result, future)
+
+        result.add_done_callback(resolve)
+
+
+class TaskTiming:
+    """Per-task ``perf_counter`` timestamps, attached to each future as ``timing``."""
+
+    __slots__ = ("submitted", "started", "finished")
+
+    def __init__(self):
+        self.submitted = time.perf_counter()
+        self.started = None
+        self.finished = None
+
+    @property
+    def queue_time(self):
+        """Seconds spent waiting for a worker (``None`` until started)."""
+        return None if self.started is None else self.started - self.submitted
+
+    @property
+    def run_time(self):
+        """Seconds spent running (``None`` until finished)."""
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class _PriorityGate:
+    """An asyncio semaphore whose waiters are woken in priority order."""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.active = 0
+        self._waiters = []
+        self._seq = itertools.count()
+
+    async def acquire(self, rank):
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (rank, next(self._seq), waiter))
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # Handed a slot just as we were cancelled: pass it on.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, waiter = heapq.heappop(self._waiters)
+            if not waiter.done():  # cancelled waiters are skipped lazily
+                waiter.set_result(None)  # the slot passes straight to it
+                return
+        self.active -= 1
+
+
+class _AsyncRunner:
+    """Runs coroutines on one long-lived event loop, with bounded concurrency.
+
+    The loop is either a dedicated daemon thread started on first use, or an
+    externally running loop (the server's) handed over via :meth:`bind`. Tasks
+    sharing the loop can share async clients and connection pools, and no
+    loop is built or torn down per task.
+    """
+
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._owns_loop = False
+        self._gate: _PriorityGate | None = None
+        # In-flight tasks of the current loop. Each ``_run`` is handed the gate
+        # and task set of the loop it was submitted to, so a retired loop's
+        # tasks never mix with the new loop's.
+        self._tasks: set = set()
+        # Private loops replaced by ``bind``, finishing their in-flight tasks.
+        self._retired: list[tuple] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def bind(self, loop):
+        """Schedule onto an already-running ``loop`` instead of a private one.
+
+        If a private loop was started first (a task submitted before startup),
+        it keeps running the tasks already on it and stops once they finish;
+        new tasks go to ``loop``.
+        """
+        with self._lock:
+            if self._loop is loop:
+                return
+            if self._loop is not None and self._owns_loop:
+                retired = (self._loop, self._thread, self._tasks)
+                self._retired.append(retired)
+                asyncio.run_coroutine_threadsafe(self._retire(retired), self._loop)
+            self._loop = loop
+            self._thread = None
+            self._owns_loop = False
+            self._gate = None
+            self._tasks = set()
+
+    async def _retire(self, retired):
+        loop, _, tasks = retired
+        await asyncio.sleep(0)  # tasks scheduled before us have started now
+        while tasks:
+            await asyncio.wait(set(tasks))
+        with self._lock:
+            if retired in self._retired:
+                self._retired.remove(retired)
+        loop.stop()
+
+    @staticmethod
+    def _run_loop(loop):
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def _ensure_loop(self):
+        # Called with the lock held.
+        if self._closed:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        if self._loop is None:
+            loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(
+                target=self._run_loop,
+                args=(loop,),
+                name="responder-background-loop",
+                daemon=True,
+            )
+            self._thread.start()
+            self._loop = loop
+            self._owns_loop = True
+        if self._gate is None:
+            self._gate = _PriorityGate(self.concurrency)
+        return self._loop, self._gate, self._tasks
+
+    def submit(self, f, args, kwargs, rank=1, on_start=None):
+        # Scheduling under the lock orders it before a concurrent ``bind``'s
+        # ``_retire``, so a retiring loop never stops with a task still queued.
+        with self._lock:
+            loop, gate, tasks = self._ensure_loop()
+            inner = asyncio.run_coroutine_threadsafe(
+                self._run(f, args, kwargs, rank, on_start, gate, tasks), loop
+            )
+        future = BackgroundFuture()
+        # Cancelling the returned future cancels the task.
+        future.add_done_callback(lambda future: future.cancelled() and inner.cancel())
+        inner.add_done_callback(lambda inner: _copy_outcome(inner, future))
+        return future
+
+    @staticmethod
+    async def _run(f, args, kwargs, rank, on_start, gate, tasks):
+        task = asyncio.current_task()
+        tasks.add(task)
+        try:
+            await gate.acquire(rank)
+            try:
+                if on_start is not None:
+                    on_start()
+                return await f(*args, **kwargs)
+            finally:
+                gate.release()
+        finally:
+            tasks.discard(task)
+
+    @staticmethod
+    def _cancel_all(tasks):
+        for task in tasks:
+            task.cancel()
+
+    @staticmethod
+    async def _drain(tasks, wait, timeout):
+        pending = set(tasks)
+        if wait and pending:
+            _, pending = await asyncio.wait(pending, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def shutdown(self, wait=True, timeout=None):
+        """Drain (or cancel) in-flight coroutines and stop a private loop.
+
+        Must not be called from the loop's own thread.
+        """
+        with self._lock:
+            self._closed = True
+            current = (self._loop, self._thread, self._tasks)
+            owns_loop = self._owns_loop
+            retired = list(self._retired)
+            self._loop = self._thread = self._gate = None
+        for loop, thread, tasks in retired:
+            # A retired loop stops by itself once its tasks finish.
+            thread.join(timeout if wait else 0)
+            if thread.is_alive():
+                with contextlib.suppress(RuntimeError):  # closed meanwhile
+                    loop.call_soon_threadsafe(self._cancel_all, tasks)
+                thread.join()
+        loop, thread, tasks = current
+        if loop is None or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(self._drain(tasks, wait, timeout), loop).result()
+        if owns_loop and thread is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
 
 
 class BackgroundQueue:
     """A queue for running tasks in background threads.
 
-    Uses a ``ThreadPoolExecutor`` sized to the number of CPUs. Access it
-    via ``api.background``.
+    Sync tasks use a ``ThreadPoolExecutor`` sized to the number of CPUs. Async
+    tasks run on one persistent background event loop (at most
+    ``async_concurrency`` at a time), so they can share async clients and
+    connection pools. Access it via ``api.background``.
 
     Usage::
 
@@ -24,95 +435,464 @@ class BackgroundQueue:
 
         send_email("user@example.com", "Hello")
 
-        # Async functions work too — run via ``asyncio.run`` on the worker
+        # Async functions work too — run on the shared background loop
         @api.background.task
         async def refresh_cache():
             ...
 
+        # With a priority class ("high", "normal", "low", or an int)
+        @api.background.task(priority="low")
+        def rebuild_search_index():
+            ...
+
         # Direct submission
         future = api.background.run(send_email, "user@example.com", "Hello")
 
         # As a callable (supports async functions)
         await api.background(send_email, "user@example.com", "Hello")
 
+    Waiting tasks start in priority order, then submission order. Pass
+    ``max_pending`` to bound how many may wait at once; ``on_full`` picks what
+    happens to a submission beyond it — ``"block"`` the caller until a slot
+    frees, ``"drop"`` it (the returned future is already cancelled), or
+    ``"raise"`` :class:`BackgroundQueueFull`. A caller on a running event
+    loop (an ``async def`` handler) is never blocked: with ``"block"`` it gets
+    :class:`BackgroundQueueFull` instead. :meth:`stats` reports queue
+    depth, outcomes, and cumulative timings; each returned future carries a
+    :class:`TaskTiming` as ``future.timing``.
     """
 
-    def __init__(self, n=None):
+    def __init__(
+        self,
+        n=None,
+        *,
+        async_concurrency=100,
+        max_pending=None,
+        on_full="block",
+        processes=None,
+        mp_context="spawn",
+    ):
         """Create a new background queue.
 
         :param n: Number of worker threads. Defaults to CPU count.
+        :param async_concurrency: Maximum number of async tasks running on the
+                                  background event loop at once; the rest wait
+                                  their turn.
+        :param max_pending: Maximum number of submitted-but-not-started tasks.
+                            ``None`` (the default) means unbounded.
+        :param on_full: ``"block"`` (default), ``"drop"``, or ``"raise"`` —
+                        what a submission does when ``max_pending`` is reached.
+                        ``"block"`` raises on an event-loop thread.
+        :param processes: Worker processes for ``executor="process"`` tasks.
+                          Defaults to CPU count. The pool starts on first use.
+        :param mp_context: :mod:`multiprocessing` start method for the process
+                           pool. ``"spawn"`` (the default) is safe to start from
+                           a threaded server; ``"fork"`` starts faster.
         """
         if n is None:
             n = multiprocessing.cpu_count()
+        if on_full not in _ON_FULL:
+            raise ValueError(f"on_full= must be one of {_ON_FULL}, not {on_full!r}")
 
         self.n = n
+        self.max_pending = max_pending
+        self.on_full = on_full
         self.pool = concurrent.futures.ThreadPoolExecutor(
             max_workers=n, thread_name_prefix="responder-background"
         )
-        self.results = []
+        # Unfinished futures. A set, so per-completion bookkeeping is O(1).
+        self.results = set()
+        self._async = _AsyncRunner(async_concurrency)
+        self.processes = processes or multiprocessing.cpu_count()
+        self._mp_context = mp_context
+        self._process_pool = None
+        self._process_heap = []
+        self._process_active = 0
+        self._batchers = []
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._closed = False
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._dropped = 0
+        self._queue_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def bind_loop(self, loop):
+        """Run async tasks on ``loop`` (e.g. the server's) instead of a private one.
+
+        Called at startup by ``API(background_loop="server")``. Tasks submitted
+        before binding fall back to the dedicated background loop thread.
+        """
+        self._async.bind(loop)
 
-    def run(self, f, *args, **kwargs):
+    def run(self, f, *args, executor="thread", **kwargs):
         """Submit a function to run in a background thread.
 
-        Async functions are supported: they are driven to completion on the
-        worker thread via ``asyncio.run`` (previously they silently produced a
-        never-awaited coroutine and the job never ran).
+        Async functions are scheduled onto the persistent background event
+        loop rather than building a fresh loop per task; cancelling the
+        returned future cancels the task. Pass ``executor="process"`` to run a
+        CPU-bound function in the process pool instead, away from the GIL.
 
         :param f: The function to run.
-        :returns: A ``concurrent.futures.Future`` for the result.
+        :param executor: ``"thread"`` (the default) or ``"process"``.
+        :returns: A ``concurrent.futures.Future`` for the result; for thread
+                  and process tasks, a :class:`BackgroundFuture` that can also
+                  be awaited.
         """
-        # ``inspect.iscoroutinefunction`` unwraps ``functools.partial`` itself.
-        if inspect.iscoroutinefunction(f):
+        return self.submit(f, args, kwargs, executor=executor)
+
+    def submit(self, f, args=(), kwargs=None, *, priority="normal", executor="thread"):
+        """Submit ``f(*args, **kwargs)`` with an explicit priority class.
 
-            def runner(*args, **kwargs):
-                return asyncio.run(f(*args, **kwargs))
+        Like :meth:`run`, but takes the call's arguments as a tuple and dict so
+        ``priority`` can't collide with the task's own keyword arguments.
 
-            future = self.pool.submit(runner, *args, **kwargs)
+        :param priority: ``"high"``, ``"normal"`` (default), ``"low"``, or an
+                         int — lower runs first. Process tasks wait for a free
+                         worker process in the same order.
+        :param executor: ``"thread"`` (the default) or ``"process"``.
+        :returns: A ``concurrent.futures.Future`` for the result.
+        """
+        rank = _priority_rank(priority)
+        kwargs = {} if kwargs is None else kwargs
+        if executor not in _EXECUTORS:
+            raise ValueError(f"executor= must be one of {_EXECUTORS}, not {executor!r}")
+        if executor == "process":
+            if inspect.iscoroutinefunction(f):
+                raise TypeError(
+                    f"Cannot run coroutine function {f!r} in the process pool"
+                )
+            call, payload = _process_call(f, args, kwargs)
+        if not self._admit():
+            future = BackgroundFuture()
+            future.timing = TaskTiming()
+            future.cancel()
+            return future
+
+        timing = TaskTiming()
+        # ``inspect.iscoroutinefunction`` unwraps ``functools.partial`` itself.
+        if executor == "process":
+            future = BackgroundFuture()
+            try:
+                self._ensure_process_pool()
+            except BaseException:
+                self._release_pending()
+                raise
+            with self._lock:
+                heapq.heappush(
+                    self._process_heap,
+                    (rank, next(self._seq), future, timing, call, payload),
+                )
+            self._dispatch_processes()
+        elif inspect.iscoroutinefunction(f):
+            try:
+                future = self._async.submit(
+                    f, args, kwargs, rank, lambda: self._mark_started(timing)
+                )
+            except BaseException:
+                self._release_pending()
+                raise
         else:
-            future = self.pool.submit(f, *args, **kwargs)
-        self.results.append(future)
+            future = BackgroundFuture()
+            with self._lock:
+                try:
+                    self.pool.submit(self._run_next)
+                except BaseException:
+                    self._pending -= 1
+                    self._not_full.notify()
+                    raise
+                heapq.heappush(
+                    self._heap,
+                    (rank, next(self._seq), future, timing, f, args, kwargs),
+                )
+        future.timing = timing
+        with self._lock:
+            self.results.add(future)
         future.add_done_callback(self._discard)
         return future
 
-    def _discard(self, future):
-        # Drop completed futures so long-running apps don't accumulate them.
+    def _ensure_process_pool(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            if self._process_pool is None:
+                context = self._mp_context
+                if isinstance(context, str):
+                    context = multiprocessing.get_context(context)
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.processes, mp_context=context
+                )
+            return self._process_pool
+
+    def _dispatch_processes(self):
+        """Hand waiting process tasks to free worker processes, by priority.
+
+        Tasks wait here rather than inside the executor, so they count as
+        pending (and against ``max_pending``) until a worker is free.
+        """
+        while True:
+            with self._lock:
+                if not self._process_heap or self._process_active >= self.processes:
+                    return
+                _, _, future, timing, call, payload = heapq.heappop(
+                    self._process_heap
+                )
+                self._process_active += 1
+                pool = self._process_pool
+            if not future.set_running_or_notify_cancel():
+                self._process_done()
+                continue
+            self._mark_started(timing)
+            try:
+                # Not ``_ensure_process_pool``: tasks admitted before shutdown
+                # are still dispatched while it drains.
+                assert pool is not None
+                inner = pool.submit(call, *payload)
+            except BaseException as exc:
+                future.set_exception(exc)
+                self._process_done()
+                continue
+            inner.add_done_callback(
+                lambda inner, future=future: self._process_done(inner, future)
+            )
+
+    def _process_done(self, inner=None, future=None):
+        with self._lock:
+            self._process_active -= 1
+        if inner is not None:
+            _copy_outcome(inner, future)
+        self._dispatch_processes()
+
+    def _admit(self):
+        """Reserve a pending slot; ``False`` means the task is dropped."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            if self.max_pending is not None and self._pending >= self.max_pending:
+                if self.on_full == "block" and _on_event_loop():
+                    # Blocking here would stall every request on the loop, and
+                    # deadlock it outright when tasks run on that same loop.
+                    raise BackgroundQueueFull(
+                        f"Background queue is full ({self.max_pending} pending); "
+                        "on_full='block' cannot wait on the event loop"
+                    )
+                if self.on_full == "raise":
+                    raise BackgroundQueueFull(
+                        f"Background queue is full ({self.max_pending} pending)"
+                    )
+                if self.on_full == "drop":
+                    self._dropped += 1
+                    return False
+                while self._pending >= self.max_pending and not self._closed:
+                    self._not_full.wait()
+                if self._closed:
+                    raise RuntimeError("cannot schedule new futures after shutdown")
+            self._pending += 1
+            return True
+
+    def _release_pending(self):
+        with self._lock:
+            self._pending -= 1
+            self._not_full.notify()
+
+    def _mark_started(self, timing):
+        timing.started = time.perf_counter()
+        with self._lock:
+            self._pending -= 1
+            self._running += 1
+            self._queue_seconds += timing.started - timing.submitted
+            self._not_full.notify()
+
+    def _run_next(self):
+        # One pool work item is submitted per task, so the heap always holds
+        # an entry here; which one runs is decided at pop time, by priority.
+        with self._lock:
+            _, _, future, timing, f, args, kwargs = heapq.heappop(self._heap)
+        if not future.set_running_or_notify_cancel():
+            return
+        self._mark_started(timing)
         try:
-            self.results.remove(future)
-        except ValueError:
-            pass
+            result = f(*args, **kwargs)
+        except BaseException as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
 
-    def task(self, f):
+    def _discard(self, future):
+        # Drop completed futures so long-running apps don't accumulate them,
+        # and settle the gauges.
+        timing = future.timing
+        timing.finished = time.perf_counter()
+        with self._lock:
+            self.results.discard(future)
+            if timing.started is None:  # cancelled before it ever ran
+                self._pending -= 1
+                self._not_full.notify()
+                return
+            self._running -= 1
+            self._run_seconds += timing.finished - timing.started
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def stats(self):
+        """A snapshot of the queue's gauges and counters.
+
+        ``pending``/``running`` are current depths; ``completed``, ``failed``
+        and ``dropped`` are running totals; ``queue_seconds`` and
+        ``run_seconds`` are cumulative wait and run times of started tasks.
+        """
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+                "dropped": self._dropped,
+                "queue_seconds": self._queue_seconds,
+                "run_seconds": self._run_seconds,
+            }
+
+    def task(self, f=None, *, priority="normal"):
         """Decorator that wraps a function to run in the background thread pool.
 
         The decorated function returns a ``Future`` instead of blocking.
-        Exceptions are printed to stderr via traceback.
+        Exceptions are printed to stderr via traceback. Works bare
+        (``@api.background.task``) or with a priority
+        (``@api.background.task(priority="high")``).
+
+        :param f: The function to wrap.
+        :param priority: The priority class its calls are submitted with.
+        """
+        if f is None:
+            return lambda func: self.task(func, priority=priority)
+
+        def on_future_done(fs):
+            if fs.cancelled():
+                return
+            try:
+                fs.result()
+            except Exception:
+                traceback.print_exc()
+
+        def do_task(*args, **kwargs):
+            result = self.submit(f, args, kwargs, priority=priority)
+            result.add_done_callback(on_future_done)
+            return result
+
+        return do_task
+
+    def cpu_task(self, f):
+        """Decorator that runs a CPU-bound function in the process pool.
+
+        Like :meth:`task`, but calls go to worker processes, so heavy work
+        (thumbnails, PDF rendering) neither holds the GIL nor slows request
+        handling. The function and its arguments must be picklable; define
+        it at module level. An argument that can't be pickled fails the
+        returned future. The returned :class:`BackgroundFuture` can be
+        ignored or awaited::
+
+            @api.background.cpu_task
+            def thumbnail(data):
+                ...
+
+            thumbnail(raw)                    # fire and forget
+            small = await thumbnail(raw)      # or wait for it
 
         :param f: The function to wrap.
         """
 
         def on_future_done(fs):
+            if fs.cancelled():
+                return
             try:
                 fs.result()
             except Exception:
                 traceback.print_exc()
 
+        @functools.wraps(f)
         def do_task(*args, **kwargs):
-            result = self.run(f, *args, **kwargs)
+            result = self.submit(f, args, kwargs, executor="process")
             result.add_done_callback(on_future_done)
             return result
 
         return do_task
 
-    def shutdown(self, wait=True):
+    def batch(self, f=None, *, max_size=500, max_delay=0.2, priority="normal"):
+        """Decorator that coalesces calls into one call with a list of items.
+
+        Each call to the decorated function buffers its single argument; the
+        function itself runs in the background with the buffered list once
+        ``max_size`` items are waiting or ``max_delay`` seconds after the
+        first, whichever comes first. Buffered items are flushed at shutdown.
+        Each call returns a :class:`BackgroundFuture` that resolves with the
+        batch's return value (or exception) when its batch finishes::
+
+            @api.background.batch(max_size=500, max_delay=0.2)
+            def record_events(events):
+                db.executemany("INSERT INTO events VALUES (?, ?)", events)
+
+            record_events(("signup", user_id))
+
+        Async functions are batched the same way and run on the background
+        event loop.
+
+        :param max_size: Most items passed to one call.
+        :param max_delay: Longest an item waits for its batch, in seconds.
+        :param priority: The priority class batches are submitted with.
+        """
+        if f is None:
+            return lambda func: self.batch(
+                func, max_size=max_size, max_delay=max_delay, priority=priority
+            )
+        if max_size < 1:
+            raise ValueError("max_size= must be at least 1")
+        _priority_rank(priority)
+        batcher = _Batcher(self, f, max_size, max_delay, priority)
+        self._batchers.append(batcher)
+
+        @functools.wraps(f)
+        def do_batch(item):
+            return batcher.add(item)
+
+        do_batch.flush = batcher.flush  # type: ignore[attr-defined]
+        return do_batch
+
+    def shutdown(self, wait=True, timeout=None):
         """Stop accepting new tasks and, by default, drain in-flight ones.
 
         Called automatically at application shutdown so fire-and-forget tasks
         submitted via :meth:`run`/:meth:`task` are given a chance to finish
-        rather than being abandoned when the process exits.
+        rather than being abandoned when the process exits. Items buffered by
+        :meth:`batch` functions are submitted first.
 
         :param wait: Block until running tasks complete (default ``True``).
+                     With ``False``, pending async tasks are cancelled.
+        :param timeout: Seconds to wait for async tasks before cancelling the
+                        stragglers. ``None`` (the default) waits indefinitely.
         """
+        for batcher in self._batchers:
+            batcher.flush()
+        with self._lock:
+            self._closed = True
+            self._not_full.notify_all()
+        self._async.shutdown(wait=wait, timeout=timeout)
         self.pool.shutdown(wait=wait)
+        if self._process_pool is not None:
+            with self._lock:
+                waiting = [entry[2] for entry in self._process_heap]
+            if wait:  # they are dispatched as earlier tasks finish
+                concurrent.futures.wait(waiting)
+            else:
+                for future in waiting:
+                    future.cancel()
+            self._process_pool.shutdown(wait=wait, cancel_futures=not wait)
 
     async def __call__(self, func, *args, **kwargs):
         """Await ``func`` to completion, off the event loop if it is sync.
@@ -0,0 +1,84 @@
+"""Execution modes for sync views, hooks, and dependency providers.
+
+Responder runs every sync callable in a thread pool so blocking code can't
+stall the event loop. For trivially cheap callables — a health check that sets
+``resp.media``, an ``after_request`` hook that adds one header — that thread
+hop costs more than the work itself. ``inline`` opts such a callable out of
+it, running it directly on the event loop::
+
+    from responder import inline
+
+    @api.route("/health", inline=True)
+    def health(req, resp):
+        resp.media = {"status": "ok"}
+
+    @api.after_request
+    @inline
+    def powered_by(req, resp):
+        resp.headers["X-Powered-By"] = "responder"
+
+Only mark code that never blocks: an inline callable that does I/O holds up
+every in-flight request. Under ``API(debug=True)`` each inline call is timed
+and a warning is logged when it runs longer than ``inline_warn_threshold``.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from typing import Any
+
+__all__ = ["inline", "is_inline"]
+
+logger = logging.getLogger("responder")
+
+#: Default debug-mode budget (seconds) for a single inline call.
+INLINE_WARN_THRESHOLD = 0.005
+
+_INLINE_ATTR = "_responder_inline"
+
+
+def inline(fn: Callable) -> Callable:
+    """Mark a sync callable to run directly on the event loop.
+
+    Applies to views, before/after hooks, and dependency providers. Async
+    callables already run on the loop, so marking one is a no-op.
+    """
+    try:
+        setattr(fn, _INLINE_ATTR, True)
+    except (AttributeError, TypeError) as exc:
+        raise TypeError(
+            f"Cannot mark {fn!r} inline; wrap it in a plain function instead."
+        ) from exc
+    return fn
+
+
+def is_inline(fn: Callable) -> bool:
+    """Whether ``fn`` (or, for a bound method, its function) is marked inline."""
+    return getattr(fn, _INLINE_ATTR, False) is True
+
+
+def call_inline(
+    fn: Callable, args: tuple, kwargs: dict, threshold: float | None = None
+) -> Any:
+    """Call ``fn`` on the current thread, warning if it overruns ``threshold``.
+
+    ``threshold`` is ``None`` outside debug mode, in which case the call is not
+    timed at all.
+    """
+    if threshold is None:
+        return fn(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        elapsed = time.perf_counter() - start
+        if elapsed > threshold:
+            logger.warning(
+                "Inline callable %s blocked the event loop for %.1fms "
+                "(threshold %.1fms); drop the inline marker if it can block.",
+                getattr(fn, "__qualname__", repr(fn)),
+                elapsed * 1000,
+                threshold * 1000,
+            )
@@ -1,4 +1,4 @@
-"""Authentication helpers: Bearer, Basic, and API-key schemes.
+"""Authentication helpers: Bearer, Basic, API-key, and JWT schemes.
 
 Each scheme is a callable that authenticates a request and returns the principal
 your ``verify`` callback produced (or raises ``401`` with the right
@@ -19,14 +19,41 @@ into a handler::
 value to reject. For static secrets, pass them directly and the scheme compares
 in constant time — ``BearerAuth(tokens=[...])``, ``APIKeyAuth(keys=[...])``,
 ``BasicAuth(credentials={"alice": "s3cret"})``.
+
+When ``verify`` is expensive (a database lookup, token introspection, password
+hashing), cache its results::
+
+    auth = BearerAuth(verify=introspect, cache_ttl=60, negative_ttl=5)
+    ...
+    auth.invalidate(token)             # on revocation
+
+``JWTAuth`` verifies JSON Web Tokens locally, against a key or a JWKS
+document that is parsed once and reloaded periodically::
+
+    auth = JWTAuth(jwks="/etc/app/jwks.json", issuer="https://id.example.com",
+                   audience="api")
 """
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import binascii
+import functools
+import hashlib
+import hmac
 import inspect
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from pathlib import Path
 from secrets import compare_digest
+from types import SimpleNamespace
 from typing import Any, Callable
 
 from starlette.concurrency import run_in_threadpool
@@ -38,11 +65,14 @@ __all__ = [
     "BearerAuth",
     "BasicAuth",
     "APIKeyAuth",
+    "JWTAuth",
     "ScopedAuth",
     "OptionalAuth",
     "compare_digest",
 ]
 
+logger = logging.getLogger("responder")
+
 
 async def _call(fn: Callable, *args: Any) -> Any:
     """Call ``fn`` (sync or async) with ``args``, awaiting as appropriate."""
@@ -56,13 +86,14 @@ async def _call(fn: Callable, *args: Any) -> Any:
 def _default_scopes(principal: Any) -> frozenset[str]:
     """Best-effort extraction of the scopes/roles a principal holds.
 
-    Looks for a ``scopes`` or ``roles`` attribute (or mapping key), accepting a
-    space-delimited string or any iterable of strings. A principal that is
+    Looks for a ``scopes`` or ``roles`` attribute (or mapping key), then the
+    ``scope`` and ``scp`` JWT claims, accepting a space-delimited string or any
+    iterable of strings. A principal that is
     itself a (non-string) iterable of strings is treated as the scope set. Falls
     back to an empty set, so a principal that carries no scope information simply
     satisfies no scope requirement.
     """
-    for attr in ("scopes", "roles"):
+    for attr in ("scopes", "roles", "scope", "scp"):
         value = getattr(principal, attr, None)
         if value is None and isinstance(principal, dict):
             value = principal.get(attr)
@@ -132,6 +163,91 @@ class _ValueEqual:
         return hash(type(self))
 
 
+_RETRY = object()
+
+
+class _VerifyCache:
+    """An LRU of verification results keyed by a salted credential digest.
+
+    Principals are kept for ``ttl`` seconds, rejections for ``negative_ttl``.
+    Concurrent lookups of the same uncached credential share one call to
+    ``verify``. Only digests are stored, under a per-process random key, so
+    the cache never holds a usable credential.
+    """
+
+    def __init__(self, ttl: float, negative_ttl: float = 0, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self._salt = secrets.token_bytes(16)
+        self._entries: OrderedDict[bytes, tuple[float, Any]] = OrderedDict()
+        self._pending: dict[bytes, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def __eq__(self, other: object) -> bool:
+        # Two schemes configured alike are interchangeable (see _ValueEqual).
+        if type(other) is not type(self):
+            return NotImplemented
+        return (self.ttl, self.negative_ttl, self.max_entries) == (
+            other.ttl,
+            other.negative_ttl,
+            other.max_entries,
+        )
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
+    def _digest(self, credential: Any) -> bytes:
+        parts = credential if isinstance(credential, tuple) else (credential,)
+        data = b"\0".join(str(part).encode() for part in parts)
+        return hashlib.blake2b(data, digest_size=16, key=self._salt).digest()
+
+    async def get(self, credential: Any, verify: Callable) -> Any:
+        digest = self._digest(credential)
+        while True:
+            with self._lock:
+                entry = self._entries.get(digest)
+                if entry is not None and entry[0] > time.monotonic():
+                    self._entries.move_to_end(digest)
+                    return entry[1]
+            pending = self._pending.get(digest)
+            if pending is None:
+                break
+            result = await asyncio.shield(pending)
+            if result is not _RETRY:
+                return result
+
+        future = self._pending[digest] = asyncio.get_running_loop().create_future()
+        try:
+            principal = await verify(credential)
+        except asyncio.CancelledError:
+            future.set_result(_RETRY)  # let a waiter verify in its own right
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # waiters re-raise it; don't log it as unretrieved
+            raise
+        finally:
+            del self._pending[digest]
+        ttl = self.ttl if principal else self.negative_ttl
+        if ttl > 0:
+            with self._lock:
+                self._entries[digest] = (time.monotonic() + ttl, principal)
+                self._entries.move_to_end(digest)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(principal)
+        return principal
+
+    def invalidate(self, credential: Any) -> None:
+        with self._lock:
+            self._entries.pop(self._digest(credential), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class AuthBase(_ValueEqual):
     """Base class for authentication schemes.
 
@@ -139,15 +255,37 @@ class AuthBase(_ValueEqual):
     ``_verify`` (turn a credential into a principal), ``_challenge`` (the
     ``WWW-Authenticate`` value, or ``None``), and ``security_scheme`` (the
     OpenAPI definition).
+
+    With ``cache_ttl``, verification results are cached for that many
+    seconds (rejections for ``negative_ttl``), in an LRU of at most
+    ``max_entries`` credentials. Concurrent requests presenting the same
+    uncached credential share one ``verify`` call. Call :meth:`invalidate`
+    when a credential is revoked.
     """
 
     scheme_name: str = "auth"
 
-    def __init__(self, verify=None, *, auto_error=True, scheme_name=None):
+    def __init__(
+        self,
+        verify=None,
+        *,
+        auto_error=True,
+        scheme_name=None,
+        cache_ttl=None,
+        negative_ttl=0,
+        max_entries=10_000,
+    ):
         self.verify = verify
         self.auto_error = auto_error
         if scheme_name is not None:
             self.scheme_name = scheme_name
+        self._cache = None
+        if cache_ttl is not None:
+            if cache_ttl <= 0 or negative_ttl < 0 or max_entries < 1:
+                raise ValueError(
+                    "cache_ttl and max_entries must be positive, negative_ttl >= 0"
+                )
+            self._cache = _VerifyCache(cache_ttl, negative_ttl, max_entries)
 
     async def __call__(self, req):  # usable directly as a dependency provider
         return await self.authenticate(req)
@@ -157,11 +295,24 @@ class AuthBase(_ValueEqual):
         credential = self._extract(req)
         if credential is None:
             return self._reject()
-        principal = await self._verify(credential)
+        if self._cache is None:
+            principal = await self._verify(credential)
+        else:
+            principal = await self._cache.get(credential, self._verify)
         if not principal:
             return self._reject()
         return principal
 
+    def invalidate(self, credential=None):
+        """Drop ``credential``'s cached result (or, with no argument, all of
+        them), e.g. after revoking a token. A no-op without ``cache_ttl``."""
+        if self._cache is None:
+            return
+        if credential is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(credential)
+
     def _reject(self):
         if not self.auto_error:
             return
@@ -325,8 +476,18 @@ class BearerAuth(AuthBase):
         realm=None,
         auto_error=True,
         scheme_name=None,
+        cache_ttl=None,
+        negative_ttl=0,
+        max_entries=10_000,
     ):
-        super().__init__(verify, auto_error=auto_error, scheme_name=scheme_name)
+        super().__init__(
+            verify,
+            auto_error=auto_error,
+            scheme_name=scheme_name,
+            cache_ttl=cache_ttl,
+            negative_ttl=negative_ttl,
+            max_entries=max_entries,
+        )
         self.tokens = list(tokens) if tokens is not None else None
         self.bearer_format = bearer_format
         self.realm = realm
@@ -371,8 +532,18 @@ class BasicAuth(AuthBase):
         realm="Restricted",
         auto_error=True,
         scheme_name=None,
+        cache_ttl=None,
+        negative_ttl=0,
+        max_entries=10_000,
     ):
-        super().__init__(verify, auto_error=auto_error, scheme_name=scheme_name)
+        super().__init__(
+            verify,
+            auto_error=auto_error,
+            scheme_name=scheme_name,
+            cache_ttl=cache_ttl,
+            negative_ttl=negative_ttl,
+            max_entries=max_entries,
+        )
         self.credentials = dict(credentials) if credentials is not None else None
         self.realm = realm
         if verify is None and self.credentials is None:
@@ -427,8 +598,18 @@ class APIKeyAuth(AuthBase):
         location="header",
         auto_error=True,
         scheme_name=None,
+        cache_ttl=None,
+        negative_ttl=0,
+        max_entries=10_000,
     ):
-        super().__init__(verify, auto_error=auto_error, scheme_name=scheme_name)
+        super().__init__(
+            verify,
+            auto_error=auto_error,
+            scheme_name=scheme_name,
+            cache_ttl=cache_ttl,
+            negative_ttl=negative_ttl,
+            max_entries=max_entries,
+        )
         if location not in ("header", "query", "cookie"):
             raise ValueError("location must be 'header', 'query', or 'cookie'")
         self.keys = list(keys) if keys is not None else None
@@ -462,6 +643,425 @@ class APIKeyAuth(AuthBase):
         return {"type": "apiKey", "in": self.location, "name": self.name}
 
 
+# --- JWT ----------------------------------------------------------------------
+
+# JWS algorithm -> (JWK key type it needs, hash).
+_JWT_ALGORITHMS = {
+    "HS256": ("oct", "sha256"),
+    "HS384": ("oct", "sha384"),
+    "HS512": ("oct", "sha512"),
+    "RS256": ("RSA", "sha256"),
+    "RS384": ("RSA", "sha384"),
+    "RS512": ("RSA", "sha512"),
+    "PS256": ("RSA", "sha256"),
+    "PS384": ("RSA", "sha384"),
+    "PS512": ("RSA", "sha512"),
+    "ES256": ("EC", "sha256"),
+    "ES384": ("EC", "sha384"),
+    "ES512": ("EC", "sha512"),
+    "EdDSA": ("OKP", None),
+}
+
+_EC_CURVES = {"P-256": "SECP256R1", "P-384": "SECP384R1", "P-521": "SECP521R1"}
+_EC_ALGORITHMS = {"secp256r1": "ES256", "secp384r1": "ES384", "secp521r1": "ES512"}
+
+
+def _b64url_decode(segment: str | bytes) -> bytes:
+    if isinstance(segment, str):
+        segment = segment.encode("ascii")
+    return base64.urlsafe_b64decode(segment + b"=" * (-len(segment) % 4))
+
+
+def _b64url_int(segment: str) -> int:
+    return int.from_bytes(_b64url_decode(segment), "big")
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@functools.cache
+def _crypto() -> SimpleNamespace:
+    """The parts of ``cryptography`` that RSA, EC and EdDSA keys need."""
+    try:
+        from cryptography import x509
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import (
+            ec,
+            ed25519,
+            padding,
+            rsa,
+        )
+        from cryptography.hazmat.primitives.asymmetric.utils import (
+            encode_dss_signature,
+        )
+    except ImportError as exc:
+        raise ImportError(
+            "cryptography is required for RSA, EC and EdDSA JWT keys: "
+            "pip install cryptography"
+        ) from exc
+    return SimpleNamespace(
+        x509=x509,
+        InvalidSignature=InvalidSignature,
+        hashes={
+            "sha256": hashes.SHA256,
+            "sha384": hashes.SHA384,
+            "sha512": hashes.SHA512,
+        },
+        serialization=serialization,
+        ec=ec,
+        ed25519=ed25519,
+        padding=padding,
+        rsa=rsa,
+        encode_dss_signature=encode_dss_signature,
+    )
+
+
+class _JWTKey:
+    """A parsed verification key, bound to its JWK key type (and algorithm)."""
+
+    __slots__ = ("kty", "key", "alg")
+
+    def __init__(self, kty: str, key: Any, alg: str | None = None):
+        if alg is not None and _JWT_ALGORITHMS.get(alg, (None,))[0] != kty:
+            raise ValueError(f"Algorithm {alg!r} cannot be used with a {kty} key")
+        self.kty = kty
+        self.key = key
+        self.alg = alg
+
+    def verify(self, alg: str, signing_input: bytes, signature: bytes) -> bool:
+        kty, digest = _JWT_ALGORITHMS[alg]
+        # A key only verifies its own family: no HS256 over an RSA public key.
+        if kty != self.kty or (self.alg is not None and alg != self.alg):
+            return False
+        if kty == "oct":
+            assert digest is not None  # every HMAC algorithm names its hash
+            expected = hmac.digest(self.key, signing_input, digest)
+            return compare_digest(expected, signature)
+        crypto = _crypto()
+        try:
+            if kty == "OKP":
+                self.key.verify(signature, signing_input)
+            elif kty == "EC":
+                # JWS carries the raw r || s pair; cryptography wants DER.
+                size = (self.key.curve.key_size + 7) // 8
+                if len(signature) != 2 * size:
+                    return False
+                r = int.from_bytes(signature[:size], "big")
+                s = int.from_bytes(signature[size:], "big")
+                self.key.verify(
+                    crypto.encode_dss_signature(r, s),
+                    signing_input,
+                    crypto.ec.ECDSA(crypto.hashes[digest]()),
+                )
+            elif alg.startswith("PS"):
+                hash_ = crypto.hashes[digest]()
+                pss = crypto.padding.PSS(
+                    mgf=crypto.padding.MGF1(hash_), salt_length=hash_.digest_size
+                )
+                self.key.verify(signature, signing_input, pss, hash_)
+            else:
+                self.key.verify(
+                    signature,
+                    signing_input,
+                    crypto.padding.PKCS1v15(),
+                    crypto.hashes[digest](),
+                )
+        except crypto.InvalidSignature:
+            return False
+        return True
+
+
+def _public_jwt_key(key: Any, alg: str | None) -> _JWTKey:
+    crypto = _crypto()
+    if isinstance(key, crypto.rsa.RSAPublicKey):
+        return _JWTKey("RSA", key, alg)
+    if isinstance(key, crypto.ec.EllipticCurvePublicKey):
+        return _JWTKey("EC", key, alg or _EC_ALGORITHMS.get(key.curve.name))
+    if isinstance(key, crypto.ed25519.Ed25519PublicKey):
+        return _JWTKey("OKP", key, alg)
+    raise TypeError(f"Unsupported JWT key: {key!r}")
+
+
+def _parse_jwt_key(value: Any, alg: str | None = None) -> _JWTKey:
+    """Parse an HMAC secret, a PEM key or certificate, a JWK dict, or a
+    ``cryptography`` public key."""
+    if isinstance(value, dict):
+        kty, alg = value.get("kty"), value.get("alg", alg)
+        if kty == "oct":
+            return _JWTKey("oct", _b64url_decode(value["k"]), alg)
+        crypto = _crypto()
+        if kty == "RSA":
+            numbers = crypto.rsa.RSAPublicNumbers(
+                _b64url_int(value["e"]), _b64url_int(value["n"])
+            )
+            return _public_jwt_key(numbers.public_key(), alg)
+        if kty == "EC":
+            curve = getattr(crypto.ec, _EC_CURVES[value["crv"]])()
+            numbers = crypto.ec.EllipticCurvePublicNumbers(
+                _b64url_int(value["x"]), _b64url_int(value["y"]), curve
+            )
+            return _public_jwt_key(numbers.public_key(), alg)
+        if kty == "OKP" and value.get("crv") == "Ed25519":
+            key = crypto.ed25519.Ed25519PublicKey.from_public_bytes(
+                _b64url_decode(value["x"])
+            )
+            return _public_jwt_key(key, alg)
+        raise ValueError(f"Unsupported JWK key type: {kty!r}")
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        if not value.lstrip().startswith(b"-----BEGIN"):
+            return _JWTKey("oct", value, alg)
+        crypto = _crypto()
+        if b"CERTIFICATE" in value:
+            key = crypto.x509.load_pem_x509_certificate(value).public_key()
+        elif b"PRIVATE KEY" in value:
+            private = crypto.serialization.load_pem_private_key(value, None)
+            key = private.public_key()
+        else:
+            key = crypto.serialization.load_pem_public_key(value)
+        return _public_jwt_key(key, alg)
+    return _public_jwt_key(value, alg)
+
+
+def _parse_jwks(document: Any) -> dict[str | None, _JWTKey]:
+    """Signing keys of a JWKS document by ``kid``, skipping unusable ones."""
+    keys = {}
+    for jwk in document["keys"]:
+        if jwk.get("use", "sig") != "sig":
+            continue
+        try:
+            keys[jwk.get("kid")] = _parse_jwt_key(jwk)
+        except (KeyError, TypeError, ValueError):
+            continue  # a key type or curve this module does not verify
+    return keys
+
+
+def _load_jwks(source: str) -> dict[str | None, _JWTKey]:
+    if source.startswith(("http://", "https://", "file://")):
+        with urllib.request.urlopen(source, timeout=10) as response:  # noqa: S310
+            data = response.read()
+    else:
+        data = Path(source).read_bytes()
+    return _parse_jwks(json.loads(data))
+
+
+class _JWTKeySet:
+    """Verification keys by ``kid``, plus a memo of decoded token headers.
+
+    Static keys are parsed once. A JWKS file or URL is loaded on first use and
+    reloaded once ``refresh`` seconds old, or sooner (at most every
+    ``min_refresh`` seconds) when a token names an unknown ``kid``. A failed
+    reload keeps the previous keys. A key without a ``kid`` verifies tokens
+    that name none, or a ``kid`` no other key has.
+    """
+
+    max_headers = 1024
+
+    def __init__(self, key: Any, jwks: Any, refresh: float, min_refresh: float = 30):
+        self.refresh = refresh
+        self.min_refresh = min(min_refresh, refresh)
+        self._source: str | None = None
+        self._loaded = float("-inf")
+        self._headers: dict[str, tuple[str, str | None]] = {}
+        self._lock = threading.Lock()
+        if jwks is not None and not isinstance(jwks, dict):
+            self._source = os.fspath(jwks)
+            self._keys: dict[str | None, _JWTKey] = {}
+        elif jwks is not None:
+            self._keys = _parse_jwks(jwks)
+        elif isinstance(key, dict) and "kty" not in key:
+            self._keys = {kid: _parse_jwt_key(value) for kid, value in key.items()}
+        else:
+            self._keys = {None: _parse_jwt_key(key)}
+
+    def __eq__(self, other: object) -> bool:
+        # Only caches live here; JWTAuth compares the configuration itself.
+        if type(other) is not type(self):
+            return NotImplemented
+        return True
+
+    def __hash__(self) -> int:
+        return hash(type(self))
+
+    def header(self, segment: str) -> tuple[str, str | None]:
+        """Decode a token's header segment into ``(alg, kid)``."""
+        header = self._headers.get(segment)
+        if header is None:
+            data = json.loads(_b64url_decode(segment))
+            if "crit" in data:  # no critical extensions are understood
+                raise ValueError("Unsupported critical JWT header")
+            alg, kid = data["alg"], data.get("kid")
+            if alg not in _JWT_ALGORITHMS or not isinstance(kid, (str, type(None))):
+                raise ValueError("Unsupported JWT header")
+            header = (alg, kid)
+            if len(self._headers) >= self.max_headers:
+                self._headers.clear()
+            self._headers[segment] = header
+        return header
+
+    async def get(self, kid: str | None) -> _JWTKey | None:
+        if self._source is not None and self._due(kid):
+            await run_in_threadpool(self._reload, self._source, kid)
+        keys = self._keys
+        return keys.get(kid) or keys.get(None)
+
+    def _due(self, kid: str | None) -> bool:
+        age = time.monotonic() - self._loaded
+        return age >= self.refresh or (kid not in self._keys and age >= self.min_refresh)
+
+    def _reload(self, source: str, kid: str | None) -> None:
+        with self._lock:
+            if not self._due(kid):  # another request reloaded meanwhile
+                return
+            self._loaded = time.monotonic()
+            try:
+                self._keys = _load_jwks(source)
+            except Exception:
+                logger.warning(
+                    "Could not load JWKS from %s; keeping %d known key(s)",
+                    source,
+                    len(self._keys),
+                    exc_info=True,
+                )
+
+
+class JWTAuth(BearerAuth):
+    """``Authorization: Bearer <JWT>`` authentication, verified locally.
+
+    Tokens are checked against ``key`` — an HMAC secret, a PEM public key or
+    certificate, a JWK dict, or a ``{kid: key}`` mapping of those — or against
+    the JWKS document at ``jwks`` (a dict, a file path, or a URL), reloaded
+    every ``jwks_refresh`` seconds. Keys are parsed once, and each key only
+    verifies the algorithms of its own type (optionally narrowed with
+    ``algorithms``).
+
+    ``exp`` and ``nbf`` are enforced with ``leeway`` seconds of clock skew;
+    ``iss`` and ``aud`` must match ``issuer``/``audience`` when those are set
+    (a token naming an audience is refused if no ``audience`` is configured);
+    ``require`` lists claims that must be present. The principal is the claims
+    dict, or whatever ``verify(claims)`` returns, so :meth:`requires` reads
+    the ``scope``/``scp`` claims.
+
+    Verified tokens are cached for ``cache_ttl`` seconds (never past their
+    ``exp``), so a repeated token costs a digest and a dict lookup. RSA, EC
+    and EdDSA keys need the ``cryptography`` package.
+    """
+
+    def __init__(
+        self,
+        key=None,
+        *,
+        jwks=None,
+        jwks_refresh=300,
+        algorithms=None,
+        issuer=None,
+        audience=None,
+        leeway=0,
+        require=("exp",),
+        verify=None,
+        realm=None,
+        auto_error=True,
+        scheme_name=None,
+        cache_ttl=60,
+        negative_ttl=0,
+        max_entries=10_000,
+    ):
+        # Skip BearerAuth's verify=/tokens= check: the keys verify here.
+        AuthBase.__init__(
+            self,
+            verify,
+            auto_error=auto_error,
+            scheme_name=scheme_name,
+            cache_ttl=cache_ttl,
+            negative_ttl=negative_ttl,
+            max_entries=max_entries,
+        )
+        if (key is None) == (jwks is None):
+            raise ValueError("JWTAuth requires exactly one of key= or jwks=")
+        if jwks_refresh <= 0 or leeway < 0:
+            raise ValueError("jwks_refresh must be positive and leeway >= 0")
+        unknown = set(_as_tuple(algorithms)) - _JWT_ALGORITHMS.keys()
+        if unknown:
+            raise ValueError(f"Unsupported JWT algorithms: {sorted(unknown)}")
+        self.tokens = None
+        self.bearer_format = "JWT"
+        self.realm = realm
+        self.key = key
+        self.jwks = jwks
+        self.jwks_refresh = jwks_refresh
+        self.algorithms = frozenset(_as_tuple(algorithms) or _JWT_ALGORITHMS)
+        self.issuer = _as_tuple(issuer)
+        self.audience = _as_tuple(audience)
+        self.leeway = leeway
+        self.require = _as_tuple(require)
+        self._keys = _JWTKeySet(key, jwks, jwks_refresh)
+
+    async def authenticate(self, req):
+        token = self._extract(req)
+        if token is None:
+            return self._reject()
+        if self._cache is None:
+            verified = await self._verify(token)
+        else:
+            verified = await self._cache.get(token, self._verify)
+        # A cached token still expires on time.
+        if not verified or (verified[1] is not None and time.time() >= verified[1]):
+            return self._reject()
+        return verified[0]
+
+    async def decode(self, token: str) -> dict | None:
+        """Return the claims of ``token`` if its signature and claims are
+        valid, else ``None``. Not cached."""
+        try:
+            header, payload, signature = token.split(".")
+            alg, kid = self._keys.header(header)
+            if alg not in self.algorithms:
+                return None
+            key = await self._keys.get(kid)
+            signing_input = f"{header}.{payload}".encode("ascii")
+            if key is None or not key.verify(
+                alg, signing_input, _b64url_decode(signature)
+            ):
+                return None
+            claims = json.loads(_b64url_decode(payload))
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not isinstance(claims, dict) or not self._valid_claims(claims):
+            return None
+        return claims
+
+    def _valid_claims(self, claims: dict) -> bool:
+        if any(name not in claims for name in self.require):
+            return False
+        now = time.time()
+        exp, nbf = claims.get("exp"), claims.get("nbf")
+        if exp is not None and (not _is_number(exp) or now >= exp + self.leeway):
+            return False
+        if nbf is not None and (not _is_number(nbf) or now + self.leeway < nbf):
+            return False
+        if self.issuer and claims.get("iss") not in self.issuer:
+            return False
+        audience = claims.get("aud")
+        if self.audience or audience is not None:
+            if not any(aud in self.audience for aud in _as_tuple(audience)):
+                return False
+        return True
+
+    async def _verify(self, token):
+        """Verify ``token``; return ``(principal, expires_at)`` or ``None``."""
+        claims = await self.decode(token)
+        if claims is None:
+            return None
+        principal = claims if self.verify is None else await _call(self.verify, claims)
+        if not principal:
+            return None
+        exp = claims.get("exp")
+        return principal, (exp + self.leeway if exp is not None else None)
+
+
 class ScopedAuth(_ValueEqual):
     """An auth scheme wrapped with a scope/role requirement.
 
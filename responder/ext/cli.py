@@ -7,12 +7,14 @@ Commands:
   run     Start the application server
   build   Build frontend assets using npm
   client  Generate an API client from the app's OpenAPI schema
+  openapi Export the app's OpenAPI schema
 
 Usage:
   responder
   responder run [--debug] [--limit-max-requests=] <target>
   responder build [<target>]
   responder client [--lang=<lang>] [--class-name=<name>] [--output=<path>] <target>
+  responder openapi [--format=<fmt>] [--output=<path>] <target>
   responder --version
 
 Options:
@@ -22,11 +24,13 @@ Options:
   --limit-max-requests=<n>  Maximum number of requests to handle before shutting down.
   --lang=<lang>             Client language: python, javascript, typescript, ruby, php [default: python].
   --class-name=<name>       Name of the generated client class [default: APIClient].
-  -o --output=<path>        Write the client to this file instead of stdout.
+  --format=<fmt>            Schema format: json or yaml (default: from the --output suffix, else yaml).
+  -o --output=<path>        Write the client or schema to this file instead of stdout.
 
 Arguments:
-  <target>      For run/client: Python module specifier (e.g., "app:api" loads api from app.py)
+  <target>      For run/client/openapi: Python module specifier (e.g., "app:api" loads api from app.py)
                          Format: "module.submodule:variable_name" where variable_name is your API instance
+                For client: may also be an OpenAPI spec file (.json/.yaml/.yml); the app is not imported
                 For build: Directory containing package.json (default: current directory)
 
 Examples:
@@ -35,6 +39,8 @@ Examples:
   responder build                           # Build frontend assets
   responder client app:api                  # Print a Python client for app.py's api
   responder client --lang typescript -o client.ts app:api   # Write a TypeScript client
+  responder openapi -o spec.json app:api    # Export the OpenAPI schema as JSON
+  responder client -o client.py spec.json   # Generate a client from an exported schema
 """  # noqa: E501
 
 import logging
@@ -49,8 +55,14 @@ import docopt
 from responder.__version__ import __version__
 from responder.util.python import InvalidTarget, load_target
 
+if t.TYPE_CHECKING:
+    from responder.api import API
+
 logger = logging.getLogger(__name__)
 
+# Targets with these suffixes are OpenAPI spec files, not importable apps.
+_SPEC_SUFFIXES = {".json", ".yaml", ".yml"}
+
 
 def cli() -> None:
     """
@@ -67,6 +79,7 @@ def cli() -> None:
     debug: bool = args["--debug"]
     run: bool = args["run"]
     client: bool = args["client"]
+    openapi: bool = args["openapi"]
 
     if build:
         target_path = Path(target).resolve() if target else Path.cwd()
@@ -110,15 +123,7 @@ def cli() -> None:
                 sys.exit(1)
 
         # Load application from target.
-        try:
-            api = load_target(target=target)
-        except InvalidTarget as ex:
-            raise ValueError(
-                f"{ex}. "
-                "Use either a Python module entrypoint specification, "
-                "a filesystem path, or a remote URL. "
-                "See also https://responder.kennethreitz.org/cli.html."
-            ) from ex
+        api = _load_api(target)
 
         # Launch Responder API server (uvicorn).
         api.run(debug=debug, limit_max_requests=limit_max_requests)
@@ -128,31 +133,82 @@ def cli() -> None:
             logger.error("Target argument is required for the client command")
             sys.exit(1)
 
-        try:
-            api = load_target(target=target)
-        except InvalidTarget as ex:
-            raise ValueError(
-                f"{ex}. "
-                "Use either a Python module entrypoint specification, "
-                "a filesystem path, or a remote URL. "
-                "See also https://responder.kennethreitz.org/cli.html."
-            ) from ex
-
         language = args["--lang"] or "python"
         class_name = args["--class-name"] or "APIClient"
         output = args["--output"]
+        spec_file = Path(target)
         try:
+            if spec_file.suffix.lower() in _SPEC_SUFFIXES and spec_file.is_file():
+                # A prebuilt spec: generate without importing the app.
+                from responder.ext.clientgen import generate_client, write_client
+
+                if output:
+                    write_client(
+                        spec_file, output, class_name=class_name, language=language
+                    )
+                else:
+                    sys.stdout.write(
+                        generate_client(
+                            spec_file, class_name=class_name, language=language
+                        )
+                    )
+            else:
+                api = _load_api(target)
+                if output:
+                    api.generate_client(output, class_name=class_name, language=language)
+                else:
+                    sys.stdout.write(
+                        api.generate_client(class_name=class_name, language=language)
+                    )
             if output:
-                api.generate_client(output, class_name=class_name, language=language)
                 logger.info(f"Wrote {language} client to {output}")
-            else:
-                sys.stdout.write(
-                    api.generate_client(class_name=class_name, language=language)
-                )
         except (RuntimeError, ValueError, TypeError) as ex:
             logger.error(str(ex))
             sys.exit(1)
 
+    if openapi:
+        if not target:
+            logger.error("Target argument is required for the openapi command")
+            sys.exit(1)
+
+        output = args["--output"]
+        fmt = args["--format"]
+        if fmt is None:
+            fmt = "json" if output and output.lower().endswith(".json") else "yaml"
+        if fmt not in ("json", "yaml"):
+            logger.error("--format must be json or yaml")
+            sys.exit(1)
+
+        api = _load_api(target)
+        if not hasattr(api, "openapi"):
+            logger.error(
+                "OpenAPI is not enabled; pass openapi=... (or docs_route=...) to API()."
+            )
+            sys.exit(1)
+        document = api.openapi.document()
+        body = document.json if fmt == "json" else document.yaml
+        if output:
+            path = Path(output)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            logger.info(f"Wrote OpenAPI schema to {output}")
+        else:
+            sys.stdout.buffer.write(body)
+            sys.stdout.flush()
+
+
+def _load_api(target: str) -> "API":
+    """Load the API instance named by ``target``."""
+    try:
+        return load_target(target=target)
+    except InvalidTarget as ex:
+        raise ValueError(
+            f"{ex}. "
+            "Use either a Python module entrypoint specification, "
+            "a filesystem path, or a remote URL. "
+            "See also https://responder.kennethreitz.org/cli.html."
+        ) from ex
+
 
 def setup_logging(debug: bool) -> None:
     """
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import json
 import keyword
+import os
 import re
 from pathlib import Path
 from typing import Any
@@ -24,7 +25,8 @@ _LANGUAGES = {"python", "javascript", "typescript", "ruby", "php"}
 
 
 def _load_spec(source: Any) -> dict[str, Any]:
-    """Load an OpenAPI spec from an app, OpenAPISchema, dict, or YAML string."""
+    """Load an OpenAPI spec from an app, OpenAPISchema, dict, YAML string, or
+    a path to a ``.json``/YAML spec file."""
     if isinstance(source, dict):
         return source
     if isinstance(source, str):
@@ -32,11 +34,19 @@ def _load_spec(source: Any) -> dict[str, Any]:
         if not isinstance(loaded, dict):
             raise TypeError("OpenAPI YAML did not parse to an object")
         return loaded
+    if isinstance(source, os.PathLike):
+        from responder.ext.openapi import load_openapi_file
+
+        return load_openapi_file(source)
+    if hasattr(source, "document"):  # OpenAPISchema: reuse its encoded build
+        return json.loads(source.document().json)
     if hasattr(source, "openapi"):
         return _load_spec(source.openapi)
     if hasattr(source, "_apispec"):
         return source._apispec.to_dict()
-    raise TypeError("Expected an API/OpenAPISchema, OpenAPI dict, or YAML string")
+    raise TypeError(
+        "Expected an API/OpenAPISchema, OpenAPI dict, YAML string, or spec file path"
+    )
 
 
 def _identifier(name: str, *, fallback: str = "value") -> str:
@@ -1158,7 +1168,9 @@ def generate_client(
     """Return source for a client generated from ``source``.
 
     ``source`` can be a Responder ``API`` with OpenAPI enabled, an
-    ``OpenAPISchema`` instance, an OpenAPI dict, or a YAML string.
+    ``OpenAPISchema`` instance, an OpenAPI dict, a YAML string, or a
+    :class:`~pathlib.Path` to a ``.json``/YAML spec file (which needs no app
+    import, e.g. in CI).
     """
     language = language.lower()
     if language not in _LANGUAGES:
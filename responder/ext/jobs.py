@@ -0,0 +1,585 @@
+"""Durable background jobs with retries, backed by a local SQLite file.
+
+``api.background`` tasks live in memory and vanish on restart. A
+:class:`JobQueue` persists each job before ``enqueue`` returns, leases it to
+a worker running inside the app's lifespan, retries failures with
+exponential backoff, and dead-letters jobs that keep failing::
+
+    from responder.ext.jobs import JobQueue
+
+    jobs = JobQueue("jobs.db", concurrency=8, max_attempts=5)
+    jobs.install(api)
+
+    @jobs.job
+    async def send_receipt(order_id):
+        ...
+
+    @api.route("/orders", methods=["POST"])
+    async def create_order(req, resp):
+        order = ...
+        await send_receipt.enqueue(order["id"])
+
+Delivery is at-least-once: a job whose worker dies mid-run is picked up
+again once its lease expires, so handlers should be idempotent. Arguments
+are stored as JSON. Writes from concurrent ``enqueue`` calls (and job
+acknowledgements) are grouped into one transaction, and SQLite runs in WAL
+mode so the worker's reads don't block them.
+
+Storage is pluggable: anything implementing :class:`JobStorage` works.
+:class:`MemoryJobStorage` keeps jobs in process memory (not durable; useful
+in tests).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import dataclasses
+import functools
+import inspect
+import json
+import logging
+import sqlite3
+import threading
+import time
+import traceback
+import uuid
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
+
+from starlette.concurrency import run_in_threadpool
+
+if TYPE_CHECKING:
+    from ..api import API
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "JobStorage",
+    "MemoryJobStorage",
+    "SQLiteJobStorage",
+]
+
+logger = logging.getLogger("responder")
+
+
+@dataclasses.dataclass
+class Job:
+    """One unit of work, as stored."""
+
+    id: str
+    name: str
+    args: list = dataclasses.field(default_factory=list)
+    kwargs: dict = dataclasses.field(default_factory=dict)
+    #: Times the job has been claimed by a worker (including the current one).
+    attempts: int = 0
+    #: Earliest time (epoch seconds) the job may run.
+    run_at: float = 0.0
+    last_error: str | None = None
+
+
+@runtime_checkable
+class JobStorage(Protocol):
+    """A job store. :class:`JobQueue` calls it from one dedicated thread.
+
+    ``claim`` must atomically lease ready jobs — queued ones whose ``run_at``
+    has passed, and leased ones whose lease expired — and increment their
+    ``attempts``.
+    """
+
+    def write(self, added: list[Job], completed: list[str]) -> None: ...
+    def claim(self, now: float, limit: int, lease: float) -> list[Job]: ...
+    def extend(self, job_ids: list[str], until: float) -> None: ...
+    def fail(self, job_id: str, error: str, retry_at: float | None) -> None: ...
+    def dead_letters(self, limit: int = 100) -> list[Job]: ...
+    def counts(self) -> dict[str, int]: ...
+    def close(self) -> None: ...
+
+
+class MemoryJobStorage:
+    """In-process job store. Jobs vanish on restart."""
+
+    def __init__(self):
+        self._jobs: dict[str, Job] = {}
+        self._state: dict[str, tuple[str, float]] = {}  # id -> (status, leased_until)
+        self._lock = threading.Lock()
+
+    def write(self, added, completed):
+        with self._lock:
+            for job in added:
+                self._jobs[job.id] = dataclasses.replace(job)
+                self._state[job.id] = ("queued", 0.0)
+            for job_id in completed:
+                self._jobs.pop(job_id, None)
+                self._state.pop(job_id, None)
+
+    def claim(self, now, limit, lease):
+        with self._lock:
+            ready = [
+                job
+                for job in self._jobs.values()
+                if (self._state[job.id][0] == "queued" and job.run_at <= now)
+                or (self._state[job.id][0] == "leased" and self._state[job.id][1] <= now)
+            ]
+            ready.sort(key=lambda job: job.run_at)
+            claimed = []
+            for job in ready[:limit]:
+                job.attempts += 1
+                self._state[job.id] = ("leased", now + lease)
+                claimed.append(dataclasses.replace(job))
+            return claimed
+
+    def extend(self, job_ids, until):
+        with self._lock:
+            for job_id in job_ids:
+                if self._state.get(job_id, ("",))[0] == "leased":
+                    self._state[job_id] = ("leased", until)
+
+    def fail(self, job_id, error, retry_at):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.last_error = error
+            if retry_at is None:
+                self._state[job_id] = ("dead", 0.0)
+            else:
+                job.run_at = retry_at
+                self._state[job_id] = ("queued", 0.0)
+
+    def dead_letters(self, limit=100):
+        with self._lock:
+            dead = [
+                dataclasses.replace(job)
+                for job in self._jobs.values()
+                if self._state[job.id][0] == "dead"
+            ]
+        return dead[:limit]
+
+    def counts(self):
+        counts = {"queued": 0, "leased": 0, "dead": 0}
+        with self._lock:
+            for status, _ in self._state.values():
+                counts[status] += 1
+        return counts
+
+    def close(self):
+        pass
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responder_jobs (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_at REAL NOT NULL,
+    leased_until REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS responder_jobs_ready
+    ON responder_jobs (status, run_at);
+"""
+
+
+class SQLiteJobStorage:
+    """Durable job store in a local SQLite file (WAL mode).
+
+    The connection is opened on first use and reopened after :meth:`close`,
+    so a queue can be started and stopped repeatedly.
+
+    :param path: Database file path; created if missing.
+    :param synchronous: SQLite ``synchronous`` pragma. ``"NORMAL"`` (the
+                        default) is durable across process crashes in WAL mode;
+                        use ``"FULL"`` to also survive power loss.
+    """
+
+    def __init__(self, path: str, *, synchronous: str = "NORMAL"):
+        self.path = str(path)
+        self.synchronous = synchronous
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"PRAGMA synchronous={self.synchronous}")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _job(row: tuple) -> Job:
+        job_id, name, payload, attempts, run_at, last_error = row
+        data = json.loads(payload)
+        return Job(
+            job_id, name, data["args"], data["kwargs"], attempts, run_at, last_error
+        )
+
+    def write(self, added, completed):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO responder_jobs (id, name, payload, run_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            job.id,
+                            job.name,
+                            json.dumps({"args": job.args, "kwargs": job.kwargs}),
+                            job.run_at,
+                        )
+                        for job in added
+                    ],
+                )
+                conn.executemany(
+                    "DELETE FROM responder_jobs WHERE id = ?",
+                    [(job_id,) for job_id in completed],
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def claim(self, now, limit, lease):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = conn.execute(
+                    "SELECT id, name, payload, attempts + 1, run_at, last_error "
+                    "FROM responder_jobs "
+                    "WHERE (status = 'queued' AND run_at <= ?) "
+                    "OR (status = 'leased' AND leased_until <= ?) "
+                    "ORDER BY run_at LIMIT ?",
+                    (now, now, limit),
+                ).fetchall()
+                conn.executemany(
+                    "UPDATE responder_jobs SET status = 'leased', "
+                    "attempts = attempts + 1, leased_until = ? WHERE id = ?",
+                    [(now + lease, row[0]) for row in rows],
+                )
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        return [self._job(row) for row in rows]
+
+    def extend(self, job_ids, until):
+        with self._lock:
+            self._connection().executemany(
+                "UPDATE responder_jobs SET leased_until = ? "
+                "WHERE id = ? AND status = 'leased'",
+                [(until, job_id) for job_id in job_ids],
+            )
+
+    def fail(self, job_id, error, retry_at):
+        with self._lock:
+            conn = self._connection()
+            if retry_at is None:
+                conn.execute(
+                    "UPDATE responder_jobs SET status = 'dead', last_error = ? "
+                    "WHERE id = ?",
+                    (error, job_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE responder_jobs SET status = 'queued', run_at = ?, "
+                    "last_error = ? WHERE id = ?",
+                    (retry_at, error, job_id),
+                )
+
+    def dead_letters(self, limit=100):
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute(
+                    "SELECT id, name, payload, attempts, run_at, last_error "
+                    "FROM responder_jobs WHERE status = 'dead' "
+                    "ORDER BY run_at LIMIT ?",
+                    (limit,),
+                )
+                .fetchall()
+            )
+        return [self._job(row) for row in rows]
+
+    def counts(self):
+        counts = {"queued": 0, "leased": 0, "dead": 0}
+        with self._lock:
+            rows = (
+                self._connection()
+                .execute("SELECT status, COUNT(*) FROM responder_jobs GROUP BY status")
+                .fetchall()
+            )
+        counts.update(rows)
+        return counts
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class JobQueue:
+    """A durable job queue with a concurrency-limited async worker.
+
+    :param storage: A :class:`JobStorage`, or a path for :class:`SQLiteJobStorage`.
+    :param concurrency: Most jobs running at once.
+    :param max_attempts: Attempts before a job is dead-lettered.
+    :param lease: Seconds a claimed job is reserved for its worker. Leases of
+                  running jobs are renewed; a job whose worker died is retried
+                  once its lease runs out.
+    :param backoff: Delay before the first retry; doubles on each attempt.
+    :param max_backoff: Upper bound on the retry delay.
+    :param poll_interval: How often the worker checks for due jobs when idle
+                          (new jobs enqueued in-process wake it immediately).
+    :param shutdown_timeout: Seconds to let running jobs finish at shutdown
+                             before cancelling them; cancelled jobs run again
+                             on the next start.
+    """
+
+    def __init__(
+        self,
+        storage: JobStorage | str = "jobs.db",
+        *,
+        concurrency: int = 4,
+        max_attempts: int = 5,
+        lease: float = 60.0,
+        backoff: float = 1.0,
+        max_backoff: float = 300.0,
+        poll_interval: float = 1.0,
+        shutdown_timeout: float | None = 10.0,
+    ):
+        if isinstance(storage, str):
+            storage = SQLiteJobStorage(storage)
+        self.storage = storage
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.lease = lease
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.handlers: dict[str, Callable] = {}
+        self._executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self._added: list[tuple[Job, asyncio.Future]] = []
+        self._completed: list[str] = []
+        self._flush_task: asyncio.Task | None = None
+        self._worker: asyncio.Task | None = None
+        self._active: dict[str, asyncio.Task] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    # -- registration and enqueueing -------------------------------------
+
+    def job(self, func: Callable | None = None, *, name: str | None = None) -> Callable:
+        """Decorator registering ``func`` as a job handler.
+
+        The function is returned unchanged, with an added
+        ``enqueue(*args, **kwargs)`` coroutine. Handlers are looked up by
+        ``name`` (default: ``module.qualname``), so keep it stable across
+        deploys while jobs for it may still be queued.
+        """
+        if func is None:
+            return functools.partial(self.job, name=name)
+        job_name = name or f"{func.__module__}.{func.__qualname__}"
+        self.handlers[job_name] = func
+
+        async def enqueue(*args, **kwargs):
+            return await self.enqueue(job_name, args, kwargs)
+
+        func.enqueue = enqueue  # type: ignore[attr-defined]
+        return func
+
+    async def enqueue(
+        self,
+        job: str | Callable,
+        args: tuple | list = (),
+        kwargs: dict | None = None,
+        *,
+        delay: float = 0,
+    ) -> str:
+        """Persist a job and return its id once it is safely stored.
+
+        :param job: A registered handler, or its name.
+        :param delay: Seconds to wait before the job may run.
+        """
+        name = job if isinstance(job, str) else self._name_of(job)
+        record = Job(
+            uuid.uuid4().hex, name, list(args), dict(kwargs or {}), 0, time.time() + delay
+        )
+        # Fail here, in the caller, rather than in the writer thread.
+        json.dumps({"args": record.args, "kwargs": record.kwargs})
+        future = asyncio.get_running_loop().create_future()
+        self._added.append((record, future))
+        self._schedule_flush()
+        await future
+        return record.id
+
+    def _name_of(self, func: Callable) -> str:
+        for name, handler in self.handlers.items():
+            if handler is func:
+                return name
+        raise LookupError(f"{func!r} is not a registered job; decorate it with @job")
+
+    # -- batched writes ---------------------------------------------------
+
+    def _schedule_flush(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush())
+
+    async def _flush(self) -> None:
+        # Yield once so every enqueue/ack issued in this loop iteration joins
+        # the same transaction.
+        await asyncio.sleep(0)
+        added, self._added = self._added, []
+        completed, self._completed = self._completed, []
+        self._flush_task = None
+        try:
+            await self._io(self.storage.write, [job for job, _ in added], completed)
+        except Exception as exc:
+            for _, future in added:
+                if not future.done():
+                    future.set_exception(exc)
+            if completed:
+                logger.exception("Failed to record %d completed jobs", len(completed))
+            return
+        for _, future in added:
+            if not future.done():
+                future.set_result(None)
+        if added:
+            self._wakeup.set()
+
+    def _io(self, fn, *args):
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="responder-jobs"
+            )
+        return asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(fn, *args)
+        )
+
+    # -- worker -----------------------------------------------------------
+
+    def retry_delay(self, attempts: int) -> float:
+        """Seconds to wait before retrying a job that failed ``attempts`` times."""
+        return min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+
+    async def start(self) -> None:
+        """Start the worker on the running event loop."""
+        self._stopping = False
+        self._wakeup = asyncio.Event()  # bound to this loop on first wait
+        self._worker = asyncio.get_running_loop().create_task(self._work())
+
+    async def stop(self) -> None:
+        """Stop claiming jobs, let running ones finish, and flush writes."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._worker is not None:
+            await self._worker
+            self._worker = None
+        active = list(self._active.values())
+        if active:
+            _, pending = await asyncio.wait(active, timeout=self.shutdown_timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if self._flush_task is not None:
+            await self._flush_task
+        if self._added or self._completed:
+            await self._flush()
+        if self._executor is not None:
+            await self._io(self.storage.close)
+            self._executor.shutdown()
+            self._executor = None
+
+    def install(self, api: API) -> None:
+        """Run the worker for the lifetime of ``api``."""
+        api.add_event_handler("startup", self.start)
+        api.add_event_handler("shutdown", self.stop)
+
+    async def _work(self) -> None:
+        renewed = time.monotonic()
+        while not self._stopping:
+            self._wakeup.clear()
+            free = self.concurrency - len(self._active)
+            claimed = []
+            if free > 0:
+                try:
+                    claimed = await self._io(
+                        self.storage.claim, time.time(), free, self.lease
+                    )
+                except Exception:
+                    logger.exception("Failed to claim jobs")
+            for job in claimed:
+                task = asyncio.get_running_loop().create_task(self._execute(job))
+                self._active[job.id] = task
+            if self._active and time.monotonic() - renewed > self.lease / 3:
+                renewed = time.monotonic()
+                try:
+                    await self._io(
+                        self.storage.extend,
+                        list(self._active),
+                        time.time() + self.lease,
+                    )
+                except Exception:
+                    logger.exception("Failed to renew job leases")
+            if claimed and len(claimed) == free:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _execute(self, job: Job) -> None:
+        handler = self.handlers.get(job.name)
+        try:
+            if handler is None:
+                raise LookupError(f"No job handler registered as {job.name!r}")
+            if inspect.iscoroutinefunction(handler):
+                await handler(*job.args, **job.kwargs)
+            else:
+                await run_in_threadpool(handler, *job.args, **job.kwargs)
+        except asyncio.CancelledError:
+            raise  # the lease runs out and the job is retried
+        except Exception as exc:
+            error = "".join(traceback.format_exception_only(exc)).strip()
+            if handler is None or job.attempts >= self.max_attempts:
+                retry_at = None
+                logger.error("Job %s (%s) dead-lettered: %s", job.id, job.name, error)
+            else:
+                retry_at = time.time() + self.retry_delay(job.attempts)
+                logger.warning(
+                    "Job %s (%s) failed on attempt %d: %s",
+                    job.id,
+                    job.name,
+                    job.attempts,
+                    error,
+                )
+            try:
+                await self._io(self.storage.fail, job.id, error, retry_at)
+            except Exception:
+                logger.exception("Failed to record failure of job %s", job.id)
+        else:
+            self._completed.append(job.id)
+            self._schedule_flush()
+        finally:
+            self._active.pop(job.id, None)
+            self._wakeup.set()
+
+    # -- inspection -------------------------------------------------------
+
+    async def dead_letters(self, limit: int = 100) -> list[Job]:
+        """Jobs that exhausted their attempts, oldest first."""
+        return await self._io(self.storage.dead_letters, limit)
+
+    async def counts(self) -> dict[str, Any]:
+        """Stored jobs by status (``queued``, ``leased``, ``dead``)."""
+        return await self._io(self.storage.counts)
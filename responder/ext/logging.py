@@ -21,13 +21,25 @@ Usage::
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import queue
+import random
+import sys
+import threading
 import time
+import traceback
 import uuid
+from collections.abc import Iterable, Mapping
 from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from types import FrameType
 from typing import Any
 
 from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope
 
 from ..util.net import resolve_client_ip
 
@@ -37,25 +49,165 @@ __all__ = [
     "RequestContextFilter",
     "LoggingMiddleware",
     "RequestIDMiddleware",
+    "SlowRequestWatchdog",
+    "AccessLog",
+    "JSONFormatter",
 ]
 
 
+def _find_header(headers: Iterable[tuple[bytes, bytes]], name: bytes) -> str | None:
+    """Look up one header in the raw ASGI header list (``name`` lower-case)."""
+    for key, value in headers:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class _InFlight:
+    """Registry entry for one in-flight request."""
+
+    __slots__ = ("scope", "task", "loop_thread", "started", "thread", "reported")
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.task = asyncio.current_task()
+        self.loop_thread = threading.get_ident()
+        self.started = time.monotonic()
+        # Set by the router while a sync handler runs in a worker thread.
+        self.thread: int | None = None
+        self.reported = False
+
+
+def _coroutine_frames(coro: Any) -> list[FrameType]:
+    # Task.get_stack() stops at the outermost frame of a suspended coroutine;
+    # follow the await chain down to where it is actually waiting.
+    frames = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def _format_frames(frames: Iterable[FrameType]) -> str:
+    summary = traceback.StackSummary.extract((f, f.f_lineno) for f in frames)
+    return "".join(summary.format())
+
+
+def _thread_stack(ident: int | None) -> str | None:
+    frame = sys._current_frames().get(ident) if ident is not None else None
+    if frame is None:
+        return None
+    return "".join(traceback.format_stack(frame))
+
+
+class SlowRequestWatchdog:
+    """Log where requests are stuck once they run longer than ``threshold``.
+
+    The request-ID middleware registers every in-flight request by its
+    request ID. A watchdog thread, running only while requests are in
+    flight, checks the registry every ``threshold / 4`` seconds. It logs each
+    request that overstays once, with its route pattern, its request ID, the
+    stack of the coroutine handling it, and either the worker thread's stack
+    (sync handlers) or the event loop thread's (code blocking the loop).
+
+    :param threshold: Seconds after which a request counts as slow.
+    :param logger_name: Logger the warnings go to.
+    """
+
+    def __init__(self, threshold: float, logger_name: str = "responder.slow") -> None:
+        if threshold <= 0:
+            raise ValueError("slow_request_threshold must be positive")
+        self.threshold = threshold
+        self.interval = max(threshold / 4, 0.005)
+        self.logger = logging.getLogger(logger_name)
+        self._inflight: dict[str, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def track(self, request_id: str, scope: Scope) -> _InFlight:
+        entry = scope["inflight_request"] = _InFlight(scope)
+        with self._lock:
+            self._inflight[request_id] = entry
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._watch, name="responder-slow-requests", daemon=True
+                )
+                self._thread.start()
+        return entry
+
+    def done(self, request_id: str, entry: _InFlight) -> None:
+        with self._lock:
+            # A client reusing an X-Request-ID may have replaced our entry.
+            if self._inflight.get(request_id) is entry:
+                del self._inflight[request_id]
+
+    def _watch(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._inflight:
+                    self._thread = None
+                    return
+                entries = list(self._inflight.items())
+            now = time.monotonic()
+            for request_id, entry in entries:
+                if not entry.reported and now - entry.started >= self.threshold:
+                    entry.reported = True
+                    self._report(request_id, entry, now - entry.started)
+
+    def _report(self, request_id: str, entry: _InFlight, elapsed: float) -> None:
+        scope = entry.scope
+        route = scope.get("route_pattern") or scope.get("path", "?")
+        sections = []
+        task = entry.task
+        if task is not None and not task.done():
+            sections.append(
+                "Coroutine stack (most recent call last):\n"
+                + _format_frames(_coroutine_frames(task.get_coro()))
+            )
+        worker = _thread_stack(entry.thread)
+        if worker is not None:
+            sections.append(f"Worker thread stack:\n{worker}")
+        elif task is not None and getattr(task.get_coro(), "cr_running", False):
+            # The request's own coroutine holds the loop: show what it's doing.
+            loop = _thread_stack(entry.loop_thread)
+            if loop is not None:
+                sections.append(f"Event loop thread stack:\n{loop}")
+        self.logger.warning(
+            "Slow request %s %s [req:%s] still running after %.2fs\n%s",
+            scope.get("method", "WS"),
+            route,
+            request_id,
+            elapsed,
+            "\n".join(sections),
+        )
+
+
 class RequestIDMiddleware:
     """Echo an incoming ``X-Request-ID`` (or mint one) onto every HTTP response.
 
     Sits in the observability tier — outside error rendering — so the header is
     present even on ``500`` responses.
+
+    :param slow_request_threshold: Seconds after which a still-running request
+                                   is logged with its stacks; see
+                                   :class:`SlowRequestWatchdog`.
     """
 
-    def __init__(self, app):
+    def __init__(self, app: ASGIApp, slow_request_threshold: float | None = None) -> None:
         self.app = app
+        self.watchdog = None
+        if slow_request_threshold is not None:
+            self.watchdog = SlowRequestWatchdog(slow_request_threshold)
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
-        headers = dict(scope.get("headers", []))
-        rid = headers.get(b"x-request-id", b"").decode("latin-1") or str(uuid.uuid4())
+        rid = _find_header(scope.get("headers", ()), b"x-request-id") or str(uuid.uuid4())
         scope["request_id"] = rid
 
         async def send_wrapper(message):
@@ -63,7 +215,15 @@ class RequestIDMiddleware:
                 MutableHeaders(scope=message)["X-Request-ID"] = rid
             await send(message)
 
-        await self.app(scope, receive, send_wrapper)
+        if self.watchdog is None:
+            await self.app(scope, receive, send_wrapper)
+            return
+        entry = self.watchdog.track(rid, scope)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.watchdog.done(rid, entry)
+
 
 # Context variables for per-request metadata.
 _request_id: ContextVar[str] = ContextVar("request_id", default="-")
@@ -116,6 +276,171 @@ DEFAULT_LOG_FORMAT = (
 )
 
 
+class JSONFormatter(logging.Formatter):
+    """Format each record as one JSON object per line.
+
+    Emits ``time`` (ISO 8601, UTC), ``level``, ``logger`` and ``message``,
+    the request-context attributes set by :class:`RequestContextFilter`, and
+    the contents of a record's ``fields`` dict (the access log's
+    per-request values).
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for attr in ("request_id", "request_method", "request_path", "client_ip"):
+            value = getattr(record, attr, None)
+            if value not in (None, "-"):
+                entry[attr] = value
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    def __init__(self, log: AccessLog, max_queue: int):
+        self.records: queue.Queue[logging.LogRecord | None] = queue.Queue(max_queue)
+        super().__init__(self.records)
+        self._log = log
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Leave formatting to the listener thread; the args are plain values.
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.records.put_nowait(record)
+        except queue.Full:
+            self._log.dropped += 1
+
+
+class _DrainingQueueListener(QueueListener):
+    _sentinel = None  # QueueListener's end-of-queue marker
+
+    def __init__(
+        self, records: queue.Queue[logging.LogRecord | None], handler: logging.Handler
+    ):
+        super().__init__(records, handler, respect_handler_level=True)
+        self.records = records
+
+    def enqueue_sentinel(self) -> None:
+        # The default put_nowait() fails on a full queue; wait for room instead.
+        self.records.put(self._sentinel)
+
+
+class AccessLog:
+    """Access log that writes from a background thread, not the event loop.
+
+    Entries go through a bounded :class:`~logging.handlers.QueueHandler` to a
+    :class:`~logging.handlers.QueueListener` thread, which formats and writes
+    them. When a burst fills the queue, entries are dropped and counted in
+    :attr:`dropped` rather than blocking the request. Call :meth:`stop` (the
+    API does at shutdown) to flush what's queued.
+
+    :param handler: Destination handler. Defaults to stderr with
+                    :class:`JSONFormatter`.
+    :param sample_rate: Fraction of requests logged (``1.0`` logs all).
+    :param route_rates: Rate per route pattern, e.g. ``{"/health": 0}``.
+    :param status_rates: Rate per status code (``404``) or class (``"5xx"``).
+                         These take precedence over ``route_rates``.
+    :param max_queue: Entries buffered before new ones are dropped.
+    :param logger_name: The ``name`` of the emitted records.
+    """
+
+    def __init__(
+        self,
+        handler: logging.Handler | None = None,
+        *,
+        sample_rate: float = 1.0,
+        route_rates: Mapping[str, float] | None = None,
+        status_rates: Mapping[int | str, float] | None = None,
+        max_queue: int = 10_000,
+        logger_name: str = "responder.access",
+    ) -> None:
+        if handler is None:
+            handler = logging.StreamHandler()
+            handler.setFormatter(JSONFormatter())
+        self.handler = handler
+        self.sample_rate = sample_rate
+        self.route_rates = dict(route_rates or {})
+        self.status_rates = {str(k).lower(): v for k, v in (status_rates or {}).items()}
+        self.name = logger_name
+        self.dropped = 0
+        self._queue_handler = _DroppingQueueHandler(self, max_queue)
+        self._listener: QueueListener | None = None
+        self._lock = threading.Lock()
+
+    def _rate(self, route: str | None, status: int | None) -> float:
+        if self.status_rates and status is not None:
+            rate = self.status_rates.get(str(status))
+            if rate is None:
+                rate = self.status_rates.get(f"{status // 100}xx")
+            if rate is not None:
+                return rate
+        rate = self.route_rates.get(route) if route is not None else None
+        return self.sample_rate if rate is None else rate
+
+    def start(self) -> None:
+        """Start the writer thread (done automatically on the first entry)."""
+        with self._lock:
+            if self._listener is None:
+                self._listener = _DrainingQueueListener(
+                    self._queue_handler.records, self.handler
+                )
+                self._listener.start()
+
+    def stop(self) -> None:
+        """Write out everything queued and stop the writer thread."""
+        with self._lock:
+            listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.stop()
+
+    def log(
+        self,
+        method: str,
+        path: str,
+        status: int | None,
+        duration_ms: float,
+        *,
+        route: str | None = None,
+        request_id: str | None = None,
+        client_ip: str | None = None,
+    ) -> None:
+        """Queue one access-log entry, subject to sampling."""
+        rate = self._rate(route, status)
+        if rate < 1 and (rate <= 0 or random.random() >= rate):  # noqa: S311
+            return
+        if self._listener is None:
+            self.start()
+        record = logging.LogRecord(
+            self.name,
+            logging.INFO,
+            __file__,
+            0,
+            "%s %s → %s (%.1fms)",
+            (method, path, status or "?", duration_ms),
+            None,
+        )
+        record.fields = {
+            "method": method,
+            "path": path,
+            "route": route,
+            "status": status,
+            "duration_ms": round(duration_ms, 3),
+            "request_id": request_id,
+            "client_ip": client_ip,
+        }
+        self._queue_handler.handle(record)
+
+
 def get_logger(name: str | None = None) -> logging.Logger:
     """Get a logger with the request context filter attached.
 
@@ -140,8 +465,7 @@ def setup_logging(level: int = logging.INFO) -> None:
     # Only add our handler if the root logger has no handlers yet,
     # or if none of them use our filter.
     has_context_handler = any(
-        any(isinstance(f, RequestContextFilter) for f in h.filters)
-        for h in root.handlers
+        any(isinstance(f, RequestContextFilter) for f in h.filters) for h in root.handlers
     )
     if not has_context_handler:
         handler = logging.StreamHandler()
@@ -159,6 +483,11 @@ class LoggingMiddleware:
     1. Extracts or generates a request ID
     2. Sets context variables for method, path, and client IP
     3. Logs the request and response with timing information
+
+    With ``slow_request_threshold``, requests still running after that many
+    seconds are also logged with their stacks (see :class:`SlowRequestWatchdog`).
+    With ``access_log``, step 3 goes through that :class:`AccessLog` (queued,
+    sampled, written off the event loop) instead of ``logger_name``.
     """
 
     def __init__(
@@ -166,29 +495,34 @@ class LoggingMiddleware:
         app: Any,
         logger_name: str = "responder.access",
         trust_proxy_headers: bool = False,
+        slow_request_threshold: float | None = None,
+        access_log: AccessLog | None = None,
     ) -> None:
         self.app = app
         self.logger = get_logger(logger_name)
         self.trust_proxy_headers = trust_proxy_headers
+        self.access_log = access_log
+        self.watchdog = None
+        if slow_request_threshold is not None:
+            self.watchdog = SlowRequestWatchdog(slow_request_threshold)
 
     async def __call__(self, scope, receive, send):
         if scope["type"] not in ("http", "websocket"):
             await self.app(scope, receive, send)
             return
 
-        # Extract request metadata.
-        headers = dict(scope.get("headers", []))
+        # Extract request metadata. Scanning the raw list for the two or
+        # three headers needed is cheaper than building a dict of all of them.
+        headers = scope.get("headers", ())
 
         def get_header(name):
-            value = headers.get(name.encode("latin-1"))
-            return value.decode("latin-1") if value is not None else None
-
-        request_id = (
-            # ASGI header values are arbitrary bytes; latin-1 never raises
-            # (matches RequestIDMiddleware). A UTF-8 decode would crash the
-            # request on a non-UTF-8 X-Request-ID.
-            headers.get(b"x-request-id", b"").decode("latin-1") or uuid.uuid4().hex[:8]
-        )
+            return _find_header(headers, name.encode("latin-1"))
+
+        # ASGI header values are arbitrary bytes; latin-1 never raises
+        # (matches RequestIDMiddleware). A UTF-8 decode would crash the
+        # request on a non-UTF-8 X-Request-ID.
+        request_id = _find_header(headers, b"x-request-id") or uuid.uuid4().hex[:8]
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
         scope["request_id"] = request_id
         method = scope.get("method", "WS")
         path = scope.get("path", "/")
@@ -214,18 +548,32 @@ class LoggingMiddleware:
             nonlocal status_code
             if message["type"] == "http.response.start":
                 status_code = message.get("status")
-                # Inject request ID into response headers.
-                headers_list = list(message.get("headers", []))
-                headers_list.append((b"x-request-id", request_id.encode()))
-                message = {**message, "headers": headers_list}
+                # Inject request ID into response headers. The message is ours
+                # to change, but its header list may be a Response's own.
+                message["headers"] = [*message.get("headers", ()), request_id_header]
             await send(message)
 
+        entry = None
+        if self.watchdog is not None and scope["type"] == "http":
+            entry = self.watchdog.track(request_id, scope)
         start = time.perf_counter()
         try:
             await self.app(scope, receive, send_wrapper)
         finally:
+            if self.watchdog is not None and entry is not None:
+                self.watchdog.done(request_id, entry)
             duration_ms = (time.perf_counter() - start) * 1000
-            if scope["type"] == "http":
+            if scope["type"] == "http" and self.access_log is not None:
+                self.access_log.log(
+                    method,
+                    path,
+                    status_code,
+                    duration_ms,
+                    route=scope.get("route_pattern"),
+                    request_id=request_id,
+                    client_ip=client_ip,
+                )
+            elif scope["type"] == "http":
                 self.logger.info(
                     "%s %s → %s (%.1fms)",
                     method,
@@ -1,15 +1,48 @@
 """Built-in request metrics with Prometheus text exposition.
 
 Enabled via ``API(metrics_route="/metrics")`` — no external dependencies.
+
+With several worker processes, pass ``API(metrics_dir=...)`` — a directory
+shared by the workers (and empty at deploy time, see
+:func:`reset_metrics_dir`). Each worker then writes its counters into
+memory-mapped files there, and every worker's ``/metrics`` serves the sum
+across all of them.
 """
 
 from __future__ import annotations
 
+import json
+import mmap
+import os
+import random
+import secrets
+import struct
 import threading
-from collections import defaultdict
+import time
+import weakref
+from bisect import bisect_left
+from collections.abc import Callable, Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from starlette.requests import HTTPConnection
+from starlette.types import Scope
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from ..background import BackgroundQueue
+    from ..scheduling import Scheduler
+    from .logging import AccessLog
+    from .overload import AdmissionController, LoopLagMonitor
 
 # Histogram bucket upper bounds, in seconds.
 BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Finer bounds for the dispatch stages, most of which take well under 5ms.
+STAGE_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1, 1.0)
 
 
 class MetricsMiddleware:
@@ -17,37 +50,279 @@ class MetricsMiddleware:
 
     Sits just outside the exception middleware so error responses
     (404s, 500s) are observed with their real status codes.
+
+    It also times the dispatch stages the router marks (before hooks, auth,
+    dependencies, handler, after hooks and writing the response) and
+    records them per route. With ``server_timing``, the stage times are
+    reported to the client in a ``Server-Timing`` header.
+
+    :param collector: A :class:`MetricsCollector`, or ``None`` to only emit
+                      ``Server-Timing``.
+    :param server_timing: ``True`` for every request, a sample rate between
+                          0 and 1, or a predicate receiving a Starlette
+                          ``HTTPConnection`` (e.g. to trust internal callers).
     """
 
-    def __init__(self, app, collector):
+    def __init__(self, app, collector=None, server_timing=None):
         self.app = app
         self.collector = collector
+        self.server_timing = server_timing
+
+    def _emit_timing(self, scope: Scope) -> bool:
+        option = self.server_timing
+        if not option:
+            return False
+        if option is True:
+            return True
+        if callable(option):
+            return bool(option(HTTPConnection(scope)))
+        return random.random() < option  # noqa: S311
 
     async def __call__(self, scope, receive, send):
         if scope["type"] != "http":
             await self.app(scope, receive, send)
             return
 
-        import time
-
         status_holder = {"status": 0}
+        marks: list[tuple[str, int]] = []
+        scope["stage_marks"] = marks
+        emit = self._emit_timing(scope)
+        start = time.perf_counter_ns()
 
         async def recording_send(message):
             if message["type"] == "http.response.start":
                 status_holder["status"] = message["status"]
+                if emit:
+                    value = _server_timing(marks, start, time.perf_counter_ns())
+                    headers = [*message.get("headers", ()), (b"server-timing", value)]
+                    message = {**message, "headers": headers}
             await send(message)
 
-        start = time.perf_counter()
         try:
             await self.app(scope, receive, recording_send)
         finally:
-            # The router stamps scope["route_pattern"] during resolution.
-            self.collector.record(
-                scope.get("method", ""),
-                scope.get("route_pattern", "unmatched"),
-                status_holder["status"] or 500,
-                time.perf_counter() - start,
-            )
+            end = time.perf_counter_ns()
+            if self.collector is not None:
+                # The router stamps scope["route_pattern"] during resolution.
+                method = scope.get("method", "")
+                path = scope.get("route_pattern", "unmatched")
+                self.collector.record(
+                    method, path, status_holder["status"] or 500, (end - start) / 1e9
+                )
+                if marks:
+                    self.collector.record_stages(
+                        method, path, _stage_durations(marks, end)
+                    )
+
+
+def _stage_durations(marks: list[tuple[str, int]], end: int) -> dict[str, float]:
+    """Seconds per stage; each mark runs until the next (repeats are summed)."""
+    durations: dict[str, float] = {}
+    ends = [started for _, started in marks[1:]] + [end]
+    for (stage, started), finished in zip(marks, ends, strict=True):
+        durations[stage] = durations.get(stage, 0.0) + (finished - started) / 1e9
+    return durations
+
+
+def _server_timing(marks: list[tuple[str, int]], start: int, now: int) -> bytes:
+    metrics = [
+        f"{stage};dur={seconds * 1000:.3f}"
+        for stage, seconds in _stage_durations(marks, now).items()
+    ]
+    metrics.append(f"total;dur={(now - start) / 1e6:.3f}")
+    return ", ".join(metrics).encode("latin-1")
+
+
+class _Row:
+    """One thread's counters for one (method, route) series."""
+
+    __slots__ = ("buckets", "total", "statuses")
+
+    def __init__(self, size: int):
+        # Per-bucket (not cumulative) counts; the last slot is ``+Inf``.
+        self.buckets = [0] * size
+        self.total = 0.0
+        self.statuses: dict[int, int] = {}
+
+
+class _Shard:
+    """Counters owned by one thread; only that thread ever writes them."""
+
+    __slots__ = ("rows", "version", "file")
+
+    def __init__(self, file: _MmapFile | None = None):
+        self.rows: list[_Row | _MmapRow | None] = []
+        self.version = 0
+        # Set in multi-process mode: rows then live in this shared file.
+        self.file = file
+
+
+# -- multi-process storage ----------------------------------------------------
+#
+# One append-only file per (process, thread shard): an 8-byte header holding
+# the used length, then entries of
+#   [u32 key length][utf-8 JSON key, padded to 8-byte alignment][f64 value]
+# Only the owning thread writes a file, so writes need no lock; an entry is
+# fully written before the header publishes it.
+
+_FILE_SUFFIX = ".metrics"
+_ARCHIVE = "archive" + _FILE_SUFFIX
+_INITIAL_SIZE = 64 * 1024
+
+
+class _MmapFile:
+    def __init__(self, path: Path):
+        self.path = path
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+        os.ftruncate(self._fd, _INITIAL_SIZE)
+        self._mm = mmap.mmap(self._fd, _INITIAL_SIZE)
+        self._used = 8
+        struct.pack_into("<I", self._mm, 0, self._used)
+
+    def slot(self, key: str) -> int:
+        """Append a zeroed entry for ``key`` and return its value's offset."""
+        encoded = key.encode()
+        padded = len(encoded) + (-(4 + len(encoded)) % 8)
+        size = 4 + padded + 8
+        if self._used + size > len(self._mm):
+            capacity = len(self._mm)
+            while self._used + size > capacity:
+                capacity *= 2
+            self._mm.close()
+            os.ftruncate(self._fd, capacity)
+            self._mm = mmap.mmap(self._fd, capacity)
+        offset = self._used
+        struct.pack_into(f"<I{padded}sd", self._mm, offset, len(encoded), encoded, 0.0)
+        self._used += size
+        struct.pack_into("<I", self._mm, 0, self._used)
+        return offset + 4 + padded
+
+    def get(self, offset: int) -> float:
+        return struct.unpack_from("<d", self._mm, offset)[0]
+
+    def set(self, offset: int, value: float) -> None:
+        struct.pack_into("<d", self._mm, offset, value)
+
+
+def _read_metrics_file(path: Path) -> dict[str, float]:
+    """Parse one metrics file; a torn trailing entry is simply skipped."""
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return {}
+    values: dict[str, float] = {}
+    if len(data) < 8:
+        return values
+    used = min(struct.unpack_from("<I", data, 0)[0], len(data))
+    offset = 8
+    while offset + 4 <= used:
+        (length,) = struct.unpack_from("<I", data, offset)
+        padded = length + (-(4 + length) % 8)
+        end = offset + 4 + padded + 8
+        if length == 0 or end > used:
+            break
+        key = data[offset + 4 : offset + 4 + length].decode()
+        (values[key],) = struct.unpack_from("<d", data, offset + 4 + padded)
+        offset = end
+    return values
+
+
+def _write_archive(path: Path, values: dict[str, float]) -> None:
+    chunks = [b""]
+    for key, value in values.items():
+        encoded = key.encode()
+        padded = len(encoded) + (-(4 + len(encoded)) % 8)
+        chunks.append(struct.pack(f"<I{padded}sd", len(encoded), encoded, value))
+    body = b"".join(chunks)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(struct.pack("<II", 8 + len(body), 0) + body)
+    os.replace(tmp, path)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def reset_metrics_dir(path: str | os.PathLike) -> None:
+    """Delete the metric files in ``path`` (creating it if needed).
+
+    Call from the process manager (or deploy script) before starting the
+    workers, so counts from a previous run aren't carried over.
+    """
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    for file in directory.glob("*" + _FILE_SUFFIX):
+        file.unlink(missing_ok=True)
+
+
+class _SlotList:
+    """List-like view of consecutive float slots in a metrics file."""
+
+    __slots__ = ("_file", "_offsets")
+
+    def __init__(self, file: _MmapFile, offsets: list[int]):
+        self._file = file
+        self._offsets = offsets
+
+    def __getitem__(self, index: int) -> int:
+        return int(self._file.get(self._offsets[index]))
+
+    def __setitem__(self, index: int, value: int) -> None:
+        self._file.set(self._offsets[index], value)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+
+class _SlotDict:
+    """Dict-like view of status-code counters, allocating slots on first use."""
+
+    __slots__ = ("_file", "_prefix", "_offsets")
+
+    def __init__(self, file: _MmapFile, prefix: list):
+        self._file = file
+        self._prefix = prefix
+        self._offsets: dict[int, int] = {}
+
+    def get(self, code: int, default: int = 0) -> int:
+        offset = self._offsets.get(code)
+        return default if offset is None else int(self._file.get(offset))
+
+    def __setitem__(self, code: int, value: int) -> None:
+        offset = self._offsets.get(code)
+        if offset is None:
+            key = json.dumps([*self._prefix, str(code)])
+            offset = self._offsets[code] = self._file.slot(key)
+        self._file.set(offset, value)
+
+
+class _MmapRow:
+    """A :class:`_Row` whose counters live in a shared metrics file."""
+
+    __slots__ = ("buckets", "statuses", "_file", "_sum")
+
+    def __init__(self, file: _MmapFile, key: tuple[str, ...], bounds: tuple):
+        labels = [*map(str, bounds), "+Inf"]
+        self._file = file
+        self.buckets = _SlotList(
+            file, [file.slot(json.dumps(["b", *key, le])) for le in labels]
+        )
+        self._sum = file.slot(json.dumps(["s", *key]))
+        self.statuses = _SlotDict(file, ["r", *key])
+
+    @property
+    def total(self) -> float:
+        return self._file.get(self._sum)
+
+    @total.setter
+    def total(self, value: float) -> None:
+        self._file.set(self._sum, value)
 
 
 class MetricsCollector:
@@ -56,70 +331,428 @@ class MetricsCollector:
     Labels use the route *pattern* (``/users/{id}``), not the raw path,
     so cardinality stays bounded. Requests that match no route are
     labelled ``unmatched``.
+
+    ``record()`` takes no lock: each thread (the event loop's included)
+    writes its own shard of array-backed counters, indexed by a per-series
+    id, and :meth:`render` merges the shards at scrape time. Rendering is
+    cached until something new is recorded.
+
+    With ``multiprocess_dir``, shards are memory-mapped files in that
+    directory instead, named by process, so every process sharing it renders
+    the combined counts. Files left by exited processes are folded into one
+    archive file, so worker restarts neither lose counts nor pile up files.
+
+    :param buckets: Histogram upper bounds (seconds) for every route.
+    :param route_buckets: Per-route-pattern overrides of ``buckets``, e.g.
+                          ``{"/upload": (0.1, 1, 10, 60)}``.
+    :param multiprocess_dir: Directory shared by all worker processes.
+    :param stage_buckets: Histogram upper bounds (seconds) for the per-stage
+                          dispatch timings passed to :meth:`record_stages`.
     """
 
-    def __init__(self):
-        self.requests: dict[tuple[str, str, str], int] = defaultdict(int)
-        self.latency_sum: dict[tuple[str, str], float] = defaultdict(float)
-        self.latency_count: dict[tuple[str, str], int] = defaultdict(int)
-        self.latency_buckets: dict[tuple[str, str, float], int] = defaultdict(int)
-        # Guards the dicts: record() runs per request (possibly from a thread
-        # pool / concurrent tasks) while render() iterates them on a /metrics
-        # scrape. Without this an in-flight record() can raise "dictionary
-        # changed size during iteration" in render(), and increments are lost
-        # on free-threaded CPython.
+    def __init__(
+        self,
+        buckets: Sequence[float] = BUCKETS,
+        route_buckets: Mapping[str, Sequence[float]] | None = None,
+        multiprocess_dir: str | os.PathLike | None = None,
+        stage_buckets: Sequence[float] = STAGE_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.route_buckets = {
+            path: tuple(sorted(bounds)) for path, bounds in (route_buckets or {}).items()
+        }
+        self.stage_buckets = tuple(sorted(stage_buckets))
+        # Series key -> id; ids index _series_keys/_series_bounds and every
+        # shard's rows. Request series are keyed ``(method, path)``, stage
+        # series ``(method, path, stage)``. Only registration takes the lock.
+        self._ids: dict[tuple[str, ...], int] = {}
+        self._series_keys: list[tuple[str, ...]] = []
+        self._series_bounds: list[tuple[float, ...]] = []
+        self._shards: list[_Shard] = []
+        self._local = threading.local()
         self._lock = threading.Lock()
+        self._cache: tuple[tuple[int, int], list[str]] | None = None
+        self._sources: list[Callable[[], list[str]]] = []
+        self.multiprocess_dir: Path | None = None
+        if multiprocess_dir is not None:
+            self.multiprocess_dir = Path(multiprocess_dir)
+            self.multiprocess_dir.mkdir(parents=True, exist_ok=True)
+            self._file_prefix = f"{os.getpid()}-{secrets.token_hex(4)}"
+            _forked_collectors.add(self)
 
-    def record(self, method: str, path: str, status: int, duration: float) -> None:
-        key = (method, path)
+    def add_source(self, source: Callable[[], list[str]]) -> None:
+        """Append the exposition lines ``source()`` returns to every render.
+
+        Lets other components (e.g. the background queue) publish gauges
+        through the same ``/metrics`` endpoint.
+        """
+        self._sources.append(source)
+
+    def _register(self, key: tuple[str, ...]) -> int:
         with self._lock:
-            self.requests[(method, path, str(status))] += 1
-            self.latency_sum[key] += duration
-            self.latency_count[key] += 1
-            for bound in BUCKETS:
-                if duration <= bound:
-                    self.latency_buckets[(method, path, bound)] += 1
+            series = self._ids.get(key)
+            if series is None:
+                series = len(self._series_keys)
+                if len(key) == 3:
+                    bounds = self.stage_buckets
+                else:
+                    bounds = self.route_buckets.get(key[1], self.buckets)
+                # Bounds first: readers size their snapshot by _series_keys.
+                self._series_bounds.append(bounds)
+                self._series_keys.append(key)
+                self._ids[key] = series
+            return series
 
-    def render(self) -> str:
-        """The collected metrics in Prometheus text exposition format."""
-        # Snapshot under the lock, then format without holding it.
+    def _shard(self) -> _Shard:
+        file = None
         with self._lock:
-            requests = dict(self.requests)
-            latency_sum = dict(self.latency_sum)
-            latency_count = dict(self.latency_count)
-            latency_buckets = dict(self.latency_buckets)
+            if self.multiprocess_dir is not None:
+                name = f"{self._file_prefix}-{len(self._shards)}{_FILE_SUFFIX}"
+                file = _MmapFile(self.multiprocess_dir / name)
+            shard = _Shard(file)
+            self._shards.append(shard)
+        self._local.shard = shard
+        return shard
+
+    def _after_fork(self) -> None:
+        # The child inherits the parent's shards (and their files); start
+        # over with its own, leaving the parent's counts to the parent.
+        self._shards = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file_prefix = f"{os.getpid()}-{secrets.token_hex(4)}"
+
+    def _observe(
+        self, shard: _Shard, key: tuple[str, ...], duration: float
+    ) -> _Row | _MmapRow:
+        series = self._ids.get(key)
+        if series is None:
+            series = self._register(key)
+        rows = shard.rows
+        if series >= len(rows):
+            rows.extend([None] * (series + 1 - len(rows)))
+        bounds = self._series_bounds[series]
+        row = rows[series]
+        if row is None:
+            if shard.file is None:
+                row = rows[series] = _Row(len(bounds) + 1)
+            else:
+                row = rows[series] = _MmapRow(shard.file, key, bounds)
+        row.buckets[bisect_left(bounds, duration)] += 1
+        row.total += duration
+        return row
+
+    def record(self, method: str, path: str, status: int, duration: float) -> None:
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        row = self._observe(shard, (method, path), duration)
+        row.statuses[status] = row.statuses.get(status, 0) + 1
+        shard.version += 1
+
+    def record_stages(self, method: str, path: str, stages: Mapping[str, float]) -> None:
+        """Record one request's per-stage durations (seconds), keyed by stage."""
+        try:
+            shard = self._local.shard
+        except AttributeError:
+            shard = self._shard()
+        for stage, duration in stages.items():
+            self._observe(shard, (method, path, stage), duration)
+        shard.version += 1
+
+    def _merge(self) -> list[tuple[tuple[str, ...], tuple, _Row]]:
+        """Sum every shard into one row per series: ``(key, bounds, row)``."""
+        if self.multiprocess_dir is not None:
+            return self._merge_files(self.multiprocess_dir)
+        keys = list(self._series_keys)
+        bounds = self._series_bounds[: len(keys)]
+        merged = [_Row(len(b) + 1) for b in bounds]
+        for shard in list(self._shards):
+            for acc, row in zip(merged, list(shard.rows)[: len(keys)], strict=False):
+                if not isinstance(row, _Row):  # None: not observed by this shard
+                    continue
+                for j, count in enumerate(list(row.buckets)):
+                    acc.buckets[j] += count
+                acc.total += row.total
+                for code, count in dict(row.statuses).items():
+                    acc.statuses[code] = acc.statuses.get(code, 0) + count
+        return list(zip(keys, bounds, merged, strict=True))
+
+    def _merge_files(self, directory: Path) -> list[tuple[tuple[str, ...], tuple, _Row]]:
+        lock = None
+        if fcntl is not None:
+            lock = open(directory / ".lock", "a")  # noqa: SIM115
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            self._compact(directory)
+            totals: dict[str, float] = {}
+            for file in directory.glob("*" + _FILE_SUFFIX):
+                for key, value in _read_metrics_file(file).items():
+                    totals[key] = totals.get(key, 0.0) + value
+        finally:
+            if lock is not None:
+                lock.close()
+
+        buckets: dict[tuple[str, ...], dict[str, float]] = {}
+        sums: dict[tuple[str, ...], float] = {}
+        statuses: dict[tuple[str, ...], dict[int, int]] = {}
+        for key, value in totals.items():
+            kind, *labels = json.loads(key)
+            if kind == "b":
+                buckets.setdefault(tuple(labels[:-1]), {})[labels[-1]] = value
+            elif kind == "s":
+                sums[tuple(labels)] = value
+            elif kind == "r":
+                codes = statuses.setdefault(tuple(labels[:-1]), {})
+                codes[int(labels[-1])] = int(value)
+        merged: list[tuple[tuple[str, ...], tuple, _Row]] = []
+        for series, by_le in buckets.items():
+            bounds = tuple(sorted((le for le in by_le if le != "+Inf"), key=float))
+            row = _Row(len(bounds) + 1)
+            row.buckets = [int(by_le[le]) for le in bounds] + [int(by_le.get("+Inf", 0))]
+            row.total = sums.get(series, 0.0)
+            row.statuses = statuses.get(series, {})
+            merged.append((series, tuple(_number(le) for le in bounds), row))
+        return merged
+
+    def _compact(self, directory: Path) -> None:
+        """Fold files of exited processes into the archive. Caller holds the lock."""
+        dead = []
+        for file in directory.glob("*" + _FILE_SUFFIX):
+            pid = file.name.split("-", 1)[0]
+            if pid.isdigit() and int(pid) != os.getpid() and not _pid_alive(int(pid)):
+                dead.append(file)
+        if not dead:
+            return
+        archive = directory / _ARCHIVE
+        values = _read_metrics_file(archive)
+        for file in dead:
+            for key, value in _read_metrics_file(file).items():
+                values[key] = values.get(key, 0.0) + value
+        _write_archive(archive, values)
+        for file in dead:
+            file.unlink(missing_ok=True)
+
+    @property
+    def requests(self) -> dict[tuple[str, str, str], int]:
+        """Merged request counts keyed by ``(method, path, status)``."""
+        return {
+            (*key, str(code)): count
+            for key, _, row in self._merge()
+            if len(key) == 2
+            for code, count in row.statuses.items()
+        }
+
+    @property
+    def latency_count(self) -> dict[tuple[str, str], int]:
+        return {key: sum(row.buckets) for key, _, row in self._merge() if len(key) == 2}
+
+    @property
+    def latency_sum(self) -> dict[tuple[str, str], float]:
+        return {key: row.total for key, _, row in self._merge() if len(key) == 2}
+
+    @property
+    def stage_sum(self) -> dict[tuple[str, str, str], float]:
+        """Total seconds spent per ``(method, path, stage)``."""
+        return {key: row.total for key, _, row in self._merge() if len(key) == 3}
+
+    def _version(self) -> tuple[int, int]:
+        return (
+            len(self._series_keys),
+            sum(shard.version for shard in list(self._shards)),
+        )
+
+    def _render_requests(self) -> list[str]:
+        merged = sorted(self._merge(), key=lambda item: item[0])
+        series = [item for item in merged if len(item[0]) == 2]
+        stages = [item for item in merged if len(item[0]) == 3]
         lines = [
             "# HELP responder_requests_total Total HTTP requests.",
             "# TYPE responder_requests_total counter",
         ]
-        for (method, path, status), count in sorted(requests.items()):
-            lines.append(
-                f'responder_requests_total{{method="{method}",path="{path}",'
-                f'status="{status}"}} {count}'
-            )
+        for (method, path), _, row in series:
+            for code, count in sorted(row.statuses.items()):
+                lines.append(
+                    f'responder_requests_total{{method="{method}",path="{path}",'
+                    f'status="{code}"}} {count}'
+                )
 
         lines += [
             "# HELP responder_request_duration_seconds HTTP request latency.",
             "# TYPE responder_request_duration_seconds histogram",
         ]
-        for (method, path), count in sorted(latency_count.items()):
-            cumulative = 0
-            for bound in BUCKETS:
-                cumulative = latency_buckets.get((method, path, bound), 0)
-                lines.append(
-                    f'responder_request_duration_seconds_bucket{{method="{method}",'
-                    f'path="{path}",le="{bound}"}} {cumulative}'
-                )
-            lines.append(
-                f'responder_request_duration_seconds_bucket{{method="{method}",'
-                f'path="{path}",le="+Inf"}} {count}'
+        for (method, path), bounds, row in series:
+            labels = f'method="{method}",path="{path}"'
+            lines += _histogram_lines(
+                "responder_request_duration_seconds", labels, bounds, row
             )
-            lines.append(
-                f'responder_request_duration_seconds_sum{{method="{method}",'
-                f'path="{path}"}} {latency_sum[(method, path)]:.6f}'
+        if stages:
+            lines += [
+                "# HELP responder_request_stage_seconds Time spent per dispatch stage.",
+                "# TYPE responder_request_stage_seconds histogram",
+            ]
+        for (method, path, stage), bounds, row in stages:
+            labels = f'method="{method}",path="{path}",stage="{stage}"'
+            lines += _histogram_lines(
+                "responder_request_stage_seconds", labels, bounds, row
             )
+        return lines
+
+    def render(self) -> str:
+        """The collected metrics in Prometheus text exposition format."""
+        version = self._version()
+        cache = self._cache
+        # Other processes' writes are invisible to the version check.
+        if self.multiprocess_dir is not None:
+            cache = None
+        if cache is not None and cache[0] == version:
+            lines = list(cache[1])
+        else:
+            lines = self._render_requests()
+            self._cache = (version, lines)
+            lines = list(lines)
+        for source in self._sources:
+            lines += source()
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(name: str, labels: str, bounds: tuple, row: _Row) -> list[str]:
+    lines = []
+    cumulative = 0
+    for bound, count in zip(bounds, row.buckets, strict=False):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    count = cumulative + row.buckets[-1]
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+    lines.append(f"{name}_sum{{{labels}}} {row.total:.6f}")
+    lines.append(f"{name}_count{{{labels}}} {count}")
+    return lines
+
+
+def _number(text: str) -> float | int:
+    value = float(text)
+    return int(value) if value.is_integer() and "." not in text else value
+
+
+_forked_collectors: weakref.WeakSet[MetricsCollector] = weakref.WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for collector in list(_forked_collectors):
+        collector._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def background_queue_lines(queue: BackgroundQueue) -> list[str]:
+    """Prometheus lines for a :class:`~responder.background.BackgroundQueue`."""
+    stats = queue.stats()
+    lines = [
+        "# HELP responder_background_tasks Background tasks by state.",
+        "# TYPE responder_background_tasks gauge",
+    ]
+    for state in ("pending", "running"):
+        lines.append(f'responder_background_tasks{{state="{state}"}} {stats[state]}')
+    lines += [
+        "# HELP responder_background_tasks_total Finished background tasks.",
+        "# TYPE responder_background_tasks_total counter",
+    ]
+    for outcome in ("completed", "failed", "dropped"):
+        lines.append(
+            f'responder_background_tasks_total{{outcome="{outcome}"}} {stats[outcome]}'
+        )
+    started = stats["completed"] + stats["failed"] + stats["running"]
+    finished = stats["completed"] + stats["failed"]
+    lines += [
+        "# HELP responder_background_queue_seconds Time tasks waited to start.",
+        "# TYPE responder_background_queue_seconds summary",
+        f"responder_background_queue_seconds_sum {stats['queue_seconds']:.6f}",
+        f"responder_background_queue_seconds_count {started}",
+        "# HELP responder_background_run_seconds Time tasks spent running.",
+        "# TYPE responder_background_run_seconds summary",
+        f"responder_background_run_seconds_sum {stats['run_seconds']:.6f}",
+        f"responder_background_run_seconds_count {finished}",
+    ]
+    return lines
+
+
+def scheduled_task_lines(scheduler: Scheduler) -> list[str]:
+    """Prometheus lines for ``@api.every`` / ``@api.cron`` jobs."""
+    tasks = sorted(scheduler.tasks, key=lambda task: task.name)
+    if not tasks:
+        return []
+    lines = [
+        "# HELP responder_scheduled_task_runs_total Scheduled task runs.",
+        "# TYPE responder_scheduled_task_runs_total counter",
+    ]
+    for task in tasks:
+        succeeded = task.runs - task.failures
+        for outcome, count in (
+            ("success", succeeded),
+            ("failure", task.failures),
+            ("skipped", task.skipped),
+        ):
             lines.append(
-                f'responder_request_duration_seconds_count{{method="{method}",'
-                f'path="{path}"}} {count}'
+                f'responder_scheduled_task_runs_total{{task="{task.name}",'
+                f'outcome="{outcome}"}} {count}'
             )
-        return "\n".join(lines) + "\n"
+    lines += [
+        "# HELP responder_scheduled_task_duration_seconds Scheduled task run time.",
+        "# TYPE responder_scheduled_task_duration_seconds summary",
+    ]
+    for task in tasks:
+        lines.append(
+            f'responder_scheduled_task_duration_seconds_sum{{task="{task.name}"}} '
+            f"{task.total_seconds:.6f}"
+        )
+        lines.append(
+            f'responder_scheduled_task_duration_seconds_count{{task="{task.name}"}} '
+            f"{task.runs}"
+        )
+    return lines
+
+
+def loop_lag_lines(monitor: LoopLagMonitor) -> list[str]:
+    """Prometheus lines for a :class:`~responder.ext.overload.LoopLagMonitor`."""
+    name = "responder_event_loop_lag_seconds"
+    lines = [
+        f"# HELP {name} How late the event loop ran a scheduled wake-up.",
+        f"# TYPE {name} histogram",
+    ]
+    cumulative = 0
+    for bound, count in zip(monitor.buckets, monitor.counts, strict=False):
+        cumulative += count
+        lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+    count = cumulative + monitor.counts[-1]
+    lines += [
+        f'{name}_bucket{{le="+Inf"}} {count}',
+        f"{name}_sum {monitor.total:.6f}",
+        f"{name}_count {count}",
+    ]
+    return lines
+
+
+def admission_lines(controller: AdmissionController) -> list[str]:
+    """Prometheus lines for an :class:`~responder.ext.overload.AdmissionController`."""
+    lines = [
+        "# HELP responder_requests_in_flight Requests currently being handled.",
+        "# TYPE responder_requests_in_flight gauge",
+        f"responder_requests_in_flight {controller.in_flight}",
+        "# HELP responder_requests_shed_total Requests shed by admission control.",
+        "# TYPE responder_requests_shed_total counter",
+    ]
+    for reason, count in sorted(controller.shed.items()):
+        lines.append(f'responder_requests_shed_total{{reason="{reason}"}} {count}')
+    return lines
+
+
+def access_log_lines(access_log: AccessLog) -> list[str]:
+    """Prometheus lines for a :class:`~responder.ext.logging.AccessLog`."""
+    return [
+        "# HELP responder_access_log_dropped_total Access-log entries dropped.",
+        "# TYPE responder_access_log_dropped_total counter",
+        f"responder_access_log_dropped_total {access_log.dropped}",
+    ]
@@ -1,12 +1,17 @@
+import hashlib
+import json
 import logging
+import os
 import re
 from pathlib import Path
 from typing import Any
 
+import yaml
 from apispec import APISpec, yaml_utils
 from apispec.ext.marshmallow import MarshmallowPlugin
 
 from responder import status_codes
+from responder.formats import _json_default
 from responder.statics import API_THEMES, DEFAULT_OPENAPI_THEME
 from responder.templates import Templates
 
@@ -545,6 +550,45 @@ class PydanticPlugin:
         return {}
 
 
+def load_openapi_file(path: str | os.PathLike) -> dict:
+    """Read an OpenAPI document from a ``.json`` or YAML file."""
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    try:
+        if path.suffix.lower() == ".json":
+            data = json.loads(text)
+        else:
+            data = yaml.safe_load(text)
+    except (ValueError, yaml.YAMLError) as exc:
+        raise ValueError(f"{path} is not valid JSON or YAML: {exc}") from exc
+    if not isinstance(data, dict) or "openapi" not in data:
+        raise ValueError(f"{path} is not an OpenAPI document")
+    return data
+
+
+class _OpenAPIDocument:
+    """One build of the OpenAPI document, with its encodings and ETags.
+
+    ``spec`` is the :class:`~apispec.APISpec` it was built from, or ``None``
+    for a document loaded from ``openapi_file``.
+    """
+
+    __slots__ = ("data", "spec", "snapshot", "json", "json_etag", "yaml", "yaml_etag")
+
+    def __init__(self, data, snapshot=None, spec=None):
+        self.data = data
+        self.spec = spec
+        self.snapshot = snapshot
+        self.json = json.dumps(data, default=_json_default).encode()
+        self.yaml = yaml_utils.dict_to_yaml(data).encode()
+        self.json_etag = _strong_etag(self.json)
+        self.yaml_etag = _strong_etag(self.yaml)
+
+
+def _strong_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
 class OpenAPISchema:
     def __init__(
         self,
@@ -562,6 +606,7 @@ class OpenAPISchema:
         static_route="/static",
         openapi_theme=DEFAULT_OPENAPI_THEME,
         servers=None,
+        openapi_file=None,
     ):
         self.app = app
         self.servers = servers
@@ -569,6 +614,18 @@ class OpenAPISchema:
         self.pydantic_schemas = {}
         self.security_schemes: dict[str, dict] = {}
         self.default_security: list[dict] = []
+
+        # A prebuilt document is served as-is and never rebuilt from routes.
+        self.openapi_file = openapi_file
+        self._document: _OpenAPIDocument | None = None
+        if openapi_file is not None:
+            data = load_openapi_file(openapi_file)
+            self._document = _OpenAPIDocument(data)
+            info = data.get("info") or {}
+            title = title or info.get("title")
+            version = version or info.get("version")
+            openapi = openapi or data["openapi"]
+
         self.title = title or "Responder API"
         self.version = version or "0.0.0"
         self.description = description
@@ -597,8 +654,53 @@ class OpenAPISchema:
 
         self.static_route = static_route
 
+        # The built document, rebuilt when ``_snapshot()`` changes: routes are
+        # (re)registered, or ``invalidate()`` bumps the generation.
+        self._generation = 0
+        self._docs_html: tuple[tuple, str, str] | None = None
+
+    def invalidate(self):
+        """Drop the built document; the next request rebuilds it.
+
+        Registering routes, schemas, or security schemes does this already.
+        Call it after changing a route's metadata or these attributes in place.
+        """
+        self._generation += 1
+
+    def _snapshot(self):
+        router = self.app.router
+        return (
+            self._generation,
+            tuple(router.routes),
+            tuple(getattr(router, "dependencies", {}) or {}),
+        )
+
+    def document(self) -> _OpenAPIDocument:
+        """The OpenAPI document, built on first use and cached until invalidated.
+
+        With ``openapi_file``, the document loaded at startup.
+        """
+        if self.openapi_file is not None:
+            assert self._document is not None  # loaded by __init__
+            return self._document
+        snapshot = self._snapshot()
+        document = self._document
+        if document is None or document.snapshot != snapshot:
+            spec = self._build_apispec()
+            document = self._document = _OpenAPIDocument(spec.to_dict(), snapshot, spec)
+        return document
+
     @property
     def _apispec(self):
+        spec = self.document().spec
+        if spec is None:
+            raise RuntimeError(
+                "The OpenAPI document was loaded from openapi_file, so there is "
+                "no APISpec to extend; read document().data instead"
+            )
+        return spec
+
+    def _build_apispec(self):
         info = {}
         if self.description is not None:
             info["description"] = self.description
@@ -859,7 +961,7 @@ class OpenAPISchema:
 
     @property
     def openapi(self):
-        return self._apispec.to_yaml()
+        return self.document().yaml.decode()
 
     def add_security_scheme(self, name, scheme, *, default=False):
         """Register an OpenAPI security scheme (and optionally require it globally)."""
@@ -868,6 +970,7 @@ class OpenAPISchema:
             requirement: dict = {name: []}
             if requirement not in self.default_security:
                 self.default_security.append(requirement)
+        self.invalidate()
 
     def add_schema(self, name, schema, check_existing=True):
         """Adds a marshmallow or Pydantic schema to the API specification."""
@@ -879,6 +982,7 @@ class OpenAPISchema:
             self.pydantic_schemas[name] = schema
         else:
             self.schemas[name] = schema
+        self.invalidate()
 
     def schema(self, name, **options):
         """Decorator for registering schemas (marshmallow or Pydantic).
@@ -910,12 +1014,21 @@ class OpenAPISchema:
 
     @property
     def docs(self):
-        return self.templates.render(
-            f"{self.docs_theme}.html",
-            title=self.title,
-            version=self.version,
-            schema_url=self.openapi_route,
-        )
+        return self._docs_page()[0]
+
+    def _docs_page(self) -> tuple[str, str]:
+        """The docs page and its ETag, rendered once per theme, title and version."""
+        key = (self.docs_theme, self.title, self.version, self.openapi_route)
+        cached = self._docs_html
+        if cached is None or cached[0] != key:
+            html = self.templates.render(
+                f"{self.docs_theme}.html",
+                title=self.title,
+                version=self.version,
+                schema_url=self.openapi_route,
+            )
+            cached = self._docs_html = (key, html, _strong_etag(html.encode()))
+        return cached[1], cached[2]
 
     def static_url(self, asset):
         """Given a static asset, return its URL path."""
@@ -924,16 +1037,24 @@ class OpenAPISchema:
         return f"{self.static_route}/{str(asset)}"
 
     def docs_response(self, req, resp):
-        resp.html = self.docs
+        resp.html, resp.etag = self._docs_page()
 
     def schema_response(self, req, resp):
         resp.status_code = status_codes.HTTP_200
+        document = self.document()
         # Serve JSON when asked (Accept header or a .json schema route);
-        # YAML otherwise.
-        if self.openapi_route.endswith(".json") or "json" in req.headers.get(
-            "Accept", ""
-        ):
-            resp.media = self._apispec.to_dict()
+        # YAML otherwise. Both are encoded once per build, and each carries
+        # its own strong ETag so a polling client gets a 304.
+        if self.openapi_route.endswith(".json"):
+            as_json = True
+        else:
+            as_json = "json" in req.headers.get("Accept", "")
+            resp.vary("Accept")
+        if as_json:
+            resp.headers["Content-Type"] = "application/json"
+            resp.content = document.json
+            resp.etag = document.json_etag
         else:
             resp.headers["Content-Type"] = "application/yaml"
-            resp.content = self.openapi
+            resp.content = document.yaml
+            resp.etag = document.yaml_etag
@@ -0,0 +1,211 @@
+"""Event-loop lag monitoring and load shedding.
+
+Enabled via ``API(loop_monitor=True)``. A task on the event loop sleeps for
+``interval`` seconds at a time and records how late it wakes up. That lag
+measures how long other callbacks held the loop, and with ``metrics_route``
+it is exported as the ``responder_event_loop_lag_seconds`` histogram. A
+watcher thread logs the loop thread's stack (logger ``responder.loop``)
+whenever the loop stays blocked longer than ``slow_callback`` seconds, which
+points at the culprit: sync code run inline, a huge ``json.dumps``, and so on.
+
+``API(max_loop_lag=..., max_in_flight=...)`` adds admission control:
+while the latest lag sample or the number of requests in flight exceeds its
+limit, new requests are answered ``503 Service Unavailable`` with
+``Retry-After`` instead of queueing behind the backlog. The health and
+metrics routes are always admitted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp
+
+__all__ = ["LoopLagMonitor", "AdmissionController", "AdmissionMiddleware"]
+
+# Histogram bucket upper bounds for loop lag, in seconds.
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class LoopLagMonitor:
+    """Samples event-loop lag while the app is running.
+
+    :param interval: Seconds between samples.
+    :param slow_callback: Log the loop thread's stack when the loop is blocked
+                          for longer than this many seconds.
+    :param buckets: Histogram upper bounds (seconds).
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.1,
+        slow_callback: float = 0.1,
+        buckets: Sequence[float] = LAG_BUCKETS,
+    ):
+        if interval <= 0 or slow_callback <= 0:
+            raise ValueError("interval and slow_callback must be positive")
+        self.interval = interval
+        self.slow_callback = slow_callback
+        self.buckets = tuple(sorted(buckets))
+        # Per-bucket (not cumulative) counts; the last slot is ``+Inf``.
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.total = 0.0
+        #: The most recent lag sample, in seconds.
+        self.lag = 0.0
+        self.logger = logging.getLogger("responder.loop")
+        self._task: asyncio.Task | None = None
+        self._watcher: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._loop_thread: int | None = None
+        # monotonic() when the current sleep started, and whether the watcher
+        # already reported the stall that followed it.
+        self._tick = time.monotonic()
+        self._reported = False
+
+    @property
+    def samples(self) -> int:
+        return sum(self.counts)
+
+    def observe(self, lag: float) -> None:
+        """Record one lag sample (seconds)."""
+        self.counts[bisect_left(self.buckets, lag)] += 1
+        self.total += lag
+        self.lag = lag
+        if lag >= self.slow_callback and not self._reported:
+            self.logger.warning("Event loop was blocked for %.3fs", lag)
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._stopped.clear()
+        self._loop_thread = threading.get_ident()
+        self._tick = time.monotonic()
+        self._task = asyncio.get_running_loop().create_task(self._sample())
+        self._watcher = threading.Thread(
+            target=self._watch, name="responder-loop-monitor", daemon=True
+        )
+        self._watcher.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+
+    async def _sample(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._reported = False
+            self._tick = time.monotonic()
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.observe(max(0.0, loop.time() - expected))
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.slow_callback / 2):
+            if self._reported:
+                continue
+            tick = self._tick
+            blocked = time.monotonic() - tick - self.interval
+            if blocked < self.slow_callback:
+                continue
+            thread = self._loop_thread
+            frame = sys._current_frames().get(thread) if thread is not None else None
+            if frame is None or self._tick != tick:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            del frame
+            self._reported = True
+            self.logger.warning(
+                "Event loop blocked for %.3fs so far; loop thread stack:\n%s",
+                blocked,
+                stack,
+            )
+
+
+class AdmissionController:
+    """Limits for :class:`AdmissionMiddleware`, and what it has shed.
+
+    :param max_lag: Shed while the latest loop-lag sample (seconds) of
+                    ``monitor`` exceeds this.
+    :param max_in_flight: Shed while this many requests are already running.
+    :param monitor: The :class:`LoopLagMonitor` supplying lag samples.
+    :param exempt: Paths that are always admitted (e.g. the health route).
+    :param retry_after: ``Retry-After`` seconds sent with ``503`` responses.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_lag: float | None = None,
+        max_in_flight: int | None = None,
+        monitor: LoopLagMonitor | None = None,
+        exempt: Iterable[str] = (),
+        retry_after: int = 1,
+    ):
+        if max_lag is not None and monitor is None:
+            raise ValueError("max_lag requires a LoopLagMonitor")
+        self.max_lag = max_lag
+        self.max_in_flight = max_in_flight
+        self.monitor = monitor
+        self.exempt = frozenset(exempt)
+        self.retry_after = retry_after
+        self.in_flight = 0
+        self.shed = {"lag": 0, "in_flight": 0}
+
+    def overloaded(self) -> str | None:
+        """The reason to shed a new request now, or ``None`` to admit it."""
+        if self.max_in_flight is not None and self.in_flight >= self.max_in_flight:
+            return "in_flight"
+        max_lag, monitor = self.max_lag, self.monitor
+        if max_lag is not None and monitor is not None and monitor.lag > max_lag:
+            return "lag"
+        return None
+
+
+class AdmissionMiddleware:
+    """ASGI middleware answering ``503`` while the controller is overloaded.
+
+    Admitted requests are counted in flight until their response completes.
+    Only touched from the event loop thread, so the counter needs no lock.
+    """
+
+    def __init__(self, app: ASGIApp, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        controller = self.controller
+        if scope["type"] != "http" or scope["path"] in controller.exempt:
+            await self.app(scope, receive, send)
+            return
+        reason = controller.overloaded()
+        if reason is not None:
+            controller.shed[reason] += 1
+            response = PlainTextResponse(
+                "Service Unavailable",
+                status_code=503,
+                headers={"Retry-After": str(controller.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        controller.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.in_flight -= 1
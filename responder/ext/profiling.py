@@ -0,0 +1,204 @@
+"""On-demand sampling profiler for live processes.
+
+Enabled via ``API(profiling_route="/debug/profile", profiling_auth=...)``.
+A ``GET`` samples every thread's Python stack for a few seconds and returns
+the result as collapsed stacks (for ``flamegraph.pl``, speedscope, and most
+flamegraph viewers) or as speedscope JSON::
+
+    curl -H "Authorization: Bearer $TOKEN" \\
+        "https://app/debug/profile?seconds=10&rate=200" > app.folded
+
+Query parameters: ``seconds`` (default 5), ``rate`` in samples per second
+(default 100), ``format`` (``collapsed`` or ``speedscope``), and ``idle=1``
+to keep threads that are merely waiting (idle pool workers, the event loop
+blocked in ``select``).
+
+Nothing is installed per request: the sampler is a thread that only exists
+while a profile is being taken.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from os.path import basename
+from types import CodeType, FrameType
+
+from starlette.concurrency import run_in_threadpool
+from starlette.exceptions import HTTPException
+
+__all__ = ["Profile", "sample", "profiling_view"]
+
+FORMATS = ("collapsed", "speedscope")
+
+# (file basename, function) of frames that mean "this thread is waiting".
+_IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+# A frame as (label, file, first line); labels are "module:qualname".
+_Frame = tuple[str, str, int]
+
+
+class Profile:
+    """Stack samples of every thread: each distinct stack and its count."""
+
+    def __init__(
+        self,
+        stacks: Counter[tuple[_Frame, ...]],
+        interval: float,
+        duration: float,
+    ):
+        self.stacks = stacks
+        self.interval = interval
+        self.duration = duration
+
+    @property
+    def samples(self) -> int:
+        return sum(self.stacks.values())
+
+    def collapsed(self) -> str:
+        """One ``root;caller;callee count`` line per distinct stack."""
+        lines = [
+            ";".join(label for label, _, _ in stack) + f" {count}"
+            for stack, count in sorted(self.stacks.items())
+        ]
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def speedscope(self) -> dict:
+        """The profile in speedscope's file format (https://speedscope.app)."""
+        frames: list[dict] = []
+        index: dict[_Frame, int] = {}
+        samples = []
+        weights = []
+        for stack, count in self.stacks.items():
+            ids = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    label, file, line = frame
+                    entry: dict[str, str | int] = {"name": label}
+                    if file:
+                        entry.update(file=file, line=line)
+                    frames.append(entry)
+                ids.append(index[frame])
+            samples.append(ids)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": "responder",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+            "activeProfileIndex": 0,
+            "exporter": "responder",
+        }
+
+
+def _label(code: CodeType, frame: FrameType, labels: dict) -> _Frame:
+    found = labels.get(code)
+    if found is None:
+        module = frame.f_globals.get("__name__", "?")
+        found = labels[code] = (
+            f"{module}:{code.co_qualname}",
+            code.co_filename,
+            code.co_firstlineno,
+        )
+    return found
+
+
+def _stack(top: FrameType, labels: dict, idle: bool) -> tuple[_Frame, ...] | None:
+    code = top.f_code
+    if not idle and (basename(code.co_filename), code.co_name) in _IDLE_FRAMES:
+        return None
+    stack = []
+    frame: FrameType | None = top
+    while frame is not None:
+        stack.append(_label(frame.f_code, frame, labels))
+        frame = frame.f_back
+    return tuple(reversed(stack))
+
+
+def sample(duration: float, *, interval: float = 0.01, idle: bool = False) -> Profile:
+    """Sample every other thread's stack each ``interval`` for ``duration`` seconds.
+
+    Blocks the calling thread for the duration; call it off the event loop.
+    """
+    me = threading.get_ident()
+    stacks: Counter[tuple[_Frame, ...]] = Counter()
+    labels: dict[CodeType, _Frame] = {}
+    started = time.perf_counter()
+    deadline = started + duration
+    while True:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, top in sys._current_frames().items():
+            if ident != me:
+                stack = _stack(top, labels, idle)
+                if stack is not None:
+                    thread = (f"thread:{names.get(ident, ident)}", "", 0)
+                    stacks[(thread, *stack)] += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+        time.sleep(min(interval, deadline - now))
+    return Profile(stacks, interval, time.perf_counter() - started)
+
+
+def profiling_view(*, max_seconds: float = 60.0, max_rate: float = 1000.0) -> Callable:
+    """Build the ``profiling_route`` view. Only one profile runs at a time."""
+    running = threading.Lock()
+
+    async def profile(req, resp):
+        params = req.params
+        try:
+            seconds = float(params.get("seconds", 5))
+            rate = float(params.get("rate", 100))
+        except ValueError:
+            raise HTTPException(
+                status_code=400, detail="seconds and rate must be numbers"
+            ) from None
+        if not 0 < seconds <= max_seconds or not 0 < rate <= max_rate:
+            raise HTTPException(
+                status_code=400,
+                detail=f"seconds must be in (0, {max_seconds:g}] and "
+                f"rate in (0, {max_rate:g}]",
+            )
+        output = params.get("format", "collapsed")
+        if output not in FORMATS:
+            raise HTTPException(
+                status_code=400, detail=f"format must be one of {', '.join(FORMATS)}"
+            )
+        if not running.acquire(blocking=False):
+            raise HTTPException(status_code=409, detail="A profile is already running")
+        try:
+            result = await run_in_threadpool(
+                sample,
+                seconds,
+                interval=1 / rate,
+                idle=params.get("idle") in ("1", "true"),
+            )
+        finally:
+            running.release()
+        resp.headers["Cache-Control"] = "no-store"
+        if output == "speedscope":
+            resp.media = result.speedscope()
+        else:
+            resp.headers["Content-Type"] = "text/plain; charset=utf-8"
+            resp.content = result.collapsed().encode()
+
+    return profile
@@ -1,15 +1,35 @@
 """Rate limiting for Responder, with pluggable storage backends."""
 
+import asyncio
+import contextlib
 import functools
+import hashlib
 import inspect
+import logging
+import math
+import mmap
+import os
+import re
+import struct
 import threading
 import time
 from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
 from typing import Protocol, runtime_checkable
 
 from starlette.concurrency import run_in_threadpool
 
+from ..concurrency import inline, is_inline
 from ..util.net import resolve_client_ip
+from .auth import APIKeyAuth
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger("responder")
 
 
 @runtime_checkable
@@ -63,6 +83,349 @@ class MemoryBackend:
                 self._buckets.popitem(last=False)
             return True, max_requests - len(bucket)
 
+    def hit_many(self, hits):
+        """Charge every window in ``hits`` or none of them; see :class:`Limit`."""
+        now = time.time()
+        with self._lock:
+            buckets = []
+            for key, _, period, _ in hits:
+                bucket = [t for t in self._buckets.get(key, ()) if t > now - period]
+                self._buckets[key] = bucket
+                self._buckets.move_to_end(key)
+                buckets.append(bucket)
+            admitted = all(
+                len(bucket) < max_requests
+                for bucket, (_, max_requests, _, _) in zip(buckets, hits, strict=True)
+            )
+            results = []
+            for bucket, (_, max_requests, _, _) in zip(buckets, hits, strict=True):
+                allowed = len(bucket) < max_requests
+                if admitted:
+                    bucket.append(now)
+                results.append((allowed, max(0, max_requests - len(bucket))))
+            while self._max_keys is not None and len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        return results
+
+
+def _batch_results(steps):
+    """``hit_many`` results from ``_gcra`` steps; refused batches charge nothing."""
+    admitted = all(granted for _, granted, _ in steps)
+    return [
+        (bool(granted), remaining if admitted else remaining + granted)
+        for _, granted, remaining in steps
+    ]
+
+
+def _gcra(tat, now, max_requests, period, burst, tokens=1):
+    """Spend up to ``tokens`` from a bucket with theoretical arrival time ``tat``.
+
+    Returns ``(new_tat, granted, remaining)``; ``remaining`` is how many more
+    tokens could be spent right now.
+    """
+    interval = period / max_requests
+    capacity = max_requests if burst is None else burst
+    start = max(tat, now)
+    # The bucket is empty once the arrival time runs ``capacity`` intervals
+    # ahead of the clock.
+    available = max(0, int(capacity - (start - now) / interval + 1e-9))
+    granted = min(tokens, available)
+    return start + granted * interval, granted, available - granted
+
+
+class GCRABackend:
+    """Token-bucket backend (GCRA) storing one float per key in process memory.
+
+    The generic cell rate algorithm tracks a single "theoretical arrival
+    time" per key instead of a timestamp per hit, so a hit costs the same
+    whether the limit is 10 or 10,000 requests per window. Requests are
+    admitted at a sustained rate of ``max_requests / period`` and may arrive
+    in bursts of up to ``burst`` (``max_requests`` by default) after a quiet
+    spell::
+
+        # 1000 requests an hour, never more than 20 back to back.
+        limiter = RateLimiter(requests=1000, period=3600, burst=20,
+                              backend=GCRABackend())
+
+    Keys are spread over ``shards`` independently locked maps, so concurrent
+    hits for different clients rarely contend. Each shard holds at most
+    ``max_keys // shards`` keys and evicts the least-recently-seen beyond
+    that (fail-open, like :class:`MemoryBackend`). Counts are per-process.
+    """
+
+    def __init__(self, max_keys: int = 100_000, shards: int = 16):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        # Per shard: a lock and key -> theoretical arrival time, oldest first.
+        self._shards: list[tuple[threading.Lock, OrderedDict[str, float]]] = [
+            (threading.Lock(), OrderedDict()) for _ in range(shards)
+        ]
+        self._max_keys = None if max_keys is None else max(1, max_keys // shards)
+
+    @inline
+    def hit(self, key, max_requests, period, burst=None):
+        """Record a hit for ``key``. Returns ``(allowed, remaining)``.
+
+        ``remaining`` is how many more requests would be admitted right now.
+        """
+        granted, remaining = self.take(key, 1, max_requests, period, burst)
+        return granted == 1, remaining
+
+    def take(self, key, tokens, max_requests, period, burst=None):
+        """Spend up to ``tokens`` at once. Returns ``(granted, remaining)``."""
+        now = time.monotonic()
+        lock, tats = self._shards[hash(key) % len(self._shards)]
+
+        with lock:
+            tat, granted, remaining = _gcra(
+                tats.get(key, now), now, max_requests, period, burst, tokens
+            )
+            if granted:
+                tats[key] = tat
+            self._remember(tats, key)
+        return granted, remaining
+
+    def give(self, key, tokens, max_requests, period, age=0.0):
+        """Return ``tokens`` taken earlier, e.g. the unspent part of a lease."""
+        now = time.monotonic()
+        lock, tats = self._shards[hash(key) % len(self._shards)]
+        with lock:
+            tat = tats.get(key)
+            if tat is not None and tat > now:
+                tats[key] = max(now, tat - tokens * period / max_requests)
+
+    @inline
+    def hit_many(self, hits):
+        """Charge every window in ``hits`` or none of them; see :class:`Limit`."""
+        now = time.monotonic()
+        indices = [hash(key) % len(self._shards) for key, *_ in hits]
+        locks = [self._shards[index][0] for index in sorted(set(indices))]
+        for lock in locks:
+            lock.acquire()
+        try:
+            steps = [
+                _gcra(self._shards[index][1].get(hit[0], now), now, *hit[1:])
+                for index, hit in zip(indices, hits, strict=True)
+            ]
+            admitted = all(granted for _, granted, _ in steps)
+            for index, hit, (tat, _, _) in zip(indices, hits, steps, strict=True):
+                tats = self._shards[index][1]
+                if admitted:
+                    tats[hit[0]] = tat
+                self._remember(tats, hit[0])
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        return _batch_results(steps)
+
+    def _remember(self, tats, key):
+        """Mark ``key`` recently used and evict the oldest key over the cap."""
+        if key in tats:
+            tats.move_to_end(key)
+        if self._max_keys is not None and len(tats) > self._max_keys:
+            tats.popitem(last=False)
+
+
+# -- shared-memory storage ----------------------------------------------------
+#
+# A fixed-size file, memory-mapped by every worker: a 16-byte header
+#   [b"RLGC"][u32 version][u32 slot count][u32 reserved]
+# then slots of [u64 key fingerprint][f64 theoretical arrival time]. Slots are
+# grouped into sets of _SET_SIZE; a key lives somewhere in the set its
+# fingerprint selects, and each set is guarded by an fcntl byte-range lock
+# (between processes) plus a threading lock (between threads, which share
+# the process's fcntl locks).
+
+_SHM_MAGIC = b"RLGC"
+_SHM_VERSION = 1
+_SHM_HEADER = struct.Struct("<4sIII")
+_SET_SIZE = 32
+_SET = struct.Struct("<" + "Qd" * _SET_SIZE)
+_SLOT = struct.Struct("<Qd")
+
+
+class SharedMemoryBackend:
+    """Token-bucket backend shared by every process on the host.
+
+    Counters live in a memory-mapped file at ``path``. Point all workers at the
+    same file (a path under ``/dev/shm`` keeps it in RAM) and they enforce
+    one limit between them, with no network round-trip::
+
+        limiter = RateLimiter(
+            requests=100, period=60,
+            backend=SharedMemoryBackend("/dev/shm/myapp-ratelimit"),
+        )
+
+    Limits follow the same GCRA as :class:`GCRABackend`, including ``burst=``.
+    The table holds ``slots`` keys (16 bytes each, 64k by default) and is
+    sized by whichever process creates the file. When a key's set is full,
+    the entry with the oldest arrival time is replaced: usually one whose
+    bucket has already refilled, so nothing is lost. Keys are stored as
+    64-bit fingerprints. Requires POSIX file locking (``fcntl``).
+    """
+
+    def __init__(self, path: str | os.PathLike, *, slots: int = 65_536):
+        if fcntl is None:
+            raise RuntimeError("SharedMemoryBackend requires fcntl (POSIX)")
+        if slots < _SET_SIZE:
+            raise ValueError(f"slots must be at least {_SET_SIZE}")
+        self.path = os.fspath(path)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            slots = self._initialize(slots - slots % _SET_SIZE)
+            self._mm = mmap.mmap(self._fd, _SHM_HEADER.size + slots * _SLOT.size)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._sets = slots // _SET_SIZE
+        self._locks = [threading.Lock() for _ in range(self._sets)]
+
+    def _initialize(self, slots: int) -> int:
+        """Create the table unless another process already has; return its size."""
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, _SHM_HEADER.size, 0)
+        try:
+            header = os.pread(self._fd, _SHM_HEADER.size, 0)
+            if not header:
+                os.ftruncate(self._fd, _SHM_HEADER.size + slots * _SLOT.size)
+                header = _SHM_HEADER.pack(_SHM_MAGIC, _SHM_VERSION, slots, 0)
+                os.pwrite(self._fd, header, 0)
+                return slots
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, _SHM_HEADER.size, 0)
+        magic, version, existing, _ = _SHM_HEADER.unpack(header)
+        if magic != _SHM_MAGIC or version != _SHM_VERSION:
+            raise ValueError(f"{self.path} is not a rate-limit table")
+        return existing
+
+    def hit(self, key, max_requests, period, burst=None):
+        """Record a hit for ``key``. Returns ``(allowed, remaining)``."""
+        granted, remaining = self.take(key, 1, max_requests, period, burst)
+        return granted == 1, remaining
+
+    async def ahit(self, key, max_requests, period, burst=None):
+        """:meth:`hit` on the event loop, or in a thread if it would block.
+
+        The set's locks are tried without waiting; while another thread or
+        worker process holds one, the hit goes through the thread pool.
+        """
+        try:
+            granted, remaining = self.take(
+                key, 1, max_requests, period, burst, blocking=False
+            )
+        except BlockingIOError:
+            granted, remaining = await run_in_threadpool(
+                self.take, key, 1, max_requests, period, burst
+            )
+        return granted == 1, remaining
+
+    def take(self, key, tokens, max_requests, period, burst=None, *, blocking=True):
+        """Spend up to ``tokens`` at once. Returns ``(granted, remaining)``.
+
+        With ``blocking=False``, raise :class:`BlockingIOError` rather than
+        wait for a lock held elsewhere.
+        """
+        fingerprint, index = self._locate(key)
+        with self._locked((index,), blocking):
+            now = time.time()
+            tat, granted, remaining = _gcra(
+                self._lookup(index, fingerprint, now),
+                now,
+                max_requests,
+                period,
+                burst,
+                tokens,
+            )
+            if granted:
+                self._store(index, fingerprint, tat)
+        return granted, remaining
+
+    def give(self, key, tokens, max_requests, period, age=0.0):
+        """Return ``tokens`` taken earlier, e.g. the unspent part of a lease."""
+        fingerprint, index = self._locate(key)
+        with self._locked((index,)):
+            now = time.time()
+            tat = self._lookup(index, fingerprint, now)
+            if tat > now:
+                self._store(
+                    index, fingerprint, max(now, tat - tokens * period / max_requests)
+                )
+
+    def hit_many(self, hits, *, blocking=True):
+        """Charge every window in ``hits`` or none of them; see :class:`Limit`."""
+        located = [self._locate(key) for key, *_ in hits]
+        with self._locked(sorted({index for _, index in located}), blocking):
+            now = time.time()
+            steps = [
+                _gcra(self._lookup(index, fingerprint, now), now, *hit[1:])
+                for (fingerprint, index), hit in zip(located, hits, strict=True)
+            ]
+            if all(granted for _, granted, _ in steps):
+                for (fingerprint, index), (tat, _, _) in zip(located, steps, strict=True):
+                    self._store(index, fingerprint, tat)
+        return _batch_results(steps)
+
+    async def ahit_many(self, hits):
+        """:meth:`hit_many` on the event loop, or in a thread if it would block."""
+        try:
+            return self.hit_many(hits, blocking=False)
+        except BlockingIOError:
+            return await run_in_threadpool(self.hit_many, hits)
+
+    def _locate(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        fingerprint = int.from_bytes(digest, "little") or 1  # 0 marks a free slot
+        return fingerprint, fingerprint % self._sets
+
+    @contextlib.contextmanager
+    def _locked(self, indices, blocking=True):
+        """Hold the given sets' locks, taken in ascending order.
+
+        Unless ``blocking``, raise :class:`BlockingIOError` if one is taken.
+        """
+        held = []
+        flags = fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB
+        try:
+            for index in indices:
+                if not self._locks[index].acquire(blocking):
+                    raise BlockingIOError(f"rate-limit set {index} is locked")
+                held.append(index)
+                offset = _SHM_HEADER.size + index * _SET.size
+                try:
+                    fcntl.lockf(self._fd, flags, _SET.size, offset)
+                except PermissionError as exc:  # EACCES: held by another process
+                    raise BlockingIOError(*exc.args) from exc
+            yield
+        finally:
+            for index in reversed(held):
+                offset = _SHM_HEADER.size + index * _SET.size
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, _SET.size, offset)
+                self._locks[index].release()
+
+    def _slot(self, index, fingerprint):
+        """The slot holding ``fingerprint``, or the one to replace, and its tat."""
+        entries = _SET.unpack_from(self._mm, _SHM_HEADER.size + index * _SET.size)
+        victim = 0
+        for i in range(_SET_SIZE):
+            if entries[2 * i] == fingerprint:
+                return i, entries[2 * i + 1]
+            if entries[2 * i + 1] < entries[2 * victim + 1]:
+                victim = i
+        return victim, None
+
+    def _lookup(self, index, fingerprint, now):
+        tat = self._slot(index, fingerprint)[1]
+        return now if tat is None else tat
+
+    def _store(self, index, fingerprint, tat):
+        slot = self._slot(index, fingerprint)[0]
+        offset = _SHM_HEADER.size + index * _SET.size + slot * _SLOT.size
+        _SLOT.pack_into(self._mm, offset, fingerprint, tat)
+
+    def close(self) -> None:
+        """Unmap the table. The file stays for the other workers."""
+        self._mm.close()
+        os.close(self._fd)
+
 
 # Atomic fixed-window increment: bump the counter and, on the first hit of a
 # window, attach the TTL — in a single server-side step. Doing INCR and EXPIRE
@@ -76,6 +439,77 @@ end
 return count
 """
 
+# Grant up to ARGV[3] tokens from the current fixed window at once, and return
+# how many were granted and how many are left.
+_TAKE_LUA = """
+local limit = tonumber(ARGV[2])
+local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+local granted = math.min(tonumber(ARGV[3]), limit - used)
+if granted <= 0 then
+    return {0, 0}
+end
+local count = redis.call('INCRBY', KEYS[1], granted)
+if count == granted then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return {granted, limit - count}
+"""
+
+# Give back ARGV[1] tokens taken ARGV[3] ms ago, unless the window they came
+# from has expired since (ARGV[2] is the window length in ms): a newer window
+# never counted them.
+_GIVE_LUA = """
+local ttl = redis.call('PTTL', KEYS[1])
+if ttl > 0 and tonumber(ARGV[2]) - ttl >= tonumber(ARGV[3]) then
+    local used = tonumber(redis.call('GET', KEYS[1]) or '0')
+    redis.call('DECRBY', KEYS[1], math.min(tonumber(ARGV[1]), used))
+end
+return 0
+"""
+
+# Charge every fixed window in KEYS (ARGV holds period, limit pairs) or none of
+# them. Returns what each window has left, or -1 for the windows that are full.
+_HIT_MANY_LUA = """
+local used = {}
+local admitted = true
+for i, key in ipairs(KEYS) do
+    used[i] = tonumber(redis.call('GET', key) or '0')
+    if used[i] >= tonumber(ARGV[2 * i]) then
+        admitted = false
+    end
+end
+local left = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i])
+    if admitted then
+        local count = redis.call('INCR', key)
+        if count == 1 then
+            redis.call('EXPIRE', key, ARGV[2 * i - 1])
+        end
+        left[i] = limit - count
+    elseif used[i] >= limit then
+        left[i] = -1
+    else
+        left[i] = limit - used[i]
+    end
+end
+return left
+"""
+
+
+def _hit_many_args(prefix, hits):
+    keys = [prefix + key for key, *_ in hits]
+    args = [value for _, limit, period, _ in hits for value in (math.ceil(period), limit)]
+    return (_HIT_MANY_LUA, len(keys), *keys, *args)
+
+
+def _give_args(key, tokens, period, age):
+    return (_GIVE_LUA, 1, key, tokens, int(period * 1000), int(age * 1000))
+
+
+def _hit_many_results(left):
+    return [(int(n) >= 0, max(0, int(n))) for n in left]
+
 
 class RedisBackend:
     """Fixed-window backend backed by Redis, shared across processes.
@@ -112,6 +546,25 @@ class RedisBackend:
             return False, 0
         return True, max_requests - count
 
+    def take(self, key, tokens, max_requests, period):
+        """Spend up to ``tokens`` at once. Returns ``(granted, remaining)``."""
+        granted, remaining = self.client.eval(
+            _TAKE_LUA, 1, self.prefix + key, period, max_requests, tokens
+        )
+        return int(granted), int(remaining)
+
+    def give(self, key, tokens, max_requests, period, age=0.0):
+        """Return ``tokens`` taken ``age`` seconds ago, if their window is current."""
+        self.client.eval(*_give_args(self.prefix + key, tokens, period, age))
+
+    def hit_many(self, hits):
+        """Charge every window in ``hits`` or none of them, in one ``EVAL``.
+
+        The keys must live on one node; under Redis Cluster, give them a
+        shared hash tag through ``prefix``.
+        """
+        return _hit_many_results(self.client.eval(*_hit_many_args(self.prefix, hits)))
+
 
 class AsyncRedisBackend:
     """Async-native fixed-window Redis backend (uses ``redis.asyncio``)."""
@@ -135,6 +588,200 @@ class AsyncRedisBackend:
             return False, 0
         return True, max_requests - count
 
+    async def atake(self, key, tokens, max_requests, period):
+        """Spend up to ``tokens`` at once. Returns ``(granted, remaining)``."""
+        granted, remaining = await self.client.eval(
+            _TAKE_LUA, 1, self.prefix + key, period, max_requests, tokens
+        )
+        return int(granted), int(remaining)
+
+    async def agive(self, key, tokens, max_requests, period, age=0.0):
+        """Return ``tokens`` taken ``age`` seconds ago, if their window is current."""
+        await self.client.eval(*_give_args(self.prefix + key, tokens, period, age))
+
+    async def ahit_many(self, hits):
+        """Charge every window in ``hits`` or none of them, in one ``EVAL``."""
+        left = await self.client.eval(*_hit_many_args(self.prefix, hits))
+        return _hit_many_results(left)
+
+
+def _check_burst_support(backend):
+    hit = getattr(backend, "ahit", None) or backend.hit
+    if "burst" not in inspect.signature(hit).parameters:
+        raise ValueError(
+            f"{type(backend).__name__} does not support burst=; use GCRABackend"
+        )
+
+
+class _Lease:
+    __slots__ = ("tokens", "remaining", "expires", "exhausted", "taken")
+
+    def __init__(self, tokens, remaining, expires, exhausted, taken):
+        self.tokens = tokens
+        self.remaining = remaining
+        self.expires = expires
+        self.exhausted = exhausted
+        self.taken = taken
+
+
+class LeasingBackend:
+    """Spends tokens leased in batches from a shared backend.
+
+    Instead of one round-trip per request, each worker takes a batch of
+    tokens (``lease`` of the limit, 5% by default) from ``backend`` and admits
+    requests from it in local memory, going back only when the batch is spent
+    or older than ``max_age`` seconds. A client refused by the shared store is
+    refused locally until ``max_age`` passes, too::
+
+        limiter = RateLimiter(
+            requests=1000, period=60,
+            backend=LeasingBackend(AsyncRedisBackend(url=...), lease=0.05),
+        )
+
+    The limit is never exceeded, but tokens leased by a worker are unavailable
+    to the others until spent or expired, so a client spread over ``N``
+    workers may be refused up to ``N`` leases early. Tokens a lease still
+    holds when it expires are given back to ``backend`` before the next
+    lease is taken, so a client slower than one request per ``max_age`` is
+    charged only for what it spent. Smaller leases and a shorter ``max_age``
+    are more accurate, larger ones save round-trips; ``leases`` counts the
+    leases taken.
+
+    ``backend`` needs ``atake`` or ``take(key, tokens, max_requests, period)
+    -> (granted, remaining)``, and should have ``agive`` or ``give(key,
+    tokens, max_requests, period, age)`` to take back unspent tokens, as
+    :class:`RedisBackend`, :class:`AsyncRedisBackend`, :class:`GCRABackend`
+    and :class:`SharedMemoryBackend` provide. Without it, unspent tokens
+    stay charged until the shared window or bucket refills.
+    """
+
+    def __init__(self, backend, *, lease=0.05, max_age=1.0, max_keys=100_000):
+        if not hasattr(backend, "atake") and not hasattr(backend, "take"):
+            raise TypeError(f"{type(backend).__name__} does not support take()")
+        if not 0 < lease <= 1:
+            raise ValueError("lease must be a fraction of the limit in (0, 1]")
+        self.backend = backend
+        self.lease = lease
+        self.max_age = max_age
+        self.leases = 0
+        self._max_keys = max_keys
+        self._local: OrderedDict[str, _Lease] = OrderedDict()
+        self._lock = threading.Lock()
+        # Keys with a lease request on the way, so concurrent requests for the
+        # same client wait for it instead of leasing again.
+        self._pending: dict[str, asyncio.Future] = {}
+
+    def _spend(self, key, now):
+        """Admit or refuse from the local lease, or ``None`` to go fetch one."""
+        with self._lock:
+            lease = self._local.get(key)
+            if lease is None or now >= lease.expires:
+                return None
+            self._local.move_to_end(key)
+            if lease.tokens:
+                lease.tokens -= 1
+                return True, lease.remaining + lease.tokens
+            if lease.exhausted:
+                return False, 0
+            return None
+
+    def _release(self, key, now):
+        """Drop an expired lease; return ``(tokens, age)`` it left unspent."""
+        with self._lock:
+            lease = self._local.get(key)
+            if lease is None or now < lease.expires or not lease.tokens:
+                return None
+            del self._local[key]
+            return lease.tokens, time.monotonic() - lease.taken
+
+    def _store(self, key, now, period, granted, remaining):
+        """Keep a fresh lease, spending its first token on this request."""
+        with self._lock:
+            lease = self._local.get(key)
+            spare = 0 if lease is None or now >= lease.expires else lease.tokens
+            tokens = spare + granted
+            lease = self._local[key] = _Lease(
+                max(0, tokens - 1),
+                remaining,
+                now + min(self.max_age, period),
+                not tokens,
+                time.monotonic(),
+            )
+            self._local.move_to_end(key)
+            if self._max_keys is not None and len(self._local) > self._max_keys:
+                self._local.popitem(last=False)
+        if not tokens:
+            return False, 0
+        return True, remaining + lease.tokens
+
+    def _size(self, max_requests):
+        return max(1, int(max_requests * self.lease))
+
+    def hit(self, key, max_requests, period):
+        """Record a hit for ``key``. Returns ``(allowed, remaining)``.
+
+        Requires a backend with a sync ``take``.
+        """
+        now = time.monotonic()
+        result = self._spend(key, now)
+        if result is not None:
+            return result
+        unspent = self._release(key, now)
+        if unspent is not None and hasattr(self.backend, "give"):
+            try:
+                self.backend.give(key, unspent[0], max_requests, period, unspent[1])
+            except Exception:
+                logger.warning("Could not return unspent tokens", exc_info=True)
+        self.leases += 1
+        granted, remaining = self.backend.take(
+            key, self._size(max_requests), max_requests, period
+        )
+        return self._store(key, now, period, granted, remaining)
+
+    async def ahit(self, key, max_requests, period):
+        while True:
+            now = time.monotonic()
+            result = self._spend(key, now)
+            if result is not None:
+                return result
+            pending = self._pending.get(key)
+            if pending is None:
+                break
+            await pending
+
+        pending = self._pending[key] = asyncio.get_running_loop().create_future()
+        try:
+            unspent = self._release(key, now)
+            if unspent is not None:
+                tokens, age = unspent
+                await self._agive(key, tokens, max_requests, period, age)
+            self.leases += 1
+            size = self._size(max_requests)
+            if hasattr(self.backend, "atake"):
+                granted, remaining = await self.backend.atake(
+                    key, size, max_requests, period
+                )
+            else:
+                granted, remaining = await run_in_threadpool(
+                    self.backend.take, key, size, max_requests, period
+                )
+            return self._store(key, now, period, granted, remaining)
+        finally:
+            del self._pending[key]
+            pending.set_result(None)
+
+    async def _agive(self, key, tokens, max_requests, period, age):
+        backend = self.backend
+        try:
+            if hasattr(backend, "agive"):
+                await backend.agive(key, tokens, max_requests, period, age)
+            elif hasattr(backend, "give"):
+                await run_in_threadpool(
+                    backend.give, key, tokens, max_requests, period, age
+                )
+        except Exception:
+            logger.warning("Could not return unspent tokens", exc_info=True)
+
 
 class RateLimiter:
     """Token bucket rate limiter.
@@ -166,7 +813,14 @@ class RateLimiter:
 
     """
 
-    def __init__(self, requests=100, period=60, backend=None, trust_proxy_headers=False):
+    def __init__(
+        self,
+        requests=100,
+        period=60,
+        backend=None,
+        trust_proxy_headers=False,
+        burst=None,
+    ):
         """Create a rate limiter.
 
         :param requests: Maximum requests allowed per ``period``.
@@ -174,7 +828,8 @@ class RateLimiter:
         :param backend: Storage backend (defaults to :class:`MemoryBackend`).
                         Any object with a
                         ``hit(key, max_requests, period) -> (allowed, remaining)``
-                        method works, e.g. :class:`RedisBackend`.
+                        method works, e.g. :class:`GCRABackend` or
+                        :class:`RedisBackend`.
         :param trust_proxy_headers: If ``True``, key by ``X-Forwarded-For``/
                         ``X-Real-IP`` instead of the TCP peer. Set this only
                         when Responder sits behind a reverse proxy that sets
@@ -183,11 +838,19 @@ class RateLimiter:
                         one rate-limit bucket; with it unset and no proxy in
                         front, a client could otherwise spoof the header to
                         dodge the limit.
+        :param burst: How many requests may arrive back to back, on top of
+                        the sustained ``requests / period`` rate. Requires a
+                        backend whose ``hit`` accepts ``burst=``, such as
+                        :class:`GCRABackend`.
         """
         self.max_requests = requests
         self.period = period
         self.backend = MemoryBackend() if backend is None else backend
         self.trust_proxy_headers = trust_proxy_headers
+        self._options = {}
+        if burst is not None:
+            _check_burst_support(self.backend)
+            self._options["burst"] = burst
 
     def _client_key(self, req):
         ip = resolve_client_ip(
@@ -212,7 +875,7 @@ class RateLimiter:
         backends.
         """
         allowed, remaining = self.backend.hit(
-            self._client_key(req), self.max_requests, self.period
+            self._client_key(req), self.max_requests, self.period, **self._options
         )
         return self._apply(allowed, remaining, resp)
 
@@ -222,11 +885,21 @@ class RateLimiter:
         key = self._client_key(req)
         if hasattr(self.backend, "ahit"):
             allowed, remaining = await self.backend.ahit(
-                key, self.max_requests, self.period
+                key, self.max_requests, self.period, **self._options
+            )
+        elif is_inline(self.backend.hit):
+            allowed, remaining = self.backend.hit(
+                key, self.max_requests, self.period, **self._options
             )
         else:
             allowed, remaining = await run_in_threadpool(
-                self.backend.hit, key, self.max_requests, self.period
+                functools.partial(
+                    self.backend.hit,
+                    key,
+                    self.max_requests,
+                    self.period,
+                    **self._options,
+                )
             )
         return self._apply(allowed, remaining, resp)
 
@@ -258,3 +931,156 @@ class RateLimiter:
         @api.route(before_request=True)
         async def _rate_limit(req, resp):
             await self.acheck(req, resp)
+
+
+_UNITS = {"s": 1, "sec": 1, "second": 1, "m": 60, "min": 60, "minute": 60}
+_UNITS.update({"h": 3600, "hr": 3600, "hour": 3600, "d": 86400, "day": 86400})
+_RATE_RE = re.compile(r"\s*(\d+)\s*/\s*(\d*)\s*([a-z]+)\s*")
+_KEYS = ("ip", "user", "api_key", "route")
+
+
+def _parse_rate(rate):
+    """``"10/s"``, ``"1000/hour"`` or ``"5/10m"`` to ``(requests, seconds)``."""
+    match = _RATE_RE.fullmatch(rate.lower())
+    unit = match and match[3]
+    if unit not in _UNITS and unit and unit.endswith("s"):
+        unit = unit[:-1]
+    if not match or unit not in _UNITS or int(match[1]) < 1:
+        raise ValueError(
+            f"Invalid rate {rate!r}: expected e.g. '10/s', '1000/hour' or '5/10m'"
+        )
+    return int(match[1]), int(match[2] or 1) * _UNITS[unit]
+
+
+@dataclass(frozen=True)
+class Limit:
+    """One rate-limit window for a route: ``@api.route(..., rate_limit=[...])``.
+
+    :param rate: ``"<requests>/<period>"``, e.g. ``"10/s"``, ``"1000/h"`` or
+                 ``"5/10m"`` (units ``s``, ``m``, ``h``, ``d``, or spelled out).
+    :param key: Who shares the budget: ``"ip"`` (the client address),
+                ``"user"`` (the principal the route's ``auth=`` produced,
+                falling back to the address for anonymous requests),
+                ``"api_key"`` (the key presented to an :class:`APIKeyAuth`,
+                else the ``X-API-Key`` header), ``"route"`` (one budget for
+                everyone), or a callable taking the request and returning a
+                string.
+    :param burst: Requests allowed back to back on top of the sustained rate
+                  (needs a backend that supports it, such as the default).
+    :param name: Share this budget with other routes using the same name,
+                 instead of keeping one per route.
+    """
+
+    rate: str
+    key: str | Callable = "ip"
+    burst: int | None = None
+    name: str | None = None
+    requests: int = field(init=False, repr=False)
+    period: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        requests, period = _parse_rate(self.rate)
+        object.__setattr__(self, "requests", requests)
+        object.__setattr__(self, "period", period)
+        if not callable(self.key) and self.key not in _KEYS:
+            raise ValueError(f"Limit key must be one of {_KEYS} or a callable")
+
+
+def _principal_id(principal):
+    if isinstance(principal, str):
+        return principal
+    for attr in ("sub", "id", "user_id", "username", "name"):
+        value = getattr(principal, attr, None)
+        if value is None and isinstance(principal, dict):
+            value = principal.get(attr)
+        if value is not None:
+            return str(value)
+    return str(principal)
+
+
+class RouteLimiter:
+    """Enforces a route's :class:`Limit` list with one backend call per request.
+
+    Built by ``api.route(rate_limit=...)``, which runs it right after the
+    route's authentication. Backends with ``hit_many``/``ahit_many``
+    (every built-in one except :class:`LeasingBackend`) check and charge all
+    windows in a single operation, and a request refused by one window is
+    not charged to the others. Other backends get one call per window.
+    """
+
+    def __init__(self, limits, *, backend, route, trust_proxy_headers=False, auth=()):
+        self.limits = tuple(Limit(x) if isinstance(x, str) else x for x in limits)
+        self.backend = backend
+        self.trust_proxy_headers = trust_proxy_headers
+        if any(limit.burst is not None for limit in self.limits):
+            _check_burst_support(backend)
+        self._prefixes = [
+            f"{limit.name or route}|{limit.requests}/{limit.period}|"
+            for limit in self.limits
+        ]
+        self._api_key_auth = next((a for a in auth if isinstance(a, APIKeyAuth)), None)
+
+    def _who(self, limit, req):
+        if callable(limit.key):
+            return f"fn:{limit.key(req)}"
+        if limit.key == "route":
+            return "*"
+        if limit.key == "user":
+            principal = getattr(req.state, "user", None)
+            if principal is not None:
+                return f"user:{_principal_id(principal)}"
+        elif limit.key == "api_key":
+            if self._api_key_auth is not None:
+                credential = self._api_key_auth._extract(req)
+            else:
+                credential = req.headers.get("x-api-key")
+            if credential:
+                # Don't keep raw secrets in the store.
+                digest = hashlib.blake2b(credential.encode(), digest_size=16)
+                return f"key:{digest.hexdigest()}"
+        ip = resolve_client_ip(
+            req.client, req.headers.get, trust_proxy_headers=self.trust_proxy_headers
+        )
+        return f"ip:{ip or 'unknown'}"
+
+    async def _hit_many(self, hits):
+        backend = self.backend
+        if hasattr(backend, "ahit_many"):
+            return await backend.ahit_many(hits)
+        if hasattr(backend, "hit_many"):
+            if is_inline(backend.hit_many):
+                return backend.hit_many(hits)
+            return await run_in_threadpool(backend.hit_many, hits)
+        results = []
+        for key, max_requests, period, burst in hits:
+            options = {} if burst is None else {"burst": burst}
+            if hasattr(backend, "ahit"):
+                result = await backend.ahit(key, max_requests, period, **options)
+            else:
+                result = await run_in_threadpool(
+                    backend.hit, key, max_requests, period, **options
+                )
+            results.append(result)
+        return results
+
+    async def acheck(self, req, resp):
+        """Charge ``req`` to every window. Sets a ``429`` and returns ``False``
+        when one of them is exhausted."""
+        hits = [
+            (prefix + self._who(limit, req), limit.requests, limit.period, limit.burst)
+            for prefix, limit in zip(self._prefixes, self.limits, strict=True)
+        ]
+        results = await self._hit_many(hits)
+        for limit, (allowed, _) in zip(self.limits, results, strict=True):
+            if not allowed:
+                resp.status_code = 429
+                resp.media = {"error": "rate limit exceeded"}
+                resp.headers["Retry-After"] = str(limit.period)
+                return False
+        # Advertise the window closest to running out.
+        limit, (_, remaining) = min(
+            zip(self.limits, results, strict=True), key=lambda pair: pair[1][1]
+        )
+        resp.headers["X-RateLimit-Limit"] = str(limit.requests)
+        resp.headers["X-RateLimit-Remaining"] = str(remaining)
+        return True
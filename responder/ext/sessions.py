@@ -14,23 +14,38 @@ and the data on the server::
         req.session["user"] = "kenneth"
 
 For multi-process deployments, use :class:`RedisSessionBackend`.
+
+Both middlewares put a :class:`LazySession` in the scope: a cookie payload is
+only verified and decoded when the app first uses the session, and changes are
+tracked by copy-on-write rather than a deep copy of every session.
 """
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import contextlib
 import copy
+import functools
 import json
 import logging
 import os
+import queue
 import secrets
+import sqlite3
 import threading
 import time
+from base64 import b64decode, b64encode
 from collections import OrderedDict
 from http.cookies import SimpleCookie
-from typing import Protocol, runtime_checkable
+from typing import Any, Callable, Protocol, runtime_checkable
 
+import itsdangerous
+from itsdangerous.exc import BadSignature
 from starlette.concurrency import run_in_threadpool
 from starlette.datastructures import MutableHeaders
+from starlette.middleware.sessions import Session
+from starlette.requests import HTTPConnection
 
 from ..statics import DEFAULT_SECRET_KEY
 
@@ -120,6 +135,159 @@ def resolve_secret_key(secret_key, *, sessions, debug):
     return key
 
 
+# Values that cannot be mutated in place, so are never copied on read.
+_IMMUTABLE = (str, int, float, bool, bytes, type(None))
+
+
+class LazySession(Session):
+    """A session dict that is loaded on first use and copied on write.
+
+    ``loader`` runs the first time the session is used and returns the stored
+    record, or ``None``. The record itself is never modified: the session
+    starts as a shallow copy of it, and a mutable value (a list, a nested
+    dict) is copied the first time it is read. :attr:`dirty` then compares
+    only the values that were handed out, instead of deep-copying the session
+    up front and deep-comparing it at the end. A request that never touches
+    its session pays for neither.
+    """
+
+    def __init__(self, loader: Callable[[], dict | None] | None = None):
+        super().__init__()
+        self._loader = loader
+        self._record: dict | None = None
+        self._copied: set = set()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loader is None
+
+    @property
+    def stored(self) -> bool:
+        """Whether a stored record was found when the session was loaded."""
+        return self.load()._record is not None
+
+    @property
+    def dirty(self) -> bool:
+        """Whether the session now differs from the stored record."""
+        if self.modified:
+            return True
+        record = self._record or {}
+        for key in self._copied:
+            try:
+                if dict.get(self, key) != record.get(key):
+                    return True
+            except Exception:
+                return True  # uncomparable -> assume dirty, write
+        return False
+
+    def load(self) -> LazySession:
+        loader, self._loader = self._loader, None
+        if loader is not None:
+            self._record = loader()
+            if self._record:
+                dict.update(self, self._record)
+        return self
+
+    def _own(self, key: Any, value: Any) -> Any:
+        if key not in self._copied and not isinstance(value, _IMMUTABLE):
+            value = copy.deepcopy(value)
+            dict.__setitem__(self, key, value)
+            self._copied.add(key)
+        return value
+
+    def _own_all(self) -> None:
+        self.load()
+        for key, value in dict.items(self):
+            self._own(key, value)
+
+    # --- reads: load first; hand out private copies of mutable values ------
+    def mark_accessed(self) -> None:
+        self.load()
+        super().mark_accessed()
+
+    def __getitem__(self, key):
+        self.load()
+        return self._own(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        self.load()
+        if dict.__contains__(self, key):
+            return self._own(key, dict.__getitem__(self, key))
+        return default
+
+    def __contains__(self, key):
+        return dict.__contains__(self.load(), key)
+
+    def __iter__(self):
+        return dict.__iter__(self.load())
+
+    def __len__(self):
+        return dict.__len__(self.load())
+
+    def __eq__(self, other):
+        return dict.__eq__(self.load(), other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        return dict.__repr__(self.load())
+
+    def keys(self):
+        return dict.keys(self.load())
+
+    def values(self):
+        self._own_all()
+        return dict.values(self)
+
+    def items(self):
+        self._own_all()
+        return dict.items(self)
+
+    def copy(self):
+        self._own_all()
+        return dict.copy(self)
+
+    def __or__(self, other):
+        self._own_all()
+        return dict.__or__(self, other)
+
+    # --- writes: load first, so they apply on top of the stored record ------
+    def __setitem__(self, key, value):
+        self.load()
+        self._copied.add(key)  # the caller's own object: never copy it
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.load()
+        super().__delitem__(key)
+
+    def clear(self):
+        self.load()
+        super().clear()
+
+    def pop(self, key, *args):
+        self.load()
+        return super().pop(key, *args)
+
+    def popitem(self):
+        self.load()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        self.load()
+        if dict.__contains__(self, key):
+            return self[key]
+        return super().setdefault(key, default)
+
+    def update(self, *args, **kwargs):
+        self.load()
+        super().update(*args, **kwargs)
+
+    def __ior__(self, other):
+        self.load()
+        return super().__ior__(other)
+
+
 class MemorySessionBackend:
     """In-process session store. Sessions vanish on restart.
 
@@ -189,6 +357,22 @@ class MemorySessionBackend:
         with self._lock:
             self._store.pop(session_id, None)
 
+    def write_batch(self, sets, touches, deletes):
+        """Apply many writes under one lock (see :class:`WriteBehindSessionBackend`)."""
+        now = time.time()
+        with self._lock:
+            for session_id, data, max_age in sets:
+                self._store[session_id] = (data, now + max_age)
+                self._store.move_to_end(session_id)
+            for session_id, max_age in touches:
+                record = self._store.get(session_id)
+                if record is not None:
+                    self._store[session_id] = (record[0], now + max_age)
+                    self._store.move_to_end(session_id)
+            for session_id in deletes:
+                self._store.pop(session_id, None)
+            self._evict(now)
+
 
 class RedisSessionBackend:
     """Redis-backed session store, shared across processes.
@@ -224,6 +408,17 @@ class RedisSessionBackend:
     def delete(self, session_id):
         self.client.delete(self.prefix + session_id)
 
+    def write_batch(self, sets, touches, deletes):
+        """Apply many writes in one pipelined round-trip."""
+        pipe = self.client.pipeline(transaction=False)
+        for session_id, data, max_age in sets:
+            pipe.setex(self.prefix + session_id, max_age, json.dumps(data))
+        for session_id, max_age in touches:
+            pipe.expire(self.prefix + session_id, max_age)
+        if deletes:
+            pipe.delete(*(self.prefix + session_id for session_id in deletes))
+        pipe.execute()
+
 
 class AsyncRedisSessionBackend:
     """Async-native Redis session store (uses ``redis.asyncio``).
@@ -257,6 +452,423 @@ class AsyncRedisSessionBackend:
     async def adelete(self, session_id):
         await self.client.delete(self.prefix + session_id)
 
+    async def awrite_batch(self, sets, touches, deletes):
+        """Apply many writes in one pipelined round-trip."""
+        async with self.client.pipeline(transaction=False) as pipe:
+            for session_id, data, max_age in sets:
+                pipe.setex(self.prefix + session_id, max_age, json.dumps(data))
+            for session_id, max_age in touches:
+                pipe.expire(self.prefix + session_id, max_age)
+            if deletes:
+                pipe.delete(*(self.prefix + session_id for session_id in deletes))
+            await pipe.execute()
+
+
+_STOP = object()
+
+
+class SQLiteSessionBackend:
+    """Session store in a local SQLite file, shared by the workers of one host.
+
+    Persists across restarts without running a server. The database runs in
+    WAL mode, so readers never wait on the writer, and a ``busy_timeout``
+    lets worker processes queue for the write lock. Each session row carries
+    an indexed expiry time: reads ignore expired rows, and a timer deletes
+    them every ``sweep_interval`` seconds, ``sweep_batch`` rows per
+    transaction, rather than on writes.
+
+    All statements run on one dedicated thread per process that owns the
+    connection (and its cache of prepared statements). The async methods
+    await that thread directly, and the sync ones block on it. Both
+    :class:`SessionBackend` and :class:`AsyncSessionBackend` are implemented.
+    """
+
+    _GET = "SELECT data FROM responder_sessions WHERE id = ? AND expires > ?"
+    _SET = (
+        "INSERT OR REPLACE INTO responder_sessions (id, data, expires) "
+        "VALUES (?, ?, ?)"
+    )
+    _TOUCH = "UPDATE responder_sessions SET expires = ? WHERE id = ?"
+    _DELETE = "DELETE FROM responder_sessions WHERE id = ?"
+    _SWEEP = (
+        "DELETE FROM responder_sessions WHERE id IN (SELECT id FROM "
+        "responder_sessions WHERE expires <= ? LIMIT ?)"
+    )
+
+    def __init__(self, path, *, sweep_interval=60.0, sweep_batch=1000, timeout=5.0):
+        if sweep_interval <= 0 or sweep_batch < 1:
+            raise ValueError("sweep_interval and sweep_batch must be positive")
+        self.path = os.fspath(path)
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        self.timeout = timeout
+        self._jobs: queue.SimpleQueue = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._call(lambda conn: None)  # create the schema, surface errors now
+
+    # --- the database thread --------------------------------------------
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,  # autocommit; batches open their own transaction
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responder_sessions ("
+            "id TEXT PRIMARY KEY, data TEXT NOT NULL, expires REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS responder_sessions_expires "
+            "ON responder_sessions (expires)"
+        )
+        return conn
+
+    def _serve(self, jobs: queue.SimpleQueue) -> None:
+        conn = None
+        next_sweep = time.monotonic() + self.sweep_interval
+        while True:
+            try:
+                job = jobs.get(timeout=max(0.0, next_sweep - time.monotonic()))
+            except queue.Empty:
+                job = None
+            if job is _STOP:
+                break
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception as exc:
+                    self._pid = None  # the next call starts over
+                    if job is not None:
+                        job[2].set_exception(exc)
+                    break
+            if job is not None:
+                fn, args, future = job
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(fn(conn, *args))
+                    except BaseException as exc:
+                        future.set_exception(exc)
+            # Checked after every job, so a busy queue can't put sweeps off.
+            if time.monotonic() >= next_sweep:
+                try:
+                    swept = self._sweep(conn)
+                except sqlite3.Error:
+                    logger.warning("Session sweep failed", exc_info=True)
+                    swept = 0
+                # A full batch means more may be due: continue right after
+                # the next request instead of a whole interval later.
+                delay = 0 if swept >= self.sweep_batch else self.sweep_interval
+                next_sweep = time.monotonic() + delay
+        if conn is not None:
+            conn.close()
+        # Fail anything queued behind the stop (or a failed connect).
+        while True:
+            try:
+                job = jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is not _STOP and job[2].set_running_or_notify_cancel():
+                job[2].set_exception(RuntimeError("SQLiteSessionBackend is closed"))
+
+    def _submit(self, fn: Callable, *args: Any) -> concurrent.futures.Future:
+        if self._pid != os.getpid():  # first use, or first use after a fork
+            with self._start_lock:
+                if self._pid != os.getpid():
+                    self._jobs = queue.SimpleQueue()
+                    self._thread = threading.Thread(
+                        target=self._serve,
+                        args=(self._jobs,),
+                        name="responder-sessions-sqlite",
+                        daemon=True,
+                    )
+                    self._thread.start()
+                    self._pid = os.getpid()
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._jobs.put((fn, args, future))
+        return future
+
+    def _call(self, fn: Callable, *args: Any) -> Any:
+        return self._submit(fn, *args).result()
+
+    async def _acall(self, fn: Callable, *args: Any) -> Any:
+        return await asyncio.wrap_future(self._submit(fn, *args))
+
+    def _get(self, conn, session_id):
+        row = conn.execute(self._GET, (session_id, time.time())).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def _set(self, conn, session_id, data, max_age):
+        conn.execute(self._SET, (session_id, json.dumps(data), time.time() + max_age))
+
+    def _touch(self, conn, session_id, max_age):
+        conn.execute(self._TOUCH, (time.time() + max_age, session_id))
+
+    def _delete(self, conn, session_id):
+        conn.execute(self._DELETE, (session_id,))
+
+    def _write_batch(self, conn, sets, touches, deletes):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                self._SET,
+                [(sid, json.dumps(data), now + age) for sid, data, age in sets],
+            )
+            conn.executemany(self._TOUCH, [(now + age, sid) for sid, age in touches])
+            conn.executemany(self._DELETE, [(sid,) for sid in deletes])
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _sweep(self, conn):
+        return conn.execute(self._SWEEP, (time.time(), self.sweep_batch)).rowcount
+
+    # --- SessionBackend ---------------------------------------------------
+    def get(self, session_id):
+        return self._call(self._get, session_id)
+
+    def set(self, session_id, data, max_age):
+        self._call(self._set, session_id, data, max_age)
+
+    def touch(self, session_id, max_age):
+        self._call(self._touch, session_id, max_age)
+
+    def delete(self, session_id):
+        self._call(self._delete, session_id)
+
+    def write_batch(self, sets, touches, deletes):
+        """Apply many writes in one transaction."""
+        self._call(self._write_batch, sets, touches, deletes)
+
+    # --- AsyncSessionBackend ----------------------------------------------
+    async def aget(self, session_id):
+        return await self._acall(self._get, session_id)
+
+    async def aset(self, session_id, data, max_age):
+        await self._acall(self._set, session_id, data, max_age)
+
+    async def atouch(self, session_id, max_age):
+        await self._acall(self._touch, session_id, max_age)
+
+    async def adelete(self, session_id):
+        await self._acall(self._delete, session_id)
+
+    async def awrite_batch(self, sets, touches, deletes):
+        await self._acall(self._write_batch, sets, touches, deletes)
+
+    def sweep(self) -> int:
+        """Delete up to ``sweep_batch`` expired sessions now; return how many."""
+        return self._call(self._sweep)
+
+    def close(self) -> None:
+        """Stop the database thread and close its connection."""
+        thread = self._thread
+        if thread is not None and self._pid == os.getpid():
+            self._jobs.put(_STOP)
+            thread.join()
+        self._thread = None
+        self._pid = None
+
+
+class WriteBehindSessionBackend:
+    """Buffers session writes and flushes them to ``backend`` in batches.
+
+    Wrap any session backend to take its round-trips off the response path::
+
+        api = responder.API(
+            session_backend=WriteBehindSessionBackend(AsyncRedisSessionBackend(...))
+        )
+
+    Writes and deletes are queued and return at once. A background task
+    flushes them every ``flush_interval`` seconds, or as soon as
+    ``max_batch`` are waiting, in one pipelined call when the backend has
+    ``write_batch``/``awrite_batch`` (all built-in backends do). TTL slides
+    of unchanged sessions are collapsed to at most one per session per
+    ``touch_interval`` seconds, so a session may expire on the server up to
+    that much before its cookie does. Reads see queued writes first.
+
+    The task runs between application startup and shutdown, and the queue
+    is drained at shutdown. Outside that window (e.g. a test client used
+    without ``with``), writes go straight through. Other workers see a write
+    once it is flushed, so a logout takes up to ``flush_interval`` to reach
+    them. A failed flush is logged and retried with the next batch.
+    """
+
+    def __init__(
+        self, backend, *, touch_interval=60.0, flush_interval=0.05, max_batch=256
+    ):
+        if touch_interval < 0 or flush_interval <= 0 or max_batch < 1:
+            raise ValueError(
+                "flush_interval and max_batch must be positive, touch_interval >= 0"
+            )
+        self.backend = backend
+        self.touch_interval = touch_interval
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.batches = 0
+        # session_id -> (data, max_age); data None marks a delete.
+        self._writes: dict[str, tuple[dict | None, int]] = {}
+        self._flushing: dict[str, tuple[dict | None, int]] = {}
+        self._touches: dict[str, int] = {}
+        # session_id -> monotonic time of its last TTL refresh, oldest first.
+        self._refreshed: OrderedDict[str, float] = OrderedDict()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        """Writes and touches waiting to be flushed."""
+        return len(self._writes) + len(self._touches)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()  # bound to this loop on first wait
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush task and drain everything still queued."""
+        task, self._task = self._task, None
+        if task is not None:
+            self._wakeup.set()  # let a flush in progress finish, then exit
+            await task
+        while self._writes or self._touches:
+            if not await self.flush():
+                break  # the backend is down; don't spin at shutdown
+
+    async def _run(self) -> None:
+        while self._task is not None:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    def _refresh(self, session_id: str, now: float) -> None:
+        self._refreshed[session_id] = now
+        self._refreshed.move_to_end(session_id)
+        horizon = now - self.touch_interval
+        while self._refreshed:
+            oldest = next(iter(self._refreshed))
+            if self._refreshed[oldest] > horizon:
+                break
+            del self._refreshed[oldest]
+
+    def _queued(self) -> None:
+        if self._task is not None and self.pending >= self.max_batch:
+            self._wakeup.set()
+
+    async def aget(self, session_id):
+        for buffer in (self._writes, self._flushing):
+            if session_id in buffer:
+                return buffer[session_id][0]
+        if hasattr(self.backend, "aget"):
+            return await self.backend.aget(session_id)
+        return await run_in_threadpool(self.backend.get, session_id)
+
+    async def aset(self, session_id, data, max_age):
+        if self._task is None:
+            await self._write([(session_id, data, max_age)], [], [])
+            return
+        self._writes[session_id] = (data, max_age)
+        self._touches.pop(session_id, None)
+        self._refresh(session_id, time.monotonic())
+        self._queued()
+
+    async def adelete(self, session_id):
+        if self._task is None:
+            await self._write([], [], [session_id])
+            return
+        self._writes[session_id] = (None, 0)
+        self._touches.pop(session_id, None)
+        self._refreshed.pop(session_id, None)
+        self._queued()
+
+    async def atouch(self, session_id, max_age):
+        now = time.monotonic()
+        refreshed = self._refreshed.get(session_id)
+        if refreshed is not None and now - refreshed < self.touch_interval:
+            return
+        self._refresh(session_id, now)
+        if self._task is None:
+            await self._write([], [(session_id, max_age)], [])
+        elif session_id not in self._writes:
+            self._touches[session_id] = max_age
+            self._queued()
+
+    async def flush(self) -> bool:
+        """Write out up to ``max_batch`` queued writes; ``False`` if that failed."""
+        if not self._writes and not self._touches:
+            return True
+        writes, touches = self._writes, self._touches
+        if len(writes) + len(touches) > self.max_batch:
+            keys = list(writes)[: self.max_batch]
+            batch = {key: writes.pop(key) for key in keys}
+            touch_keys = list(touches)[: self.max_batch - len(batch)]
+            batch_touches = {key: touches.pop(key) for key in touch_keys}
+        else:
+            batch, batch_touches = writes, touches
+            self._writes, self._touches = {}, {}
+        self._flushing = batch
+        sets, deletes = [], []
+        for session_id, (data, max_age) in batch.items():
+            if data is None:
+                deletes.append(session_id)
+            else:
+                sets.append((session_id, data, max_age))
+        try:
+            await self._write(sets, list(batch_touches.items()), deletes)
+        except BaseException as exc:
+            for session_id, entry in batch.items():  # unless superseded meanwhile
+                self._writes.setdefault(session_id, entry)
+            for session_id, max_age in batch_touches.items():
+                if session_id not in self._writes:
+                    self._touches.setdefault(session_id, max_age)
+            if not isinstance(exc, Exception):
+                raise
+            logger.exception("Session write-behind flush failed; will retry")
+            return False
+        finally:
+            self._flushing = {}
+        self.batches += 1
+        return True
+
+    async def _write(self, sets, touches, deletes):
+        backend = self.backend
+        if hasattr(backend, "awrite_batch"):
+            await backend.awrite_batch(sets, touches, deletes)
+        elif hasattr(backend, "write_batch"):
+            await run_in_threadpool(backend.write_batch, sets, touches, deletes)
+        elif hasattr(backend, "aset"):
+            for session_id, data, max_age in sets:
+                await backend.aset(session_id, data, max_age)
+            for session_id, max_age in touches:
+                if hasattr(backend, "atouch"):
+                    await backend.atouch(session_id, max_age)
+                elif (data := await backend.aget(session_id)) is not None:
+                    await backend.aset(session_id, data, max_age)
+            for session_id in deletes:
+                await backend.adelete(session_id)
+        else:
+            await run_in_threadpool(_write_each, backend, sets, touches, deletes)
+
+
+def _write_each(backend, sets, touches, deletes):
+    for session_id, data, max_age in sets:
+        backend.set(session_id, data, max_age)
+    for session_id, max_age in touches:
+        if hasattr(backend, "touch"):
+            backend.touch(session_id, max_age)
+        elif (data := backend.get(session_id)) is not None:
+            backend.set(session_id, data, max_age)  # no touch -> full re-write
+    for session_id in deletes:
+        backend.delete(session_id)
+
 
 class ServerSessionMiddleware:
     """ASGI middleware storing session data in a backend, keyed by an
@@ -325,24 +937,17 @@ class ServerSessionMiddleware:
         else:
             await self._set(session_id, data, max_age)  # no touch -> full re-write
 
-    @staticmethod
-    def _changed(session, initial):
-        try:
-            return session != initial  # dict.__eq__ is deep + order-independent
-        except Exception:
-            return True  # uncomparable -> assume dirty, write
-
     async def __call__(self, scope, receive, send):
         if scope["type"] not in ("http", "websocket"):
             await self.app(scope, receive, send)
             return
 
         session_id = self._session_id_from(scope)
-        initial = await self._get(session_id) if session_id else None
-        had_session = initial is not None
-        # Independent deep copy: the live session must not alias the backend's
-        # stored object, and `initial` stays a pristine baseline for dirty checks.
-        scope["session"] = copy.deepcopy(initial) if had_session else {}
+        record = await self._get(session_id) if session_id else None
+        had_session = record is not None
+        # The live session copies the record on write, so it never aliases
+        # the backend's stored object and `record` stays the clean baseline.
+        scope["session"] = LazySession(lambda: record)
         # A presented-but-unresolved cookie must not be reused as the stored
         # ID — mint a fresh one to defeat session fixation.
         if session_id is not None and not had_session:
@@ -363,19 +968,25 @@ class ServerSessionMiddleware:
                 # if it was valid — defeats a planted-but-valid session id.
                 regenerate = scope.get("_session_regenerate", False)
                 if regenerate and session_id is not None:
+                    session.load()
                     await self._delete(session_id)
                     session_id = None
                     had_session = False
-                if session:
+                if session.loaded:
+                    has_data = bool(session)
+                    changed = not had_session or session.dirty
+                else:  # never used by the app, so unchanged
+                    has_data, changed = bool(record), False
+                if has_data:
                     if session_id is None:
                         session_id = secrets.token_urlsafe(32)
                     # Persist only when changed; otherwise just slide the TTL.
                     # Either way the cookie Max-Age is refreshed below, so cookie
                     # and backend expiry stay in lock-step.
-                    if not had_session or self._changed(session, initial):
-                        await self._set(session_id, session, self.max_age)
+                    if changed:
+                        await self._set(session_id, dict(session), self.max_age)
                     else:
-                        await self._touch(session_id, session, self.max_age)
+                        await self._touch(session_id, record, self.max_age)
                     headers.append(
                         "Set-Cookie", self._cookie_header(session_id, self.max_age)
                     )
@@ -387,6 +998,102 @@ class ServerSessionMiddleware:
         await self.app(scope, receive, send_wrapper)
 
 
+class CookieSessionMiddleware:
+    """ASGI middleware storing the session in a signed cookie, decoded lazily.
+
+    Wire-compatible with Starlette's ``SessionMiddleware`` (same signer and
+    encoding), but the cookie is only verified and decoded when the app first
+    uses the session. It is re-signed when the session changed, or when a
+    session that was used carries a signature older than
+    :attr:`refresh_after` of ``max_age``, so active sessions keep sliding
+    their expiry without a ``Set-Cookie`` on every response.
+    """
+
+    #: Fraction of ``max_age`` after which a used session is re-signed.
+    refresh_after = 0.5
+
+    def __init__(
+        self,
+        app,
+        secret_key,
+        session_cookie="session",
+        max_age=14 * 24 * 3600,
+        path="/",
+        same_site="lax",
+        https_only=False,
+    ):
+        self.app = app
+        self.signer = itsdangerous.TimestampSigner(str(secret_key))
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.path = path
+        self.security_flags = "httponly; samesite=" + same_site
+        if https_only:  # Secure flag can be used with HTTPS only
+            self.security_flags += "; secure"
+
+    def _decode(self, scope):
+        value = HTTPConnection(scope).cookies.get(self.session_cookie)
+        if value is None:
+            return None
+        try:
+            data, signed_at = self.signer.unsign(
+                value.encode("utf-8"), max_age=self.max_age, return_timestamp=True
+            )
+            session = json.loads(b64decode(data))
+        except (BadSignature, ValueError):
+            return None
+        scope["_session_signed_at"] = signed_at.timestamp()
+        return session
+
+    def _stale(self, scope):
+        """Whether the session cookie's signature is due for a refresh."""
+        signed_at = scope.get("_session_signed_at")
+        if signed_at is None or self.max_age is None:
+            return False
+        return time.time() - signed_at >= self.max_age * self.refresh_after
+
+    def _cookie_header(self, value, attributes):
+        return (
+            f"{self.session_cookie}={value}; path={self.path}; "
+            f"{attributes}{self.security_flags}"
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        scope["session"] = LazySession(functools.partial(self._decode, scope))
+
+        async def send_wrapper(message):
+            session = scope["session"]
+            if message["type"] == "http.response.start" and session.loaded:
+                headers = MutableHeaders(scope=message)
+                if session.accessed:
+                    headers.add_vary_header("Cookie")
+                if session and (session.dirty or self._stale(scope)):
+                    data = b64encode(json.dumps(dict(session)).encode("utf-8"))
+                    max_age = (
+                        f"Max-Age={self.max_age}; " if self.max_age is not None else ""
+                    )
+                    headers.append(
+                        "Set-Cookie",
+                        self._cookie_header(
+                            self.signer.sign(data).decode("utf-8"), max_age
+                        ),
+                    )
+                elif session.dirty and session.stored:  # the session was cleared
+                    headers.append(
+                        "Set-Cookie",
+                        self._cookie_header(
+                            "null", "expires=Thu, 01 Jan 1970 00:00:00 GMT; "
+                        ),
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
 def regenerate_session(req):
     """Rotate the server-side session ID, keeping the current session data.
 
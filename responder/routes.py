@@ -6,6 +6,8 @@ import inspect
 import logging
 import re
 import sys
+import threading
+import time
 import traceback
 import urllib.parse
 import weakref
@@ -37,6 +39,7 @@ from starlette.websockets import (
 )
 
 from . import status_codes
+from .concurrency import call_inline, is_inline
 from .errors import (
     INTERNAL_SERVER_ERROR,
     PROBLEM_JSON,
@@ -47,6 +50,7 @@ from .errors import (
 from .formats import get_formats
 from .models import Request, Response
 from .params import _Depends
+from .scheduling import Scheduler
 
 logger = logging.getLogger("responder")
 
@@ -627,14 +631,15 @@ def _is_async(fn: Callable) -> bool:
 
 
 async def _invoke_provider(
-    provider: Callable, kwargs: dict
+    provider: Callable, kwargs: dict, inline_threshold: float | None = None
 ) -> tuple[Any, Callable | None]:
     """Call a provider with pre-resolved kwargs, returning ``(value, teardown)``.
 
     Providers may be sync/async functions or sync/async generators (code after
     ``yield`` runs as teardown), including callable instances whose ``__call__``
     is a generator. Sub-dependencies and the request are passed in via
-    ``kwargs`` by the resolver.
+    ``kwargs`` by the resolver. Sync providers marked with
+    :func:`~responder.inline` run on the event loop instead of a thread.
     """
     # For a callable instance, the generator-ness lives on __call__, not the
     # object itself; inspect that (calling provider(**kwargs) still dispatches
@@ -670,6 +675,9 @@ async def _invoke_provider(
     if _is_async(provider):
         return await provider(**kwargs), None
 
+    if is_inline(provider):
+        return call_inline(provider, (), kwargs, inline_threshold), None
+
     return await run_in_threadpool(provider, **kwargs), None
 
 
@@ -688,10 +696,17 @@ class _RequestResolver:
         "provider_cache",
         "teardowns",
         "stack",
+        "inline_threshold",
     )
 
     def __init__(
-        self, registry, app_deps, request, req_names, override_names=frozenset()
+        self,
+        registry,
+        app_deps,
+        request,
+        req_names,
+        override_names=frozenset(),
+        inline_threshold=None,
     ):
         self.registry = registry
         self.app_deps = app_deps
@@ -706,6 +721,7 @@ class _RequestResolver:
         # ``__name__``, which two distinct providers may share — while labels
         # keep error messages readable.
         self.stack: list[tuple[Any, str]] = []
+        self.inline_threshold = inline_threshold
 
     def _check_cycle(self, key: Any, label: str) -> None:
         keys = [k for k, _ in self.stack]
@@ -770,7 +786,9 @@ class _RequestResolver:
                     )
         finally:
             self.stack.pop()
-        value, teardown = await _invoke_provider(provider, kwargs)
+        value, teardown = await _invoke_provider(
+            provider, kwargs, self.inline_threshold
+        )
         self.cache[name] = value
         if teardown is not None:
             self.teardowns.append(teardown)
@@ -805,7 +823,9 @@ class _RequestResolver:
                     )
         finally:
             self.stack.pop()
-        value, teardown = await _invoke_provider(provider, kwargs)
+        value, teardown = await _invoke_provider(
+            provider, kwargs, self.inline_threshold
+        )
         try:
             self.provider_cache[key] = value
         except TypeError:
@@ -857,7 +877,15 @@ def _error_payload(scope, status_code, detail=None, *, title=None, errors=None):
     return legacy_error_payload(status_code, detail, title=title, errors=errors)
 
 
+def _mark_stage(scope: Scope, stage: str) -> None:
+    # Set by MetricsMiddleware; each stage runs until the next mark.
+    marks = scope.get("stage_marks")
+    if marks is not None:
+        marks.append((stage, time.perf_counter_ns()))
+
+
 def _trace(scope: Scope, stage: str, **values: Any) -> None:
+    _mark_stage(scope, stage)
     if not scope.get("trace_dispatch"):
         return
     route = scope.get("route_pattern") or scope.get("path")
@@ -865,6 +893,15 @@ def _trace(scope: Scope, stage: str, **values: Any) -> None:
     logger.debug("dispatch.%s %s %s", stage, route, bits)
 
 
+def _run_tracked(inflight: Any, fn: Callable, args: tuple, kwargs: dict) -> Any:
+    # Lets the slow-request watchdog find the worker thread's stack.
+    inflight.thread = threading.get_ident()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        inflight.thread = None
+
+
 def _callable_label(fn: Callable) -> str:
     return getattr(fn, "__name__", fn.__class__.__name__)
 
@@ -886,14 +923,19 @@ class BaseRoute:
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         raise NotImplementedError()
 
-    async def _dispatch_hook(self, hook: Callable, *args: Any) -> None:
+    async def _dispatch_hook(
+        self, hook: Callable, *args: Any, inline_threshold: float | None = None
+    ) -> None:
         """Invoke a hook, awaiting coroutines and offloading sync callables.
 
+        Sync hooks marked :func:`~responder.inline` run on the loop instead.
         Shared by the HTTP and websocket before/after hook runners; each caller
         layers its own short-circuit and error-handling policy around it.
         """
         if _is_async(hook):
             await hook(*args)
+        elif is_inline(hook):
+            call_inline(hook, args, {}, inline_threshold)
         else:
             await run_in_threadpool(hook, *args)
 
@@ -1076,10 +1118,12 @@ class Route(BaseRoute):
     async def _run_hooks(
         self, hooks: Iterable[Callable], request: Request, response: Response
     ) -> bool:
+        scope = request._starlette.scope
+        threshold = scope.get("inline_warn_threshold")
         for hook in hooks:
-            _trace(request._starlette.scope, "before_hook", hook=_callable_label(hook))
+            _trace(scope, "before_hook", hook=_callable_label(hook))
             args = (request, response) if _accepts_arg_count(hook, 2) else (request,)
-            await self._dispatch_hook(hook, *args)
+            await self._dispatch_hook(hook, *args, inline_threshold=threshold)
             if response.status_code is not None:
                 return False
         return True
@@ -1211,6 +1255,18 @@ class Route(BaseRoute):
     ) -> Any:
         if _is_async(view):
             return await view(request, response, **kwargs)
+        if is_inline(view) or is_inline(self.endpoint):
+            return call_inline(
+                view,
+                (request, response),
+                kwargs,
+                request._starlette.scope.get("inline_warn_threshold"),
+            )
+        inflight = request._starlette.scope.get("inflight_request")
+        if inflight is not None:
+            return await run_in_threadpool(
+                _run_tracked, inflight, view, (request, response), kwargs
+            )
         return await run_in_threadpool(view, request, response, **kwargs)
 
     def _apply_result(self, response: Response, result: Any) -> None:
@@ -1326,11 +1382,12 @@ class Route(BaseRoute):
     ) -> None:
         route_after = getattr(self.endpoint, "_route_after", ())
         after_requests = scope.get("after_requests", [])
+        threshold = scope.get("inline_warn_threshold")
         for hook in (*route_after, *after_requests):
             _trace(scope, "after_hook", hook=_callable_label(hook))
             args = (request, response) if _accepts_arg_count(hook, 2) else (request,)
             try:
-                await self._dispatch_hook(hook, *args)
+                await self._dispatch_hook(hook, *args, inline_threshold=threshold)
             except Exception as exc:
                 logger.exception("after_request hook failed")
                 if getattr(scope.get("api"), "debug", False):
@@ -1355,6 +1412,12 @@ class Route(BaseRoute):
 
         _trace(scope, "auth")
         auth_injected = await self._route_auth_injections(request)
+        limiter = getattr(self.endpoint, "_route_rate_limit", None)
+        if limiter is not None:
+            _trace(scope, "rate_limit")
+            if not await limiter.acheck(request, response):
+                await response(scope, receive, send)
+                return
         ok, injected = await self._validate_inputs(
             scope, receive, send, request, response, path_params
         )
@@ -1369,6 +1432,7 @@ class Route(BaseRoute):
             request,
             _HTTP_REQUEST_NAMES,
             scope.get("dependency_override_names", frozenset()),
+            scope.get("inline_warn_threshold"),
         )
         try:
             try:
@@ -1399,6 +1463,7 @@ class Route(BaseRoute):
             await self._run_after_hooks(scope, request, response)
             if response.status_code is None:
                 response.status_code = status_codes.HTTP_200
+            _mark_stage(scope, "response")
             await response(scope, receive, send)
         finally:
             await resolver.teardown()
@@ -1506,7 +1571,12 @@ class WebSocketRoute(BaseRoute):
             app_deps = scope.get("app_dependencies")
             override_names = scope.get("dependency_override_names", frozenset())
             resolver = _RequestResolver(
-                dependencies, app_deps, ws, _WS_REQUEST_NAMES, override_names
+                dependencies,
+                app_deps,
+                ws,
+                _WS_REQUEST_NAMES,
+                override_names,
+                scope.get("inline_warn_threshold"),
             )
 
             await self._run_route_dependencies(resolver)
@@ -1577,8 +1647,9 @@ class WebSocketRoute(BaseRoute):
     async def _run_before_hooks(
         self, hooks: Iterable[Callable], ws: WebSocket
     ) -> bool:
+        threshold = ws.scope.get("inline_warn_threshold")
         for hook in hooks:
-            await self._dispatch_hook(hook, ws)
+            await self._dispatch_hook(hook, ws, inline_threshold=threshold)
             # If a hook closed the connection, short-circuit the endpoint.
             if WebSocketState.DISCONNECTED in (ws.client_state, ws.application_state):
                 return False
@@ -1587,9 +1658,10 @@ class WebSocketRoute(BaseRoute):
     async def _run_after_hooks(
         self, hooks: Iterable[Callable], ws: WebSocket
     ) -> None:
+        threshold = ws.scope.get("inline_warn_threshold")
         for hook in hooks:
             try:
-                await self._dispatch_hook(hook, ws)
+                await self._dispatch_hook(hook, ws, inline_threshold=threshold)
             except Exception:
                 # A failing after-hook must not escape into the ASGI task and
                 # crash the (often already-closed) websocket. Log it and move
@@ -1704,6 +1776,7 @@ class Router:
         ws_idle_timeout: float | None = None,
         trace_dispatch: bool = False,
         problem_details: bool = True,
+        inline_warn_threshold: float | None = None,
     ) -> None:
         self.routes: list[BaseRoute] = [] if routes is None else list(routes)
 
@@ -1716,6 +1789,8 @@ class Router:
         )
         self.after_requests: list[Callable] = []
         self.events: defaultdict[str, list[Callable]] = defaultdict(list)
+        # @api.every / @api.cron jobs: run between startup and shutdown.
+        self.scheduler = Scheduler()
         self.dependencies: dict[str, tuple[Callable, str]] = {}
         # Test-time overrides: same registry shape, always request-scoped so
         # they take precedence over (and bypass the cache of) any real dep.
@@ -1730,6 +1805,8 @@ class Router:
         self.ws_idle_timeout = ws_idle_timeout
         self.trace_dispatch = trace_dispatch
         self.problem_details = problem_details
+        # Debug-only budget for inline sync callables; None disables timing.
+        self.inline_warn_threshold = inline_warn_threshold
         self._route_cache: dict[tuple[str, str], tuple[BaseRoute, dict]] = {}
         self.formats: dict[str, Callable] = (
             get_formats() if formats is None else formats
@@ -1941,6 +2018,7 @@ class Router:
                 raise
             try:
                 await self.trigger_event("startup")
+                await self.scheduler.start()
             except BaseException:
                 msg = traceback.format_exc()
                 try:
@@ -1956,6 +2034,7 @@ class Router:
 
             try:
                 try:
+                    await self.scheduler.stop()
                     await self.trigger_event("shutdown")
                 finally:
                     await ctx.__aexit__(None, None, None)
@@ -1971,6 +2050,7 @@ class Router:
             # Legacy on_event("startup") / on_event("shutdown") pattern
             try:
                 await self.trigger_event("startup")
+                await self.scheduler.start()
             except BaseException:
                 msg = traceback.format_exc()
                 await send({"type": "lifespan.startup.failed", "message": msg})
@@ -1979,6 +2059,7 @@ class Router:
             await send({"type": "lifespan.startup.complete"})
             message = await receive()
             assert message["type"] == "lifespan.shutdown"
+            await self.scheduler.stop()
             await self.trigger_event("shutdown")
             await self.app_dependencies.shutdown()
 
@@ -2018,6 +2099,7 @@ class Router:
         scope["ws_idle_timeout"] = self.ws_idle_timeout
         scope["trace_dispatch"] = self.trace_dispatch
         scope["problem_details"] = self.problem_details
+        scope["inline_warn_threshold"] = self.inline_warn_threshold
 
         if route is not None:
             await route(scope, receive, send)
@@ -0,0 +1,264 @@
+"""Periodic and cron-scheduled tasks tied to the application lifespan.
+
+Register jobs with ``@api.every`` or ``@api.cron``; they start once the app
+has started up and are cancelled cleanly at shutdown::
+
+    @api.every(30, jitter=5, run_on_startup=True)
+    async def refresh_rates():
+        ...
+
+    @api.cron("*/5 * * * *")
+    def rebuild_leaderboard():
+        ...
+
+Sync jobs run in the thread pool, async jobs on the server's event loop. By
+default a job whose previous run is still going is skipped rather than
+stacked up (``skip_if_running=False`` allows overlap). Cron expressions use
+the standard five fields — minute, hour, day of month, month, day of week —
+in local time, with ``*``, ``a-b``, ``*/n``, lists, month/day names, and the
+``@hourly``/``@daily``/``@weekly``/``@monthly``/``@yearly`` aliases.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from starlette.concurrency import run_in_threadpool
+
+__all__ = ["CronSchedule", "ScheduledTask", "Scheduler"]
+
+logger = logging.getLogger("responder")
+
+_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_MONTHS = "jan feb mar apr may jun jul aug sep oct nov dec".split()
+_DAYS = "sun mon tue wed thu fri sat".split()
+# (low, high, names offset by low) per field.
+_FIELDS = (
+    (0, 59, None),
+    (0, 23, None),
+    (1, 31, None),
+    (1, 12, _MONTHS),
+    (0, 7, _DAYS),
+)
+
+
+def _parse_field(text: str, low: int, high: int, names: list[str] | None) -> set[int]:
+    def value(token: str) -> int:
+        if names is not None and token.lower() in names:
+            return names.index(token.lower()) + (1 if low == 1 else 0)
+        number = int(token)
+        if not low <= number <= high:
+            raise ValueError(f"{number} is out of range {low}-{high}")
+        return number
+
+    values: set[int] = set()
+    for part in text.split(","):
+        spec, _, step_text = part.partition("/")
+        step = int(step_text) if step_text else 1
+        if step < 1:
+            raise ValueError(f"invalid step in {part!r}")
+        if spec == "*":
+            start, stop = low, high
+        elif "-" in spec:
+            first, _, last = spec.partition("-")
+            start, stop = value(first), value(last)
+        else:
+            start = value(spec)
+            stop = high if step_text else start
+        values.update(range(start, stop + 1, step))
+    return values
+
+
+class CronSchedule:
+    """A parsed five-field cron expression.
+
+    :param expression: e.g. ``"*/5 * * * *"`` or ``"@daily"``.
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        fields = _ALIASES.get(expression.strip().lower(), expression).split()
+        if len(fields) != 5:
+            raise ValueError(
+                f"Cron expression {expression!r} must have 5 fields "
+                "(minute hour day month weekday)"
+            )
+        try:
+            parsed = [
+                _parse_field(text, *spec)
+                for text, spec in zip(fields, _FIELDS, strict=True)
+            ]
+        except ValueError as exc:
+            raise ValueError(f"Invalid cron expression {expression!r}: {exc}") from None
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # 0 and 7 both mean Sunday.
+        self.weekdays = {day % 7 for day in weekdays}
+        # Standard cron: when both day fields are restricted, either matches.
+        self._any_day = not fields[2].startswith("*") and not fields[4].startswith("*")
+
+    def _day_matches(self, moment: datetime) -> bool:
+        in_month = moment.day in self.days
+        in_week = (moment.weekday() + 1) % 7 in self.weekdays
+        return (in_month or in_week) if self._any_day else (in_month and in_week)
+
+    def next_after(self, moment: datetime) -> datetime:
+        """The first matching minute strictly after ``moment``."""
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Five years of days covers every satisfiable expression (Feb 29).
+        limit = candidate + timedelta(days=5 * 366)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(
+                    year=year, month=month, day=1, hour=0, minute=0
+                )
+            elif not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+    def __repr__(self) -> str:
+        return f"CronSchedule({self.expression!r})"
+
+
+class ScheduledTask:
+    """One registered job and its run statistics."""
+
+    def __init__(
+        self,
+        func: Callable,
+        *,
+        interval: float | None = None,
+        cron: CronSchedule | None = None,
+        jitter: float = 0,
+        run_on_startup: bool = False,
+        skip_if_running: bool = True,
+        name: str | None = None,
+    ) -> None:
+        if (interval is None) == (cron is None):
+            raise ValueError("A scheduled task needs exactly one of interval or cron")
+        self.func = func
+        self.interval = interval
+        self.cron = cron
+        self.jitter = jitter
+        self.run_on_startup = run_on_startup
+        self.skip_if_running = skip_if_running
+        self.name: str = name or getattr(func, "__qualname__", None) or repr(func)
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.total_seconds = 0.0
+        self.last_duration: float | None = None
+        self._active: set[asyncio.Task] = set()
+        self._next_slot: datetime | None = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._active)
+
+    def _delay(self) -> float:
+        if self.cron is not None:
+            now = datetime.now()
+            # Never re-fire a slot if the sleep woke a hair early.
+            after = max(now, self._next_slot) if self._next_slot else now
+            self._next_slot = self.cron.next_after(after)
+            delay = max((self._next_slot - now).total_seconds(), 0)
+        else:
+            assert self.interval is not None  # guaranteed by __init__
+            delay = self.interval
+        if self.jitter:
+            delay += random.uniform(0, self.jitter)  # noqa: S311 - not crypto
+        return delay
+
+    def _fire(self) -> None:
+        if self._active and self.skip_if_running:
+            self.skipped += 1
+            logger.debug("Scheduled task %s still running; skipping", self.name)
+            return
+        task = asyncio.get_running_loop().create_task(self._run())
+        self._active.add(task)
+        task.add_done_callback(self._active.discard)
+
+    async def _run(self) -> None:
+        start = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(self.func):
+                await self.func()
+            else:
+                await run_in_threadpool(self.func)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.failures += 1
+            logger.exception("Scheduled task %s failed", self.name)
+        finally:
+            duration = time.perf_counter() - start
+            self.runs += 1
+            self.total_seconds += duration
+            self.last_duration = duration
+
+    async def _loop(self) -> None:
+        if self.run_on_startup:
+            self._fire()
+        while True:
+            await asyncio.sleep(self._delay())
+            self._fire()
+
+
+class Scheduler:
+    """Runs :class:`ScheduledTask` jobs between startup and shutdown.
+
+    Owned by the router, which starts it after the startup handlers and stops
+    it before the shutdown handlers.
+    """
+
+    def __init__(self) -> None:
+        self.tasks: list[ScheduledTask] = []
+        self._loops: list[asyncio.Task] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def add(self, task: ScheduledTask) -> ScheduledTask:
+        """Register ``task``; if already started, schedule it right away."""
+        self.tasks.append(task)
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._spawn, task)
+        return task
+
+    def _spawn(self, task: ScheduledTask) -> None:
+        self._loops.append(asyncio.get_running_loop().create_task(task._loop()))
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        for task in self.tasks:
+            self._spawn(task)
+
+    async def stop(self) -> None:
+        """Cancel the schedule loops and any in-flight async runs."""
+        self._loop = None
+        pending = list(self._loops)
+        for scheduled in self.tasks:
+            pending.extend(scheduled._active)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._loops = []
@@ -0,0 +1,82 @@
+"""Measure rate-limit backend throughput (hits per second).
+
+Usage::
+
+    python scripts/bench_ratelimit.py [--seconds 1] [--threads 1] [--clients 100]
+
+Each run hammers one backend with ``hit()`` calls spread over ``--clients``
+keys, for several limits. ``MemoryBackend`` keeps a timestamp per admitted
+hit, so its cost grows with the limit; ``GCRABackend`` keeps one float per key.
+``SharedMemoryBackend`` adds a file lock per hit to share limits across
+processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from responder.ext.ratelimit import GCRABackend, MemoryBackend, SharedMemoryBackend
+
+LIMITS = (10, 100, 1_000, 10_000)
+
+
+def bench(backend, limit: int, *, seconds: float, threads: int, clients: int) -> float:
+    keys = [f"client-{i}" for i in range(clients)]
+    counts = [0] * threads
+    stop = threading.Event()
+
+    def worker(slot: int) -> None:
+        hit = backend.hit
+        n = 0
+        while not stop.is_set():
+            for key in keys:
+                hit(key, limit, 60)
+            n += len(keys)
+        counts[slot] = n
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in workers:
+        t.join()
+    return sum(counts) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=100)
+    args = parser.parse_args()
+
+    names = ("MemoryBackend", "GCRABackend", "SharedMemoryBackend")
+    print(f"{'limit/min':>10}" + "".join(f"  {name:>19}" for name in names))
+    with tempfile.TemporaryDirectory() as directory:
+        for limit in LIMITS:
+            backends = (
+                MemoryBackend(),
+                GCRABackend(),
+                SharedMemoryBackend(Path(directory) / f"bench-{limit}"),
+            )
+            rates = [
+                bench(
+                    backend,
+                    limit,
+                    seconds=args.seconds,
+                    threads=args.threads,
+                    clients=args.clients,
+                )
+                for backend in backends
+            ]
+            print(f"{limit:>10}" + "".join(f"  {rate:>17,.0f}/s" for rate in rates))
+
+
+if __name__ == "__main__":
+    main()
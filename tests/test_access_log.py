@@ -0,0 +1,111 @@
+"""Queued JSON access log: sampling, overflow, and the logging middleware."""
+
+import json
+import logging
+import threading
+
+import responder
+from responder.ext.logging import AccessLog, JSONFormatter
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(JSONFormatter())
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.threads.add(threading.current_thread().name)
+        self.lines.append(json.loads(self.format(record)))
+
+
+def _app(access_log, **options):
+    api = responder.API(allowed_hosts=[";"], access_log=access_log, **options)
+
+    @api.route("/items/{id}")
+    def item(req, resp, *, id):
+        resp.text = id
+
+    @api.route("/health")
+    def health(req, resp):
+        resp.text = "ok"
+
+    return api
+
+
+def test_entries_are_written_off_the_loop_as_json():
+    capture = _Capture()
+    log = AccessLog(capture)
+    api = _app(log)
+    with api.requests as client:
+        response = client.get("/items/7", headers={"X-Request-ID": "rid-7"})
+    assert response.headers["x-request-id"] == "rid-7"
+
+    (entry,) = capture.lines
+    assert entry["message"].startswith("GET /items/7 → 200")
+    assert entry["route"] == "/items/{id}"
+    assert entry["status"] == 200
+    assert entry["request_id"] == "rid-7"
+    assert entry["logger"] == "responder.access"
+    assert entry["duration_ms"] >= 0
+    assert capture.threads and "MainThread" not in capture.threads
+
+
+def test_route_and_status_sampling():
+    capture = _Capture()
+    log = AccessLog(
+        capture,
+        sample_rate=0,
+        route_rates={"/health": 0, "/items/{id}": 1},
+        status_rates={"4xx": 1},
+    )
+    api = _app(log)
+    with api.requests as client:
+        client.get("/health")
+        client.get("/items/1")
+        client.get("/missing")
+    assert [entry["status"] for entry in capture.lines] == [200, 404]
+    assert [entry["path"] for entry in capture.lines] == ["/items/1", "/missing"]
+
+
+def test_exact_status_beats_status_class():
+    log = AccessLog(logging.NullHandler(), status_rates={"5xx": 1, 503: 0})
+    assert log._rate("/", 500) == 1
+    assert log._rate("/", 503) == 0
+    assert log._rate("/", 200) == 1.0
+
+
+def test_overflow_is_dropped_and_counted():
+    gate = threading.Event()
+
+    class Blocking(logging.Handler):
+        def emit(self, record):
+            gate.wait(5)
+
+    log = AccessLog(Blocking(), max_queue=2)
+    for _ in range(10):
+        log.log("GET", "/", 200, 1.0)
+    # One entry is held by the writer thread, two more fit in the queue.
+    assert 7 <= log.dropped <= 8
+    gate.set()
+    log.stop()
+
+
+def test_dropped_entries_are_exported():
+    log = AccessLog(logging.NullHandler())
+    log.dropped = 3
+    api = _app(log, metrics_route="/metrics")
+    body = api.requests.get("/metrics").text
+    assert "responder_access_log_dropped_total 3" in body
+
+
+def test_json_formatter_includes_request_context():
+    record = logging.LogRecord("app", logging.WARNING, __file__, 1, "hi %s", ("x",), None)
+    record.request_id = "abc"
+    record.client_ip = "-"
+    entry = json.loads(JSONFormatter().format(record))
+    assert entry["message"] == "hi x"
+    assert entry["level"] == "WARNING"
+    assert entry["request_id"] == "abc"
+    assert "client_ip" not in entry
@@ -0,0 +1,140 @@
+"""Cached credential verification for the auth schemes."""
+
+import asyncio
+
+import pytest
+
+import responder
+from responder.ext import auth as auth_module
+from responder.ext.auth import APIKeyAuth, BasicAuth, BearerAuth
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _app(scheme):
+    api = responder.API(allowed_hosts=[";"])
+
+    @api.route("/me", auth=scheme)
+    def me(req, resp, *, user):
+        resp.media = {"user": user}
+
+    return api
+
+
+def test_positive_and_negative_results_are_cached(clock):
+    calls = []
+
+    def verify(token):
+        calls.append(token)
+        return {"sub": "alice"} if token == "good" else None
+
+    api = _app(BearerAuth(verify=verify, cache_ttl=60, negative_ttl=5))
+    for _ in range(3):
+        assert api.requests.get("/me", headers=_bearer("good")).json() == {
+            "user": {"sub": "alice"}
+        }
+        assert api.requests.get("/me", headers=_bearer("bad")).status_code == 401
+    assert calls == ["good", "bad"]
+
+    clock[0] += 10  # the rejection expired, the principal did not
+    api.requests.get("/me", headers=_bearer("good"))
+    api.requests.get("/me", headers=_bearer("bad"))
+    assert calls == ["good", "bad", "bad"]
+
+
+def test_invalidate_forces_reverification(clock):
+    revoked = set()
+    scheme = BearerAuth(verify=lambda t: t not in revoked and t, cache_ttl=60)
+    api = _app(scheme)
+    assert api.requests.get("/me", headers=_bearer("tok")).status_code == 200
+    revoked.add("tok")
+    assert api.requests.get("/me", headers=_bearer("tok")).status_code == 200
+    scheme.invalidate("tok")
+    assert api.requests.get("/me", headers=_bearer("tok")).status_code == 401
+
+
+def test_lru_is_bounded_and_stores_no_credentials():
+    scheme = APIKeyAuth(verify=lambda key: key, cache_ttl=60, max_entries=2)
+    api = _app(scheme)
+    for key in ("k1", "k2", "k3"):
+        api.requests.get("/me", headers={"X-API-Key": key})
+    entries = scheme._cache._entries
+    assert len(entries) == 2
+    assert all(isinstance(digest, bytes) for digest in entries)
+    assert not any(key in digest for key in (b"k1", b"k2", b"k3") for digest in entries)
+
+
+def test_concurrent_verifications_are_coalesced():
+    calls = []
+
+    async def verify(token):
+        calls.append(token)
+        await asyncio.sleep(0.05)
+        return token
+
+    scheme = BearerAuth(verify=verify, cache_ttl=60)
+
+    class Req:
+        headers = _bearer("tok")
+
+    async def run():
+        return await asyncio.gather(*(scheme.authenticate(Req()) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["tok"] * 5
+    assert calls == ["tok"]
+
+
+def test_verify_errors_reach_every_waiter():
+    async def verify(token):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("introspection down")
+
+    scheme = BearerAuth(verify=verify, cache_ttl=60)
+
+    class Req:
+        headers = _bearer("tok")
+
+    async def run():
+        return await asyncio.gather(
+            *(scheme.authenticate(Req()) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert scheme._cache._entries == {}
+
+
+def test_basic_auth_caches_comparison(monkeypatch):
+    compared = []
+    real = auth_module.compare_digest
+
+    def counting(a, b):
+        compared.append(a)
+        return real(a, b)
+
+    monkeypatch.setattr(auth_module, "compare_digest", counting)
+    api = _app(BasicAuth(credentials={"alice": "s3cret"}, cache_ttl=60))
+    for _ in range(3):
+        response = api.requests.get("/me", auth=("alice", "s3cret"))
+        assert response.json() == {"user": "alice"}
+    assert len(compared) == 1
+
+
+def test_equal_configuration_still_compares_equal():
+    assert BearerAuth(tokens=["a"], cache_ttl=5) == BearerAuth(tokens=["a"], cache_ttl=5)
+    assert BearerAuth(tokens=["a"], cache_ttl=5) != BearerAuth(tokens=["a"], cache_ttl=9)
+    assert BearerAuth(tokens=["a"]).invalidate("a") is None
+
+
+def test_invalid_cache_settings():
+    with pytest.raises(ValueError, match="cache_ttl"):
+        BearerAuth(tokens=["a"], cache_ttl=0)
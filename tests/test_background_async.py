@@ -6,6 +6,7 @@ import threading
 
 import pytest
 
+import responder
 from responder.background import BackgroundQueue
 
 
@@ -127,3 +128,126 @@ def test_api_background_async_task(api):
     r = api.requests.get("/")
     assert r.status_code == 200
     assert done.wait(timeout=5)
+
+
+def test_async_tasks_share_one_persistent_loop(queue):
+    """Async tasks reuse one background loop instead of asyncio.run per task."""
+
+    async def job():
+        return id(asyncio.get_running_loop())
+
+    first = queue.run(job).result(timeout=5)
+    second = queue.run(job).result(timeout=5)
+    assert first == second
+
+
+def test_async_concurrency_is_bounded():
+    q = BackgroundQueue(n=1, async_concurrency=2)
+    running = 0
+    peak = 0
+
+    async def job():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    futures = [q.run(job) for _ in range(6)]
+    for future in futures:
+        future.result(timeout=5)
+    q.shutdown()
+    assert peak == 2
+
+
+def test_shutdown_timeout_cancels_stragglers():
+    q = BackgroundQueue(n=1)
+    started = threading.Event()
+
+    async def forever():
+        started.set()
+        await asyncio.sleep(60)
+
+    future = q.run(forever)
+    assert started.wait(timeout=5)
+    q.shutdown(timeout=0.05)
+    assert future.cancelled()
+
+
+def test_shutdown_waits_for_async_tasks():
+    q = BackgroundQueue(n=1)
+
+    async def job():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    future = q.run(job)
+    q.shutdown()
+    assert future.result(timeout=0) == "done"
+
+
+def test_async_run_after_shutdown_raises():
+    q = BackgroundQueue(n=1)
+    q.shutdown()
+
+    async def job():
+        pass
+
+    with pytest.raises(RuntimeError):
+        q.run(job)
+
+
+def test_server_background_loop():
+    """background_loop="server" schedules async tasks onto the app's own loop."""
+    api = responder.API(
+        allowed_hosts=[";"], session_https_only=False, background_loop="server"
+    )
+    seen = {}
+
+    async def job():
+        return asyncio.get_running_loop()
+
+    @api.route("/")
+    async def index(req, resp):
+        seen["handler"] = asyncio.get_running_loop()
+        seen["task"] = await asyncio.wrap_future(api.background.run(job))
+        resp.text = "ok"
+
+    with api.requests as client:
+        assert client.get("/").text == "ok"
+    assert seen["task"] is seen["handler"]
+
+
+def test_server_background_loop_after_early_submit():
+    """Tasks submitted before startup finish on the private loop; later ones
+    move to the server's loop."""
+    api = responder.API(
+        allowed_hosts=[";"], session_https_only=False, background_loop="server"
+    )
+    release = threading.Event()
+    seen = {}
+
+    async def early():
+        await asyncio.to_thread(release.wait, 5)
+        return threading.current_thread().name
+
+    async def job():
+        return asyncio.get_running_loop()
+
+    @api.route("/")
+    async def index(req, resp):
+        seen["handler"] = asyncio.get_running_loop()
+        seen["task"] = await api.background.run(job)
+        resp.text = "ok"
+
+    pending = api.background.run(early)  # e.g. at import time
+    with api.requests as client:
+        assert client.get("/").text == "ok"
+        release.set()
+        assert pending.result(timeout=5) == "responder-background-loop"
+    assert seen["task"] is seen["handler"]
+
+
+def test_invalid_background_loop_rejected():
+    with pytest.raises(ValueError, match="background_loop"):
+        responder.API(background_loop="elsewhere")
@@ -0,0 +1,114 @@
+"""CPU-bound background tasks run in a process pool."""
+
+import os
+import pickle
+import time
+
+import pytest
+
+import responder
+from responder.background import BackgroundFuture, BackgroundQueue, BackgroundQueueFull
+
+_queue = BackgroundQueue(n=1, processes=1)
+
+
+def _square(x):
+    return x * x
+
+
+def _pid():
+    return os.getpid()
+
+
+def _fail():
+    raise ValueError("boom")
+
+
+@_queue.cpu_task
+def _cube(x):
+    return x**3
+
+
+@pytest.fixture
+def queue():
+    q = BackgroundQueue(n=1, processes=1)
+    yield q
+    q.shutdown()
+
+
+def test_run_in_process(queue):
+    assert queue.run(_pid, executor="process").result(timeout=30) != os.getpid()
+    assert queue.run(_square, 7, executor="process").result(timeout=30) == 49
+
+
+def test_process_task_exception_propagates(queue):
+    future = queue.run(_fail, executor="process")
+    with pytest.raises(ValueError, match="boom"):
+        future.result(timeout=30)
+    assert queue.stats()["failed"] == 1
+
+
+def test_unpicklable_task_rejected_at_submit(queue):
+    with pytest.raises(TypeError, match="picklable"):
+        queue.run(lambda: 1, executor="process")
+    assert queue.stats()["pending"] == 0
+
+
+def test_unpicklable_argument_fails_the_future(queue):
+    future = queue.run(_square, lambda: 1, executor="process")
+    with pytest.raises((pickle.PicklingError, AttributeError), match="pickle"):
+        future.result(timeout=30)
+    assert queue.run(_square, 3, executor="process").result(timeout=30) == 9
+    assert queue.stats()["pending"] == 0
+
+
+def test_process_tasks_wait_for_a_free_worker():
+    """Tasks beyond the worker count stay pending, so max_pending bounds them
+    and their queue time is measured."""
+    queue = BackgroundQueue(n=1, processes=1, max_pending=1, on_full="raise")
+    first = queue.run(time.sleep, 0.5, executor="process")
+    second = queue.run(_square, 3, executor="process")
+    assert queue.stats()["pending"] == 1
+    with pytest.raises(BackgroundQueueFull):
+        queue.run(_square, 4, executor="process")
+    assert second.result(timeout=30) == 9
+    assert first.done()
+    assert second.timing.queue_time > 0.1
+    queue.shutdown()
+
+
+def test_unknown_executor_rejected(queue):
+    with pytest.raises(ValueError, match="executor"):
+        queue.run(_square, 2, executor="gpu")
+
+
+def test_process_pool_is_lazy(queue):
+    queue.run(_square, 2).result(timeout=5)
+    assert queue._process_pool is None
+
+
+def test_cpu_task_decorator():
+    try:
+        future = _cube(3)
+        assert isinstance(future, BackgroundFuture)
+        assert future.result(timeout=30) == 27
+    finally:
+        _queue.shutdown()
+
+
+def test_cpu_task_awaitable_in_handler():
+    api = responder.API(
+        allowed_hosts=[";"],
+        session_https_only=False,
+        background=BackgroundQueue(n=1, processes=1),
+    )
+
+    @api.route("/square/{n:int}")
+    async def square(req, resp, *, n):
+        resp.media = {"result": await api.background.run(_square, n, executor="process")}
+
+    with api.requests as client:
+        assert client.get("/square/12").json() == {"result": 144}
+    # The shutdown handler closed the process pool along with the threads.
+    with pytest.raises(RuntimeError):
+        api.background.run(_square, 2, executor="process")
@@ -0,0 +1,269 @@
+"""BackgroundQueue backpressure, priorities, accounting, and batching."""
+
+import asyncio
+import threading
+
+import pytest
+
+import responder
+from responder.background import BackgroundQueue, BackgroundQueueFull
+
+
+def _occupy(queue):
+    """Submit a task that holds the queue's single worker until released."""
+    started, release = threading.Event(), threading.Event()
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    future = queue.run(blocker)
+    assert started.wait(5)
+    return future, release
+
+
+def test_priority_order():
+    queue = BackgroundQueue(n=1)
+    blocker, release = _occupy(queue)
+    order = []
+    futures = [
+        queue.submit(order.append, ("low",), priority="low"),
+        queue.submit(order.append, ("normal",)),
+        queue.submit(order.append, ("high",), priority="high"),
+    ]
+    release.set()
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ["high", "normal", "low"]
+    queue.shutdown()
+
+
+def test_async_priority_order():
+    queue = BackgroundQueue(async_concurrency=1)
+    gate = threading.Event()
+    order = []
+
+    async def hold():
+        await asyncio.get_running_loop().run_in_executor(None, gate.wait, 5)
+
+    async def record(name):
+        order.append(name)
+
+    first = queue.run(hold)
+    futures = [
+        queue.submit(record, ("low",), priority="low"),
+        queue.submit(record, ("high",), priority="high"),
+    ]
+    gate.set()
+    first.result(timeout=5)
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ["high", "low"]
+    queue.shutdown()
+
+
+def test_unknown_priority_rejected():
+    queue = BackgroundQueue(n=1)
+    with pytest.raises(ValueError, match="Unknown priority"):
+        queue.submit(print, priority="urgent")
+    queue.shutdown()
+
+
+def test_task_decorator_with_priority():
+    queue = BackgroundQueue(n=1)
+
+    @queue.task(priority="high")
+    def double(x):
+        return x * 2
+
+    assert double(4).result(timeout=5) == 8
+    queue.shutdown()
+
+
+def test_on_full_raise():
+    queue = BackgroundQueue(n=1, max_pending=1, on_full="raise")
+    blocker, release = _occupy(queue)
+    queue.run(lambda: None)
+    with pytest.raises(BackgroundQueueFull):
+        queue.run(lambda: None)
+    release.set()
+    queue.shutdown()
+
+
+def test_on_full_drop():
+    queue = BackgroundQueue(n=1, max_pending=1, on_full="drop")
+    blocker, release = _occupy(queue)
+    kept = queue.run(lambda: "kept")
+    dropped = queue.run(lambda: "dropped")
+    assert dropped.cancelled()
+    release.set()
+    assert kept.result(timeout=5) == "kept"
+    queue.shutdown()
+    assert queue.stats()["dropped"] == 1
+
+
+def test_on_full_block_waits_for_a_slot():
+    queue = BackgroundQueue(n=1, max_pending=1)
+    blocker, release = _occupy(queue)
+    queue.run(lambda: None)
+    submitted = threading.Event()
+
+    def producer():
+        queue.run(lambda: None)
+        submitted.set()
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    assert not submitted.wait(0.1)
+    release.set()
+    assert submitted.wait(5)
+    thread.join()
+    queue.shutdown()
+
+
+def test_on_full_block_never_blocks_the_event_loop():
+    """An async handler past max_pending gets BackgroundQueueFull instead of
+    freezing (or, with tasks on the same loop, deadlocking) the server."""
+    api = responder.API(
+        allowed_hosts=[";"],
+        session_https_only=False,
+        background=BackgroundQueue(n=1, max_pending=1, on_full="block"),
+    )
+    blocker, release = _occupy(api.background)
+
+    @api.route("/")
+    async def index(req, resp):
+        api.background.run(lambda: None)
+        try:
+            api.background.run(lambda: None)
+        except BackgroundQueueFull:
+            resp.status_code = 503
+
+    assert api.requests.get("/").status_code == 503
+    release.set()
+    api.background.shutdown()
+
+
+def test_invalid_on_full_rejected():
+    with pytest.raises(ValueError, match="on_full"):
+        BackgroundQueue(on_full="spill")
+
+
+def test_stats_and_timing():
+    queue = BackgroundQueue(n=2)
+
+    def boom():
+        raise ValueError("boom")
+
+    ok = queue.run(lambda: 1)
+    failed = queue.run(boom)
+    assert ok.result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        failed.result(timeout=5)
+    queue.shutdown()
+
+    stats = queue.stats()
+    assert stats["pending"] == stats["running"] == 0
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert ok.timing.queue_time >= 0
+    assert ok.timing.run_time >= 0
+    assert not queue.results
+
+
+def test_cancelled_before_start_releases_slot():
+    queue = BackgroundQueue(n=1, max_pending=1, on_full="raise")
+    blocker, release = _occupy(queue)
+    waiting = queue.run(lambda: None)
+    assert waiting.cancel()
+    assert queue.stats()["pending"] == 0
+    queue.run(lambda: None)
+    release.set()
+    queue.shutdown()
+
+
+def test_background_metrics_exported():
+    api = responder.API(
+        metrics_route="/metrics",
+        background=BackgroundQueue(n=1),
+        allowed_hosts=[";"],
+    )
+    api.background.run(lambda: None).result(timeout=5)
+
+    body = api.requests.get("/metrics").text
+    assert 'responder_background_tasks{state="pending"} 0' in body
+    assert 'responder_background_tasks_total{outcome="completed"} 1' in body
+    assert "responder_background_queue_seconds_count 1" in body
+
+
+def test_batch_flushes_at_max_size():
+    queue = BackgroundQueue(n=1)
+    batches = []
+
+    @queue.batch(max_size=3, max_delay=60)
+    def record(items):
+        batches.append(items)
+        return len(items)
+
+    futures = [record(i) for i in range(3)]
+    assert [f.result(timeout=5) for f in futures] == [3, 3, 3]
+    assert batches == [[0, 1, 2]]
+    queue.shutdown()
+
+
+def test_batch_flushes_after_max_delay():
+    queue = BackgroundQueue(n=1)
+    batches = []
+
+    @queue.batch(max_size=100, max_delay=0.05)
+    def record(items):
+        batches.append(items)
+
+    futures = [record("a"), record("b")]
+    for future in futures:
+        future.result(timeout=5)
+    assert batches == [["a", "b"]]
+    queue.shutdown()
+
+
+def test_batch_flushed_at_shutdown():
+    queue = BackgroundQueue(n=1)
+    batches = []
+
+    @queue.batch(max_size=100, max_delay=60)
+    def record(items):
+        batches.append(items)
+
+    future = record("x")
+    queue.shutdown()
+    assert future.done()
+    assert batches == [["x"]]
+    with pytest.raises(RuntimeError):
+        record("y")
+
+
+def test_batch_exception_reaches_every_call(capsys):
+    queue = BackgroundQueue(n=1)
+
+    @queue.batch(max_size=2)
+    def record(items):
+        raise ValueError("insert failed")
+
+    futures = [record(1), record(2)]
+    for future in futures:
+        with pytest.raises(ValueError, match="insert failed"):
+            future.result(timeout=5)
+    queue.shutdown()
+
+
+def test_async_batch():
+    queue = BackgroundQueue(n=1)
+
+    @queue.batch(max_size=2)
+    async def record(items):
+        await asyncio.sleep(0)
+        return sum(items)
+
+    futures = [record(1), record(2)]
+    assert [f.result(timeout=5) for f in futures] == [3, 3]
+    queue.shutdown()
@@ -318,3 +318,40 @@ def test_cli_client_invalid_language_exits(monkeypatch, tmp_path):
     with pytest.raises(SystemExit) as exc:
         cli()
     assert exc.value.code == 1
+
+
+def test_cli_openapi_export(monkeypatch, capsys, tmp_path):
+    """`responder openapi` writes the schema as JSON or YAML."""
+    app = _client_app(tmp_path)
+    out_file = tmp_path / "spec" / "openapi.json"
+    monkeypatch.setattr(
+        "sys.argv", ["responder", "openapi", "-o", str(out_file), f"{app}:api"]
+    )
+    from responder.ext.cli import cli
+
+    cli()
+    spec = json.loads(out_file.read_text())
+    assert spec["info"] == {"title": "T", "version": "1"}
+    assert "/ping" in spec["paths"]
+
+    monkeypatch.setattr("sys.argv", ["responder", "openapi", f"{app}:api"])
+    cli()
+    out = capsys.readouterr().out
+    assert out.startswith("info:\n")
+    assert "\n  /ping:\n" in out
+
+
+def test_cli_client_from_spec_file(monkeypatch, capsys, tmp_path):
+    """A spec file target generates a client without importing the app."""
+    app = _client_app(tmp_path)
+    spec_file = tmp_path / "openapi.yaml"
+    monkeypatch.setattr(
+        "sys.argv", ["responder", "openapi", "-o", str(spec_file), f"{app}:api"]
+    )
+    from responder.ext.cli import cli
+
+    cli()
+    app.unlink()
+    monkeypatch.setattr("sys.argv", ["responder", "client", str(spec_file)])
+    cli()
+    assert "def get_ping" in capsys.readouterr().out
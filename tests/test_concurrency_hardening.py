@@ -138,3 +138,41 @@ def test_templates_share_globals_across_envs(tmp_path):
         return await templates.render_async("t.html")
 
     assert asyncio.run(render_it()) == "global"
+
+
+def test_metrics_shards_merge_across_threads():
+    collector = MetricsCollector(buckets=(0.1, 1.0))
+    threads = [
+        threading.Thread(target=collector.record, args=("GET", "/z", 200, d))
+        for d in (0.05, 0.5, 5.0)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    body = collector.render()
+    assert 'path="/z",le="0.1"} 1' in body
+    assert 'path="/z",le="1.0"} 2' in body
+    assert 'path="/z",le="+Inf"} 3' in body
+    assert collector.latency_count[("GET", "/z")] == 3
+
+
+def test_metrics_per_route_buckets():
+    collector = MetricsCollector(route_buckets={"/upload": (1, 10, 60)})
+    collector.record("POST", "/upload", 201, 5.0)
+    collector.record("GET", "/", 200, 0.001)
+    body = collector.render()
+    assert 'path="/upload",le="10"} 1' in body
+    assert 'path="/",le="0.005"} 1' in body
+
+
+def test_metrics_render_cached_until_new_data():
+    collector = MetricsCollector()
+    collector.record("GET", "/", 200, 0.01)
+    first = collector.render()
+    assert collector._cache is not None
+    cached = collector._cache[1]
+    assert collector.render() == first
+    assert collector._cache[1] is cached
+    collector.record("GET", "/", 200, 0.01)
+    assert 'status="200"} 2' in collector.render()
@@ -0,0 +1,110 @@
+"""Sync callables marked ``inline`` run on the event loop, skipping the thread hop."""
+
+import asyncio
+import logging
+import time
+
+import responder
+from responder import inline
+
+
+def _on_loop():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def test_inline_route_runs_on_event_loop(api):
+    @api.route("/fast", inline=True)
+    def fast(req, resp):
+        resp.media = {"on_loop": _on_loop()}
+
+    @api.route("/default")
+    def default(req, resp):
+        resp.media = {"on_loop": _on_loop()}
+
+    assert api.requests.get("/fast").json() == {"on_loop": True}
+    assert api.requests.get("/default").json() == {"on_loop": False}
+
+
+def test_inline_class_based_view(api):
+    @api.route("/cbv", inline=True)
+    class View:
+        def on_get(self, req, resp):
+            resp.media = {"on_loop": _on_loop()}
+
+    assert api.requests.get("/cbv").json() == {"on_loop": True}
+
+
+def test_inline_hooks(api):
+    seen = {}
+
+    @api.before_request()
+    @inline
+    def before(req, resp):
+        seen["before"] = _on_loop()
+
+    @api.after_request
+    @inline
+    def after(req, resp):
+        seen["after"] = _on_loop()
+        resp.headers["X-After"] = "1"
+
+    @api.route("/")
+    async def index(req, resp):
+        resp.text = "ok"
+
+    r = api.requests.get("/")
+    assert r.headers["X-After"] == "1"
+    assert seen == {"before": True, "after": True}
+
+
+def test_inline_dependency_provider(api):
+    @api.dependency()
+    @inline
+    def settings():
+        return {"on_loop": _on_loop()}
+
+    @api.route("/")
+    def index(req, resp, *, settings):
+        resp.media = settings
+
+    assert api.requests.get("/").json() == {"on_loop": True}
+
+
+def test_inline_on_async_callable_is_noop():
+    async def handler(req, resp):
+        pass
+
+    assert inline(handler) is handler
+
+
+def test_inline_slow_callable_warns_in_debug(caplog):
+    api = responder.API(
+        debug=True,
+        allowed_hosts=[";"],
+        session_https_only=False,
+        inline_warn_threshold=0.001,
+    )
+
+    @api.route("/slow", inline=True)
+    def slow(req, resp):
+        time.sleep(0.01)
+        resp.text = "done"
+
+    with caplog.at_level(logging.WARNING, logger="responder"):
+        assert api.requests.get("/slow").text == "done"
+    assert any("blocked the event loop" in r.message for r in caplog.records)
+
+
+def test_inline_not_timed_outside_debug(api, caplog):
+    @api.route("/slow", inline=True)
+    def slow(req, resp):
+        time.sleep(0.01)
+        resp.text = "done"
+
+    with caplog.at_level(logging.WARNING, logger="responder"):
+        api.requests.get("/slow")
+    assert not any("blocked the event loop" in r.message for r in caplog.records)
@@ -0,0 +1,239 @@
+"""Durable job queue: persistence, batching, leases, retries, dead letters."""
+
+import asyncio
+import time
+
+import pytest
+
+import responder
+from responder.ext.jobs import (
+    Job,
+    JobQueue,
+    JobStorage,
+    MemoryJobStorage,
+    SQLiteJobStorage,
+)
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def _api():
+    return responder.API(allowed_hosts=[";"], session_https_only=False)
+
+
+def _app(storage, **options):
+    """An app running a JobQueue, with a route that enqueues jobs."""
+    api = _api()
+    jobs = JobQueue(storage, poll_interval=0.01, **options)
+    jobs.install(api)
+
+    @api.route("/enqueue", methods=["POST"])
+    async def enqueue(req, resp):
+        body = await req.media()
+        await asyncio.gather(
+            *(jobs.enqueue(body["job"]) for _ in range(body.get("count", 1)))
+        )
+
+    return api, jobs
+
+
+@pytest.fixture(params=["sqlite", "memory"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        return MemoryJobStorage()
+    return SQLiteJobStorage(str(tmp_path / "jobs.db"))
+
+
+def test_storages_implement_protocol(storage):
+    assert isinstance(storage, JobStorage)
+
+
+def test_job_runs_inside_lifespan(storage):
+    api = _api()
+    jobs = JobQueue(storage, poll_interval=0.01)
+    jobs.install(api)
+    done = []
+
+    @jobs.job
+    async def send_receipt(order_id, *, currency):
+        done.append((order_id, currency))
+
+    @api.route("/orders", methods=["POST"])
+    async def create(req, resp):
+        resp.media = {"job": await send_receipt.enqueue(7, currency="EUR")}
+
+    with api.requests as client:
+        assert client.post("/orders").json()["job"]
+        _wait_for(lambda: done)
+    assert done == [(7, "EUR")]
+    assert storage.counts() == {"queued": 0, "leased": 0, "dead": 0}
+
+
+def test_sync_handler(storage):
+    api, jobs = _app(storage)
+    done = []
+
+    @jobs.job(name="thumbnail")
+    def make_thumbnail():
+        done.append(1)
+
+    with api.requests as client:
+        client.post("/enqueue", json={"job": "thumbnail"})
+        _wait_for(lambda: done)
+
+
+def test_jobs_survive_restart(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    first = JobQueue(path)
+
+    @first.job(name="work")
+    def work(n):
+        pass
+
+    asyncio.run(first.enqueue(work, [1]))
+    asyncio.run(first.stop())
+
+    api = _api()
+    second = JobQueue(path, poll_interval=0.01)
+    second.install(api)
+    done = []
+
+    @second.job(name="work")
+    def work_again(n):
+        done.append(n)
+
+    with api.requests:
+        _wait_for(lambda: done)
+    assert done == [1]
+
+
+def test_concurrent_enqueues_share_one_write(tmp_path):
+    storage = SQLiteJobStorage(str(tmp_path / "jobs.db"))
+    writes = []
+    original = storage.write
+
+    def counting_write(added, completed):
+        writes.append(len(added))
+        original(added, completed)
+
+    storage.write = counting_write
+    jobs = JobQueue(storage)
+
+    async def main():
+        await asyncio.gather(*(jobs.enqueue("noop", [i]) for i in range(50)))
+        await jobs.stop()
+
+    asyncio.run(main())
+    assert writes == [50]
+    assert storage.counts()["queued"] == 50
+
+
+def test_retry_with_backoff_then_success(storage):
+    api, jobs = _app(storage, backoff=0.01)
+    attempts = []
+
+    @jobs.job(name="flaky")
+    async def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise ConnectionError("try again")
+
+    with api.requests as client:
+        client.post("/enqueue", json={"job": "flaky"})
+        _wait_for(lambda: len(attempts) == 3)
+    assert attempts[2] - attempts[1] >= attempts[1] - attempts[0]
+    assert storage.counts() == {"queued": 0, "leased": 0, "dead": 0}
+
+
+def test_dead_letter_after_max_attempts(storage):
+    api, jobs = _app(storage, backoff=0.01, max_attempts=2)
+
+    @jobs.job(name="broken")
+    def broken():
+        raise ValueError("bad input")
+
+    with api.requests as client:
+        client.post("/enqueue", json={"job": "broken"})
+        _wait_for(lambda: storage.counts()["dead"] == 1)
+    (dead,) = storage.dead_letters()
+    assert dead.name == "broken"
+    assert dead.attempts == 2
+    assert "ValueError: bad input" in dead.last_error
+
+
+def test_unknown_job_is_dead_lettered(storage):
+    api, jobs = _app(storage)
+
+    with api.requests as client:
+        client.post("/enqueue", json={"job": "nobody.handles.this"})
+        _wait_for(lambda: storage.counts()["dead"] == 1)
+
+
+def test_expired_lease_is_reclaimed(storage):
+    storage.write([Job("j1", "work")], [])
+    now = time.time()
+    (first,) = storage.claim(now, 10, lease=5)
+    assert first.attempts == 1
+    assert storage.claim(now + 1, 10, lease=5) == []
+    (again,) = storage.claim(now + 6, 10, lease=5)
+    assert again.attempts == 2
+
+
+def test_concurrency_limit(storage):
+    api, jobs = _app(storage, concurrency=2)
+    running, peak, finished = [0], [0], []
+
+    @jobs.job(name="slow")
+    async def slow():
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.02)
+        running[0] -= 1
+        finished.append(1)
+
+    with api.requests as client:
+        client.post("/enqueue", json={"job": "slow", "count": 6})
+        _wait_for(lambda: len(finished) == 6)
+    assert peak[0] == 2
+
+
+def test_worker_survives_a_failed_lease_renewal():
+    class FlakyStorage(MemoryJobStorage):
+        failures = 0
+
+        def extend(self, job_ids, until):
+            if not self.failures:
+                self.failures += 1
+                raise RuntimeError("database is locked")
+            super().extend(job_ids, until)
+
+    storage = FlakyStorage()
+    api, jobs = _app(storage, lease=0.3)
+    done = []
+
+    @jobs.job(name="slow")
+    async def slow():
+        await asyncio.sleep(0.25)  # outlives a renewal interval
+        done.append("slow")
+
+    @jobs.job(name="quick")
+    async def quick():
+        done.append("quick")
+
+    with api.requests as client:
+        client.post("/enqueue", json={"job": "slow"})
+        _wait_for(lambda: storage.failures)
+        client.post("/enqueue", json={"job": "quick"})
+        _wait_for(lambda: len(done) == 2)
+    assert sorted(done) == ["quick", "slow"]
+
+
+def test_unserializable_arguments_rejected():
+    jobs = JobQueue(MemoryJobStorage())
+    with pytest.raises(TypeError):
+        asyncio.run(jobs.enqueue("work", [object()]))
@@ -0,0 +1,219 @@
+"""JWTAuth: local JWT verification with parsed-once keys and cached JWKS."""
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+import responder
+from responder.ext import auth as auth_module
+from responder.ext.auth import JWTAuth
+
+SECRET = b"s3cret-s3cret-s3cret-s3cret-s3cret"
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _segments(claims, alg, kid=None):
+    header = {"alg": alg, "typ": "JWT"}
+    if kid is not None:
+        header["kid"] = kid
+    return _b64(json.dumps(header).encode()) + "." + _b64(json.dumps(claims).encode())
+
+
+def hs256(claims, key=SECRET, kid=None):
+    signing_input = _segments(claims, "HS256", kid)
+    signature = hmac.digest(key, signing_input.encode(), hashlib.sha256)
+    return f"{signing_input}.{_b64(signature)}"
+
+
+def claims(**extra):
+    return {"sub": "alice", "exp": time.time() + 600, **extra}
+
+
+def _api(auth):
+    api = responder.API(allowed_hosts=[";"])
+
+    @api.route("/me", auth=auth)
+    def me(req, resp, *, user):
+        resp.media = {"sub": user["sub"]}
+
+    return api
+
+
+def _get(api, token, path="/me"):
+    return api.requests.get(path, headers={"Authorization": f"Bearer {token}"})
+
+
+def test_hmac_token_is_verified_and_claims_injected():
+    api = _api(JWTAuth(SECRET))
+    response = _get(api, hs256(claims()))
+    assert response.status_code == 200
+    assert response.json() == {"sub": "alice"}
+
+    assert _get(api, hs256(claims(), key=b"wrong")).status_code == 401
+    assert _get(api, "not.a.jwt").status_code == 401
+    unsigned = _segments(claims(), "none") + "."
+    assert _get(api, unsigned).status_code == 401
+
+
+@pytest.mark.parametrize(
+    ("overrides", "ok"),
+    [
+        ({"exp": time.time() - 1}, False),
+        ({"nbf": time.time() + 60}, False),
+        ({"iss": "https://other"}, False),
+        ({"aud": "other"}, False),
+        ({"aud": ["other", "api"]}, True),
+        ({"exp": "tomorrow"}, False),
+    ],
+)
+def test_standard_claims(overrides, ok):
+    auth = JWTAuth(SECRET, issuer="https://id", audience="api", cache_ttl=None)
+    token = hs256({**claims(iss="https://id", aud="api"), **overrides})
+    assert (_get(_api(auth), token).status_code == 200) is ok
+
+
+def test_required_claims_and_unexpected_audience():
+    auth = JWTAuth(SECRET, cache_ttl=None)
+    api = _api(auth)
+    assert _get(api, hs256({"sub": "alice"})).status_code == 401  # no exp
+    assert _get(api, hs256(claims(aud="api"))).status_code == 401
+    lenient = _api(JWTAuth(SECRET, require=(), cache_ttl=None))
+    assert _get(lenient, hs256({"sub": "alice"})).status_code == 200
+
+
+def test_cached_token_skips_verification_but_still_expires(monkeypatch):
+    calls = []
+    auth = JWTAuth(SECRET, verify=lambda c: calls.append(c) or c)
+    api = _api(auth)
+    token = hs256(claims(exp=time.time() + 30))
+    assert [_get(api, token).status_code for _ in range(3)] == [200, 200, 200]
+    assert len(calls) == 1
+
+    later = time.time() + 31
+    monkeypatch.setattr(auth_module.time, "time", lambda: later)
+    assert _get(api, token).status_code == 401
+
+
+def test_scopes_come_from_claims():
+    auth = JWTAuth(SECRET)
+    api = responder.API(allowed_hosts=[";"])
+
+    @api.route("/admin", auth=auth.requires("admin"))
+    def admin(req, resp, *, user):
+        resp.text = "ok"
+
+    assert _get(api, hs256(claims(scope="read admin")), "/admin").status_code == 200
+    assert _get(api, hs256(claims(scp=["read"])), "/admin").status_code == 403
+
+
+def test_header_is_decoded_once_per_segment():
+    auth = JWTAuth({"k1": SECRET, "k2": b"other-secret"}, cache_ttl=None)
+    api = _api(auth)
+    assert _get(api, hs256(claims(), kid="k1")).status_code == 200
+    assert _get(api, hs256(claims(sub="bob"), kid="k1")).status_code == 200
+    assert _get(api, hs256(claims(), key=b"other-secret", kid="k2")).status_code == 200
+    assert _get(api, hs256(claims(), kid="k2")).status_code == 401
+    assert sorted(kid for _, kid in auth._keys._headers.values()) == ["k1", "k2"]
+
+
+def _jwks(*keys):
+    return {"keys": [{"kty": "oct", "kid": kid, "k": _b64(k)} for kid, k in keys]}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_jwks_file_is_cached_and_refreshed(tmp_path, clock):
+    path = tmp_path / "jwks.json"
+    path.write_text(json.dumps(_jwks(("old", SECRET))))
+    auth = JWTAuth(jwks=path, jwks_refresh=300, cache_ttl=None)
+    api = _api(auth)
+    assert _get(api, hs256(claims(), kid="old")).status_code == 200
+
+    # Rotation: an unknown kid reloads the document, at most every 30s.
+    path.write_text(json.dumps(_jwks(("new", b"rotated"))))
+    new_token = hs256(claims(), key=b"rotated", kid="new")
+    assert _get(api, new_token).status_code == 401
+    clock[0] += 30
+    assert _get(api, new_token).status_code == 200
+
+    # A document that fails to load keeps the keys already known.
+    path.write_text("{not json")
+    clock[0] += 300
+    assert _get(api, new_token).status_code == 200
+
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError, match="exactly one"):
+        JWTAuth()
+    with pytest.raises(ValueError, match="exactly one"):
+        JWTAuth(SECRET, jwks={"keys": []})
+    with pytest.raises(ValueError, match="algorithms"):
+        JWTAuth(SECRET, algorithms=["none"])
+    assert JWTAuth(SECRET) == JWTAuth(SECRET)
+    assert JWTAuth(SECRET).security_scheme() == {
+        "type": "http",
+        "scheme": "bearer",
+        "bearerFormat": "JWT",
+    }
+
+
+def test_asymmetric_keys():
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import hashes, serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+    from cryptography.hazmat.primitives.asymmetric.utils import (
+        decode_dss_signature,
+    )
+
+    rsa_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    ec_key = ec.generate_private_key(ec.SECP256R1())
+
+    def rs256(payload, kid):
+        signing_input = _segments(payload, "RS256", kid)
+        signature = rsa_key.sign(
+            signing_input.encode(), padding.PKCS1v15(), hashes.SHA256()
+        )
+        return f"{signing_input}.{_b64(signature)}"
+
+    def es256(payload, kid):
+        signing_input = _segments(payload, "ES256", kid)
+        der = ec_key.sign(signing_input.encode(), ec.ECDSA(hashes.SHA256()))
+        r, s = decode_dss_signature(der)
+        signature = r.to_bytes(32, "big") + s.to_bytes(32, "big")
+        return f"{signing_input}.{_b64(signature)}"
+
+    pem = rsa_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    numbers = ec_key.public_key().public_numbers()
+    auth = JWTAuth(
+        {
+            "rsa": pem,
+            "ec": {
+                "kty": "EC",
+                "crv": "P-256",
+                "x": _b64(numbers.x.to_bytes(32, "big")),
+                "y": _b64(numbers.y.to_bytes(32, "big")),
+            },
+        },
+        cache_ttl=None,
+    )
+    api = _api(auth)
+    assert _get(api, rs256(claims(), "rsa")).status_code == 200
+    assert _get(api, es256(claims(), "ec")).status_code == 200
+    assert _get(api, es256(claims(), "rsa")).status_code == 401
+    # The RSA public key is no HMAC secret (algorithm confusion).
+    forged = hs256(claims(), key=pem, kid="rsa")
+    assert _get(api, forged).status_code == 401
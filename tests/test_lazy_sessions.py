@@ -0,0 +1,183 @@
+"""Lazy session loading and copy-on-write change tracking."""
+
+import json
+from base64 import b64encode
+
+import itsdangerous
+
+import responder
+from responder.ext import sessions
+from responder.ext.sessions import (
+    CookieSessionMiddleware,
+    LazySession,
+    MemorySessionBackend,
+)
+
+SECRET = "x" * 32
+
+
+class CountingBackend(MemorySessionBackend):
+    def __init__(self):
+        super().__init__()
+        self.sets = 0
+        self.touches = 0
+
+    def set(self, session_id, data, max_age):
+        self.sets += 1
+        super().set(session_id, data, max_age)
+
+    def touch(self, session_id, max_age):
+        self.touches += 1
+        super().touch(session_id, max_age)
+
+
+def _routes(api):
+    @api.route("/login", methods=["POST"])
+    def login(req, resp):
+        req.session["user"] = "kenneth"
+        req.session["cart"] = [1]
+        resp.text = "ok"
+
+    @api.route("/add", methods=["POST"])
+    def add(req, resp):
+        req.session["cart"].append(2)  # in place, no re-assignment
+        resp.text = "ok"
+
+    @api.route("/cart")
+    def cart(req, resp):
+        resp.media = {"user": req.session.get("user"), "cart": req.session["cart"]}
+
+    @api.route("/static")
+    def static(req, resp):
+        resp.text = "no session here"
+
+    return api
+
+
+def test_cookie_session_is_decoded_only_when_used(monkeypatch):
+    api = _routes(
+        responder.API(allowed_hosts=[";"], secret_key=SECRET, session_https_only=False)
+    )
+    decoded = []
+    decode = CookieSessionMiddleware._decode
+    monkeypatch.setattr(
+        CookieSessionMiddleware,
+        "_decode",
+        lambda self, scope: decoded.append(1) or decode(self, scope),
+    )
+    client = api.requests
+    client.post("/login")
+    decoded.clear()
+
+    response = client.get("/static")
+    assert decoded == []
+    assert "set-cookie" not in response.headers
+    assert "vary" not in response.headers
+
+    response = client.get("/cart")
+    assert response.json() == {"user": "kenneth", "cart": [1]}
+    assert decoded == [1]
+    assert "set-cookie" not in response.headers  # read-only and fresh: kept
+    assert "Cookie" in response.headers["vary"]
+
+    client.post("/add")
+    assert client.get("/cart").json()["cart"] == [1, 2]
+
+
+def test_cookie_format_matches_starlette():
+    api = responder.API(allowed_hosts=[";"], secret_key=SECRET, session_https_only=False)
+
+    @api.route("/")
+    def index(req, resp):
+        resp.media = dict(req.session)
+
+    signer = itsdangerous.TimestampSigner(SECRET)
+    value = signer.sign(b64encode(json.dumps({"user": "kenneth"}).encode())).decode()
+    client = api.requests
+    client.cookies.set("session", value)
+    assert client.get("/").json() == {"user": "kenneth"}
+
+    client.cookies.set("session", value[:-2] + "xx")
+    assert client.get("/").json() == {}
+
+
+def test_cookie_session_signature_slides_when_used():
+    api = _routes(
+        responder.API(allowed_hosts=[";"], secret_key=SECRET, session_https_only=False)
+    )
+
+    class EightDaysAgo(itsdangerous.TimestampSigner):
+        def get_timestamp(self):
+            return super().get_timestamp() - 8 * 24 * 3600
+
+    data = b64encode(json.dumps({"user": "kenneth", "cart": [1]}).encode())
+    client = api.requests
+    client.cookies.set("session", EightDaysAgo(SECRET).sign(data).decode())
+
+    assert "set-cookie" not in client.get("/static").headers  # not used: not read
+    response = client.get("/cart")
+    assert response.json() == {"user": "kenneth", "cart": [1]}
+    assert "Max-Age=1209600" in response.headers["set-cookie"]  # past half of 14 days
+    assert "set-cookie" not in client.get("/cart").headers  # fresh again
+
+
+def test_server_session_tracks_changes_without_deep_copies(monkeypatch):
+    backend = CountingBackend()
+    api = _routes(
+        responder.API(
+            allowed_hosts=[";"], session_backend=backend, session_https_only=False
+        )
+    )
+    copies = []
+    deepcopy = sessions.copy.deepcopy
+    monkeypatch.setattr(
+        sessions.copy, "deepcopy", lambda value: copies.append(value) or deepcopy(value)
+    )
+    client = api.requests
+    client.post("/login")
+    assert backend.sets == 1
+
+    client.get("/static")
+    assert copies == []
+    assert (backend.sets, backend.touches) == (1, 1)
+
+    assert client.get("/cart").json() == {"user": "kenneth", "cart": [1]}
+    assert copies == [[1]]  # only the list that was handed out
+    assert (backend.sets, backend.touches) == (1, 2)
+
+    # An in-place edit is detected, and the stored record was not aliased.
+    (stored,) = [data for data, _ in backend._store.values()]
+    client.post("/add")
+    assert stored["cart"] == [1]
+    assert backend.sets == 2
+    assert client.get("/cart").json()["cart"] == [1, 2]
+
+
+def test_lazy_session_semantics():
+    loads = []
+    record = {"user": "kenneth", "prefs": {"theme": "dark"}}
+
+    def loader():
+        loads.append(1)
+        return record
+
+    session = LazySession(loader)
+    assert loads == []
+    assert session["user"] == "kenneth"
+    assert session.get("prefs") == {"theme": "dark"}
+    assert loads == [1]
+    assert not session.dirty
+
+    session["prefs"]["theme"] = "light"
+    assert session.dirty
+    assert record["prefs"] == {"theme": "dark"}
+
+    # Writes to an unloaded session apply on top of the stored record.
+    session = LazySession(lambda: {"a": 1})
+    session.update(b=2)
+    assert dict(session) == {"a": 1, "b": 2}
+    assert session.stored
+
+    empty = LazySession(lambda: None)
+    assert not empty
+    assert not empty.stored
@@ -0,0 +1,93 @@
+"""Multi-process metrics: workers share counts through files in one directory."""
+
+import multiprocessing
+import os
+
+import pytest
+
+import responder
+from responder.ext.metrics import MetricsCollector, reset_metrics_dir
+
+
+def _worker(directory, count):
+    collector = MetricsCollector(multiprocess_dir=directory)
+    for _ in range(count):
+        collector.record("GET", "/work", 200, 0.02)
+
+
+def _run_worker(directory, count, method="spawn"):
+    process = multiprocessing.get_context(method).Process(
+        target=_worker, args=(str(directory), count)
+    )
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+
+
+def test_collectors_sharing_a_directory_render_totals(tmp_path):
+    first = MetricsCollector(multiprocess_dir=tmp_path)
+    second = MetricsCollector(multiprocess_dir=tmp_path)
+    first.record("GET", "/a", 200, 0.003)
+    second.record("GET", "/a", 200, 0.3)
+    second.record("GET", "/a", 500, 0.3)
+
+    for collector in (first, second):
+        body = collector.render()
+        assert 'path="/a",status="200"} 2' in body
+        assert 'path="/a",status="500"} 1' in body
+        assert 'path="/a",le="0.005"} 1' in body
+        assert 'path="/a",le="0.5"} 3' in body
+        assert 'path="/a",le="+Inf"} 3' in body
+        assert (
+            'responder_request_duration_seconds_sum{method="GET",path="/a"} 0.603' in body
+        )
+
+
+def test_exited_worker_counts_survive_and_files_are_compacted(tmp_path):
+    collector = MetricsCollector(multiprocess_dir=tmp_path)
+    collector.record("GET", "/work", 200, 0.02)
+    _run_worker(tmp_path, 3)
+    _run_worker(tmp_path, 4)
+
+    assert 'path="/work",status="200"} 8' in collector.render()
+    # The exited workers' files were folded into the archive.
+    names = sorted(p.name for p in tmp_path.glob("*.metrics"))
+    assert "archive.metrics" in names
+    assert len(names) == 2
+    # ...without double counting on later scrapes.
+    assert 'path="/work",status="200"} 8' in collector.render()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_forked_child_gets_its_own_files(tmp_path):
+    collector = MetricsCollector(multiprocess_dir=tmp_path)
+    collector.record("GET", "/work", 200, 0.02)
+    process = multiprocessing.get_context("fork").Process(
+        target=lambda: collector.record("GET", "/work", 200, 0.02)
+    )
+    process.start()
+    process.join(30)
+    assert 'path="/work",status="200"} 2' in collector.render()
+
+
+def test_reset_metrics_dir(tmp_path):
+    _run_worker(tmp_path, 1)
+    reset_metrics_dir(tmp_path)
+    assert not list(tmp_path.glob("*.metrics"))
+    assert "/work" not in MetricsCollector(multiprocess_dir=tmp_path).render()
+
+
+def test_api_metrics_dir(tmp_path):
+    api = responder.API(
+        metrics_route="/metrics", metrics_dir=str(tmp_path), allowed_hosts=[";"]
+    )
+
+    @api.route("/")
+    def index(req, resp):
+        resp.text = "ok"
+
+    api.requests.get("/")
+    _run_worker(tmp_path, 2)
+    body = api.requests.get("/metrics").text
+    assert 'path="/",status="200"} 1' in body
+    assert 'path="/work",status="200"} 2' in body
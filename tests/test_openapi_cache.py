@@ -0,0 +1,112 @@
+"""The OpenAPI document is built once, cached as bytes, and served with ETags."""
+
+import json
+
+import pytest
+import yaml
+from pydantic import BaseModel
+
+import responder
+
+
+def _api():
+    return responder.API(
+        title="T", version="1", openapi="3.0.2", docs_route="/docs", allowed_hosts=[";"]
+    )
+
+
+def test_document_is_built_once_and_rebuilt_on_registration(monkeypatch):
+    api = _api()
+
+    @api.get("/a")
+    def a(req, resp):
+        resp.media = {}
+
+    builds = []
+    build = api.openapi._build_apispec
+    monkeypatch.setattr(
+        api.openapi, "_build_apispec", lambda: builds.append(1) or build()
+    )
+    client = api.requests
+    for _ in range(3):
+        assert "/a" in yaml.safe_load(client.get("/schema.yml").content)["paths"]
+    client.get("/docs")
+    assert len(builds) == 1
+
+    @api.get("/b")
+    def b(req, resp):
+        resp.media = {}
+
+    assert "/b" in yaml.safe_load(client.get("/schema.yml").content)["paths"]
+    assert len(builds) == 2
+
+    @api.schema("Pet")
+    class Pet(BaseModel):
+        name: str
+
+    spec = yaml.safe_load(client.get("/schema.yml").content)
+    assert "Pet" in spec["components"]["schemas"]
+    assert len(builds) == 3
+
+    api.openapi.description = "Edited in place"
+    api.openapi.invalidate()
+    assert "Edited" in client.get("/schema.yml").text
+    assert len(builds) == 4
+
+
+def test_strong_etag_and_not_modified():
+    api = _api()
+
+    @api.get("/a")
+    def a(req, resp):
+        resp.media = {}
+
+    client = api.requests
+    as_yaml = client.get("/schema.yml")
+    as_json = client.get("/schema.yml", headers={"Accept": "application/json"})
+    assert as_yaml.headers["content-type"] == "application/yaml"
+    assert as_json.headers["content-type"] == "application/json"
+    assert json.loads(as_json.content) == yaml.safe_load(as_yaml.content)
+    assert "Accept" in as_yaml.headers["vary"]
+
+    etag = as_yaml.headers["etag"]
+    assert etag.startswith('"') and etag != as_json.headers["etag"]
+    again = client.get("/schema.yml", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+
+    @api.get("/b")
+    def b(req, resp):
+        resp.media = {}
+
+    changed = client.get("/schema.yml", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+    docs = client.get("/docs")
+    cached = client.get("/docs", headers={"If-None-Match": docs.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_prebuilt_openapi_file(tmp_path):
+    api = _api()
+
+    @api.get("/a")
+    def a(req, resp):
+        resp.media = {}
+
+    spec_file = tmp_path / "openapi.json"
+    spec_file.write_bytes(api.openapi.document().json)
+
+    served = responder.API(openapi_file=spec_file, allowed_hosts=[";"])
+
+    @served.get("/not-in-the-file")
+    def other(req, resp):
+        resp.media = {}
+
+    spec = yaml.safe_load(served.requests.get("/schema.yml").content)
+    assert list(spec["paths"]) == ["/a"]
+    assert (served.openapi.title, served.openapi.version) == ("T", "1")
+    assert served.generate_client().count("def get_a") == 1
+    with pytest.raises(RuntimeError, match="openapi_file"):
+        served.openapi._apispec.to_dict()
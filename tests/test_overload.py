@@ -0,0 +1,101 @@
+"""Event-loop lag monitoring and admission control."""
+
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+import responder
+from responder.ext.overload import AdmissionController, LoopLagMonitor
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def _api(**options):
+    return responder.API(allowed_hosts=[";"], **options)
+
+
+def test_lag_is_sampled_and_exported():
+    monitor = LoopLagMonitor(interval=0.01)
+    api = _api(metrics_route="/metrics", loop_monitor=monitor)
+
+    with api.requests as client:
+        _wait_for(lambda: monitor.samples >= 3)
+        body = client.get("/metrics").text
+    assert "# TYPE responder_event_loop_lag_seconds histogram" in body
+    assert 'responder_event_loop_lag_seconds_bucket{le="+Inf"}' in body
+    assert monitor._task is None  # stopped at shutdown
+
+
+def test_blocked_loop_is_logged_with_stack(caplog):
+    caplog.set_level(logging.WARNING, logger="responder.loop")
+    monitor = LoopLagMonitor(interval=0.01, slow_callback=0.05)
+    api = _api(loop_monitor=monitor)
+
+    @api.route("/block")
+    async def hog_the_loop(req, resp):
+        time.sleep(0.3)
+
+    with api.requests as client:
+        _wait_for(lambda: monitor.samples >= 1)
+        client.get("/block")
+        _wait_for(lambda: monitor.lag >= 0.05)
+
+    (record,) = [r for r in caplog.records if r.name == "responder.loop"]
+    assert "loop thread stack" in record.getMessage()
+    assert "in hog_the_loop" in record.getMessage()
+    assert monitor.total >= 0.2
+
+
+def test_sheds_when_lag_exceeds_limit():
+    api = _api(max_loop_lag=0.05, health_route="/health")
+
+    @api.route("/")
+    def index(req, resp):
+        resp.text = "ok"
+
+    assert api.requests.get("/").status_code == 200
+    api.loop_monitor.lag = 0.2  # as if the last sample saw the loop stall
+    response = api.requests.get("/")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    # The health route is always admitted.
+    assert api.requests.get("/health").status_code == 200
+    assert api._admission.shed == {"lag": 1, "in_flight": 0}
+
+
+def test_sheds_over_max_in_flight():
+    api = _api(max_in_flight=1, metrics_route="/metrics")
+    entered, release = threading.Event(), threading.Event()
+    statuses = []
+
+    @api.route("/slow")
+    async def slow(req, resp):
+        entered.set()
+        while not release.is_set():
+            await asyncio.sleep(0.005)
+
+    with api.requests as client:
+        first = threading.Thread(target=lambda: statuses.append(client.get("/slow")))
+        first.start()
+        assert entered.wait(5)
+        assert client.get("/slow").status_code == 503
+        body = client.get("/metrics").text
+        assert "responder_requests_in_flight 1" in body
+        assert 'responder_requests_shed_total{reason="in_flight"} 1' in body
+        release.set()
+        first.join()
+    assert statuses[0].status_code == 200
+    assert api._admission.in_flight == 0
+
+
+def test_max_lag_requires_monitor():
+    with pytest.raises(ValueError, match="LoopLagMonitor"):
+        AdmissionController(max_lag=0.1)
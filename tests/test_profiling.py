@@ -0,0 +1,110 @@
+"""On-demand sampling profiler behind ``profiling_route``."""
+
+import threading
+import time
+
+import pytest
+
+import responder
+from responder.ext.auth import BearerAuth
+from responder.ext.profiling import sample
+
+TOKEN = {"Authorization": "Bearer s3cret"}
+
+
+def _spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def _api(**options):
+    options.setdefault("profiling_auth", BearerAuth(tokens=["s3cret"]))
+    api = responder.API(allowed_hosts=[";"], profiling_route="/debug/profile", **options)
+
+    @api.route("/hot")
+    def hot_handler(req, resp):
+        _spin(0.3)
+        resp.text = "done"
+
+    return api
+
+
+def test_sample_finds_busy_thread():
+    worker = threading.Thread(target=_spin, args=(0.3,), name="spinner")
+    worker.start()
+    profile = sample(0.2, interval=0.005)
+    worker.join()
+    assert profile.samples
+    collapsed = profile.collapsed()
+    assert "thread:spinner;" in collapsed
+    assert "threading:Thread.run;tests.test_profiling:_spin " in collapsed
+
+
+def test_profiler_finds_hot_handler():
+    api = _api()
+    stop = threading.Event()
+
+    with api.requests as client:
+
+        def load():
+            while not stop.is_set():
+                client.get("/hot")
+
+        loader = threading.Thread(target=load)
+        loader.start()
+        try:
+            time.sleep(0.05)
+            response = client.get("/debug/profile?seconds=0.5&rate=200", headers=TOKEN)
+        finally:
+            stop.set()
+            loader.join()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    hot = [line for line in response.text.splitlines() if "hot_handler" in line]
+    assert hot
+    # The hot handler's stacks carry most of the samples.
+    counts = [int(line.rsplit(" ", 1)[1]) for line in response.text.splitlines()]
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in hot) > sum(counts) / 2
+
+
+def test_speedscope_format():
+    api = _api()
+    response = api.requests.get(
+        "/debug/profile?seconds=0.05&format=speedscope&idle=1", headers=TOKEN
+    )
+    document = response.json()
+    assert document["$schema"].startswith("https://www.speedscope.app/")
+    (profile,) = document["profiles"]
+    assert profile["type"] == "sampled"
+    assert len(profile["samples"]) == len(profile["weights"])
+    frames = document["shared"]["frames"]
+    assert all(index < len(frames) for stack in profile["samples"] for index in stack)
+
+
+def test_profile_requires_auth():
+    api = _api()
+    assert api.requests.get("/debug/profile?seconds=0.01").status_code == 401
+
+
+def test_profiling_route_must_be_protected():
+    with pytest.raises(ValueError, match="profiling_auth"):
+        responder.API(allowed_hosts=[";"], profiling_route="/debug/profile")
+    # Debug mode may leave it open, and app-level auth covers it.
+    responder.API(allowed_hosts=[";"], profiling_route="/debug/profile", debug=True)
+    api = responder.API(
+        allowed_hosts=[";"],
+        profiling_route="/debug/profile",
+        auth=BearerAuth(tokens=["s3cret"]),
+    )
+    assert api.requests.get("/debug/profile?seconds=0.01").status_code == 401
+
+
+@pytest.mark.parametrize(
+    "query", ["seconds=0", "seconds=600", "seconds=x", "rate=0", "format=svg"]
+)
+def test_invalid_parameters(query):
+    api = _api()
+    response = api.requests.get(f"/debug/profile?{query}", headers=TOKEN)
+    assert response.status_code == 400
@@ -0,0 +1,157 @@
+"""GCRA token-bucket rate-limit backends, in-process and shared memory."""
+
+import asyncio
+import fcntl
+import multiprocessing
+
+import pytest
+
+import responder
+from responder.ext import ratelimit
+from responder.ext.ratelimit import (
+    GCRABackend,
+    MemoryBackend,
+    RateLimiter,
+    SharedMemoryBackend,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_allows_limit_then_refills_at_sustained_rate(clock):
+    backend = GCRABackend()
+    results = [backend.hit("client", 5, 10) for _ in range(6)]
+    assert results == [(True, 4), (True, 3), (True, 2), (True, 1), (True, 0), (False, 0)]
+    clock[0] += 2  # one request's worth (10s / 5)
+    assert backend.hit("client", 5, 10) == (True, 0)
+    assert backend.hit("client", 5, 10) == (False, 0)
+    clock[0] += 10
+    assert backend.hit("client", 5, 10) == (True, 4)
+
+
+def test_burst_caps_back_to_back_requests(clock):
+    backend = GCRABackend()
+    # 3600 an hour sustained, but only 3 at once.
+    assert [backend.hit("k", 3600, 3600, burst=3)[0] for _ in range(4)] == [
+        True,
+        True,
+        True,
+        False,
+    ]
+    clock[0] += 1
+    assert backend.hit("k", 3600, 3600, burst=3) == (True, 0)
+
+
+def test_stores_one_float_per_key_and_evicts_per_shard():
+    backend = GCRABackend(max_keys=8, shards=2)
+    for i in range(100):
+        backend.hit(f"ip-{i}", 10_000, 60)
+    tats = [t for _, shard in backend._shards for t in shard.values()]
+    assert len(tats) <= 8
+    assert all(isinstance(t, float) for t in tats)
+
+
+def test_limiter_with_burst():
+    api = responder.API(allowed_hosts=[";"])
+    limiter = RateLimiter(requests=1000, period=3600, burst=2, backend=GCRABackend())
+    limiter.install(api)
+
+    @api.route("/")
+    def index(req, resp):
+        resp.text = "ok"
+
+    codes = [api.requests.get("/").status_code for _ in range(3)]
+    assert codes == [200, 200, 429]
+
+
+def test_burst_requires_supporting_backend():
+    with pytest.raises(ValueError, match="burst"):
+        RateLimiter(burst=5, backend=MemoryBackend())
+
+
+def _shared_worker(path, hits):
+    backend = SharedMemoryBackend(path)
+    return sum(backend.hit("client", 150, 3600)[0] for _ in range(hits))
+
+
+def test_shared_memory_backend_enforces_one_limit_across_processes(tmp_path):
+    path = str(tmp_path / "ratelimit")
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        allowed = pool.starmap(_shared_worker, [(path, 100)] * 4)
+    assert sum(allowed) == 150
+    # A new process (or worker) sees the same, exhausted bucket.
+    assert SharedMemoryBackend(path).hit("client", 150, 3600) == (False, 0)
+
+
+def test_shared_memory_backend_matches_gcra(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "time", lambda: now[0])
+    backend = SharedMemoryBackend(tmp_path / "rl", slots=64)
+    assert [backend.hit("k", 3, 30) for _ in range(4)] == [
+        (True, 2),
+        (True, 1),
+        (True, 0),
+        (False, 0),
+    ]
+    now[0] += 10
+    assert backend.hit("k", 3, 30) == (True, 0)
+    now[0] += 30
+    assert backend.hit("k", 3, 30, burst=1) == (True, 0)
+    assert backend.hit("k", 3, 30, burst=1) == (False, 0)
+    # The table keeps the size its creator chose.
+    assert SharedMemoryBackend(tmp_path / "rl", slots=4096)._sets == 2
+
+
+def _hold_table_lock(path, locked, release):
+    with open(path, "r+b") as f:
+        fcntl.lockf(f, fcntl.LOCK_EX)
+        locked.set()
+        release.wait(10)
+
+
+def test_shared_memory_backend_never_blocks_the_event_loop(tmp_path):
+    path = tmp_path / "rl"
+    backend = SharedMemoryBackend(path, slots=32)
+    assert asyncio.run(backend.ahit("k", 3, 30)) == (True, 2)
+    # Another worker process holds the table; the hit waits in a thread.
+    context = multiprocessing.get_context("spawn")
+    locked, release = context.Event(), context.Event()
+    holder = context.Process(target=_hold_table_lock, args=(path, locked, release))
+    holder.start()
+    try:
+        assert locked.wait(10)
+
+        async def main():
+            hit = asyncio.ensure_future(backend.ahit("k", 3, 30))
+            many = asyncio.ensure_future(backend.ahit_many([("k", 3, 30, None)]))
+            await asyncio.sleep(0.1)
+            assert not hit.done() and not many.done()  # the loop kept running
+            release.set()
+            return await hit, await many
+
+        assert asyncio.run(main()) == ((True, 1), [(True, 0)])
+    finally:
+        release.set()
+        holder.join()
+    backend.close()
+
+
+def test_shared_memory_backend_replaces_oldest_entry_when_set_is_full(tmp_path):
+    backend = SharedMemoryBackend(tmp_path / "rl", slots=32)  # a single set
+    for i in range(100):
+        assert backend.hit(f"ip-{i}", 10, 60)[0]
+    # The hottest key keeps its (latest) arrival time.
+    assert backend.hit("ip-99", 10, 60) == (True, 8)
+    backend.close()
+
+
+def test_shared_memory_backend_rejects_foreign_file(tmp_path):
+    path = tmp_path / "other"
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError, match="not a rate-limit table"):
+        SharedMemoryBackend(path)
@@ -0,0 +1,169 @@
+"""Two-tier rate limiting: workers lease token batches from a shared store."""
+
+import asyncio
+
+import pytest
+
+import responder
+from responder.ext import ratelimit
+from responder.ext.ratelimit import (
+    AsyncRedisBackend,
+    GCRABackend,
+    LeasingBackend,
+    MemoryBackend,
+    RateLimiter,
+    SharedMemoryBackend,
+)
+
+
+class FakeSharedBackend:
+    """In-process stand-in for a shared store: a fixed window per key."""
+
+    def __init__(self):
+        self.used = {}
+        self.calls = 0
+        self.given = []
+        self.gate = None
+
+    async def atake(self, key, tokens, max_requests, period):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        used = self.used.get(key, 0)
+        granted = max(0, min(tokens, max_requests - used))
+        self.used[key] = used + granted
+        return granted, max_requests - used - granted
+
+    async def agive(self, key, tokens, max_requests, period, age):
+        self.given.append(tokens)
+        self.used[key] -= min(tokens, self.used[key])
+
+
+class FakeAsyncRedis:
+    """Emulates the take script of ``AsyncRedisBackend``."""
+
+    def __init__(self):
+        self.counts = {}
+        self.expiries = {}
+
+    async def eval(self, script, numkeys, key, period, limit, tokens):
+        used = self.counts.get(key, 0)
+        granted = min(tokens, limit - used)
+        if granted <= 0:
+            return [0, 0]
+        self.counts[key] = used + granted
+        self.expiries.setdefault(key, period)
+        return [granted, limit - used - granted]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_spends_leased_batches_locally(clock):
+    shared = FakeSharedBackend()
+    backend = LeasingBackend(shared, lease=0.1)
+
+    async def run():
+        return [await backend.ahit("client", 100, 60) for _ in range(25)]
+
+    results = asyncio.run(run())
+    assert all(allowed for allowed, _ in results)
+    assert [remaining for _, remaining in results[:3]] == [99, 98, 97]
+    assert shared.calls == backend.leases == 3
+    assert shared.used["client"] == 30
+
+
+def test_workers_never_exceed_the_shared_limit(clock):
+    shared = GCRABackend()
+    workers = [LeasingBackend(shared, lease=0.25) for _ in range(3)]
+    allowed = sum(workers[i % 3].hit("client", 20, 3600)[0] for i in range(60))
+    assert allowed == 20
+    # Once refused, a worker refuses locally without asking the store again.
+    leases = [w.leases for w in workers]
+    assert not any(w.hit("client", 20, 3600)[0] for w in workers)
+    assert [w.leases for w in workers] == leases
+
+
+def test_expired_lease_is_renewed(clock):
+    shared = FakeSharedBackend()
+    backend = LeasingBackend(shared, lease=0.5, max_age=1.0)
+    asyncio.run(backend.ahit("client", 10, 60))
+    clock[0] += 1.5
+    asyncio.run(backend.ahit("client", 10, 60))
+    # The four unspent tokens of the first lease were given back first.
+    assert shared.calls == 2
+    assert shared.given == [4]
+    assert shared.used["client"] == 6
+
+
+def test_slow_client_is_charged_only_for_requests_served(clock):
+    shared = FakeSharedBackend()
+    backend = LeasingBackend(shared, lease=0.05, max_age=1.0)
+
+    async def run():
+        served = 0
+        for _ in range(100):
+            allowed, _ = await backend.ahit("c", 1000, 60)
+            served += allowed
+            clock[0] += 1.1
+        return served
+
+    assert asyncio.run(run()) == 100
+    # Every request served, plus the rest of the last lease, still held.
+    assert shared.used == {"c": 100 + 49}
+    assert shared.given == [49] * 99
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_unspent_tokens_return_to_a_token_bucket(clock, tmp_path, shared):
+    store = SharedMemoryBackend(tmp_path / "rl") if shared else GCRABackend()
+    backend = LeasingBackend(store, lease=0.25, max_age=1.0)
+    served = 0
+    for _ in range(20):
+        served += backend.hit("c", 20, 3600)[0]
+        clock[0] += 1.1
+    assert served == 20
+    assert backend.leases == 20
+
+
+def test_concurrent_requests_share_one_lease(clock):
+    shared = FakeSharedBackend()
+    backend = LeasingBackend(shared, lease=0.1)
+
+    async def run():
+        shared.gate = asyncio.Event()
+        hits = [asyncio.ensure_future(backend.ahit("client", 100, 60)) for _ in range(5)]
+        await asyncio.sleep(0)
+        shared.gate.set()
+        return await asyncio.gather(*hits)
+
+    results = asyncio.run(run())
+    assert all(allowed for allowed, _ in results)
+    assert shared.calls == 1
+
+
+def test_limiter_over_async_redis():
+    fake = FakeAsyncRedis()
+    backend = LeasingBackend(AsyncRedisBackend(client=fake), lease=0.5)
+    api = responder.API(allowed_hosts=[";"])
+    RateLimiter(requests=4, period=60, backend=backend).install(api)
+
+    @api.route("/")
+    def index(req, resp):
+        resp.text = "ok"
+
+    codes = [api.requests.get("/").status_code for _ in range(5)]
+    assert codes == [200, 200, 200, 200, 429]
+    assert backend.leases == 3  # two batches of two, then the refusal
+    assert fake.expiries == {"responder:ratelimit:testclient": 60}
+
+
+def test_backend_must_support_take():
+    with pytest.raises(TypeError, match="take"):
+        LeasingBackend(MemoryBackend())
+    with pytest.raises(ValueError, match="lease"):
+        LeasingBackend(GCRABackend(), lease=0)
@@ -269,3 +269,19 @@ def test_resp_render_requires_api():
 
     with pytest.raises(RuntimeError, match="bound to an API"):
         resp.render("x.html")
+
+
+def test_metrics_buckets_option():
+    api = responder.API(
+        metrics_route="/metrics",
+        metrics_buckets={"/slow": (1, 30)},
+        allowed_hosts=[";"],
+    )
+
+    @api.route("/slow")
+    def slow(req, resp):
+        resp.text = "ok"
+
+    api.requests.get("/slow")
+    body = api.requests.get("/metrics").text
+    assert 'path="/slow",le="30"} 1' in body
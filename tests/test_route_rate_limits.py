@@ -0,0 +1,178 @@
+"""Declarative per-route rate limits: ``@api.route(..., rate_limit=[...])``."""
+
+import pytest
+
+import responder
+from responder.ext.auth import APIKeyAuth, BearerAuth
+from responder.ext.ratelimit import (
+    AsyncRedisBackend,
+    GCRABackend,
+    Limit,
+    MemoryBackend,
+    RouteLimiter,
+    SharedMemoryBackend,
+)
+
+
+class CountingBackend(GCRABackend):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def hit_many(self, hits):
+        self.batches.append([key for key, *_ in hits])
+        return super().hit_many(hits)
+
+
+class FakeAsyncRedis:
+    """Emulates the multi-window script of ``AsyncRedisBackend``."""
+
+    def __init__(self):
+        self.counts = {}
+        self.calls = 0
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        self.calls += 1
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        limits = args[1::2]
+        used = [self.counts.get(key, 0) for key in keys]
+        admitted = all(u < limit for u, limit in zip(used, limits, strict=True))
+        left = []
+        for key, u, limit in zip(keys, used, limits, strict=True):
+            if admitted:
+                self.counts[key] = u + 1
+                left.append(limit - u - 1)
+            else:
+                left.append(-1 if u >= limit else limit - u)
+        return left
+
+
+def _api(**options):
+    return responder.API(allowed_hosts=[";"], **options)
+
+
+def test_windows_are_checked_in_one_batched_call():
+    backend = CountingBackend()
+    api = _api(rate_limit_backend=backend)
+
+    @api.route("/search", rate_limit=[Limit("2/s"), Limit("100/h")])
+    def search(req, resp):
+        resp.text = "ok"
+
+    responses = [api.requests.get("/search") for _ in range(3)]
+    assert [r.status_code for r in responses] == [200, 200, 429]
+    assert responses[0].headers["x-ratelimit-limit"] == "2"
+    assert responses[0].headers["x-ratelimit-remaining"] == "1"
+    assert responses[2].headers["retry-after"] == "1"
+    assert len(backend.batches) == 3
+    assert backend.batches[0] == [
+        "/search|2/1|ip:testclient",
+        "/search|100/3600|ip:testclient",
+    ]
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_refused_request_is_not_charged_to_other_windows(shared, tmp_path):
+    backend = SharedMemoryBackend(tmp_path / "rl") if shared else GCRABackend()
+    hits = [("a", 1, 60, None), ("b", 5, 60, None)]
+    assert backend.hit_many(hits) == [(True, 0), (True, 4)]
+    assert backend.hit_many(hits) == [(False, 0), (True, 4)]
+    assert backend.hit("b", 5, 60) == (True, 3)
+
+
+def test_memory_backend_hit_many_is_all_or_nothing():
+    backend = MemoryBackend()
+    hits = [("a", 1, 60, None), ("b", 5, 60, None)]
+    assert backend.hit_many(hits) == [(True, 0), (True, 4)]
+    assert backend.hit_many(hits) == [(False, 0), (True, 4)]
+
+
+def test_user_key_uses_the_authenticated_principal():
+    api = _api()
+    auth = BearerAuth(verify=lambda token: {"sub": token[:5]})
+
+    @api.route("/me", auth=auth, rate_limit=Limit("1/m", key="user"))
+    def me(req, resp):
+        resp.text = "ok"
+
+    def get(token):
+        return api.requests.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert get("alice-1").status_code == 200
+    assert get("alice-2").status_code == 429  # same principal
+    assert get("bobby-1").status_code == 200
+    # Authentication runs first, so unauthenticated calls still get a 401.
+    assert api.requests.get("/me").status_code == 401
+
+
+def test_api_key_and_route_keys():
+    backend = CountingBackend()
+    api = _api(rate_limit_backend=backend)
+    auth = APIKeyAuth(keys=["k1", "k2"], name="X-Key")
+
+    @api.route("/data", auth=auth, rate_limit=Limit("1/m", key="api_key"))
+    def data(req, resp):
+        resp.text = "ok"
+
+    @api.route("/global", rate_limit=Limit("2/m", key="route"))
+    def everyone(req, resp):
+        resp.text = "ok"
+
+    assert api.requests.get("/data", headers={"X-Key": "k1"}).status_code == 200
+    assert api.requests.get("/data", headers={"X-Key": "k1"}).status_code == 429
+    assert api.requests.get("/data", headers={"X-Key": "k2"}).status_code == 200
+    # The key itself never reaches the store, only a digest of it.
+    assert all("k1" not in key for batch in backend.batches for key in batch)
+    assert isinstance(data._route_rate_limit, RouteLimiter)
+
+    assert [api.requests.get("/global").status_code for _ in range(3)] == [
+        200,
+        200,
+        429,
+    ]
+    assert backend.batches[-1] == ["/global|2/60|*"]
+
+
+def test_named_limits_share_a_budget():
+    api = _api()
+    shared = Limit("1/m", name="exports")
+
+    @api.route("/a", rate_limit=shared)
+    def a(req, resp):
+        resp.text = "a"
+
+    @api.route("/b", rate_limit=shared)
+    def b(req, resp):
+        resp.text = "b"
+
+    assert api.requests.get("/a").status_code == 200
+    assert api.requests.get("/b").status_code == 429
+
+
+def test_async_redis_backend_batches_windows():
+    fake = FakeAsyncRedis()
+    api = _api(rate_limit_backend=AsyncRedisBackend(client=fake))
+
+    @api.route("/", rate_limit=["2/s", "3/m"])
+    def index(req, resp):
+        resp.text = "ok"
+
+    codes = [api.requests.get("/").status_code for _ in range(3)]
+    assert codes == [200, 200, 429]
+    assert fake.calls == 3
+    assert sorted(fake.counts.values()) == [2, 2]
+
+
+@pytest.mark.parametrize("rate", ["10", "ten/s", "10/fortnight", "0/s"])
+def test_invalid_rates(rate):
+    with pytest.raises(ValueError, match="Invalid rate"):
+        Limit(rate)
+
+
+def test_rate_formats():
+    assert (Limit("10/s").requests, Limit("10/s").period) == (10, 1)
+    assert Limit("1000/hour").period == 3600
+    assert Limit("5/10m").period == 600
+    assert Limit("3/days").period == 86400
+    with pytest.raises(ValueError, match="key"):
+        Limit("1/s", key="tenant")
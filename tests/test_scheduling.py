@@ -0,0 +1,143 @@
+"""@api.every / @api.cron jobs run between startup and shutdown."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+
+import pytest
+
+import responder
+from responder.scheduling import CronSchedule
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_every_runs_while_app_is_up(api):
+    runs = []
+
+    @api.every(0.01)
+    async def tick():
+        runs.append(time.monotonic())
+
+    assert runs == []  # nothing runs before startup
+    with api.requests:
+        _wait_for(lambda: len(runs) >= 3)
+    count = len(runs)
+    time.sleep(0.05)
+    assert len(runs) == count  # cancelled at shutdown
+
+
+def test_every_sync_job_runs_off_loop(api):
+    seen = threading.Event()
+
+    @api.every(0.01, run_on_startup=True)
+    def sync_job():
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            seen.set()
+
+    with api.requests:
+        assert seen.wait(5)
+
+
+def test_run_on_startup(api):
+    runs = []
+
+    @api.every(3600, run_on_startup=True)
+    async def warm():
+        runs.append(1)
+
+    with api.requests:
+        _wait_for(lambda: runs)
+
+
+def test_skip_if_running(api):
+    release = asyncio.Event()
+    started = []
+
+    @api.every(0.01, run_on_startup=True)
+    async def slow():
+        started.append(1)
+        await release.wait()
+
+    with api.requests:
+        task = api.router.scheduler.tasks[0]
+        _wait_for(lambda: task.skipped >= 3)
+        assert len(started) == 1
+
+
+def test_overlap_allowed(api):
+    started = []
+
+    @api.every(0.01, run_on_startup=True, skip_if_running=False)
+    async def slow():
+        started.append(1)
+        await asyncio.sleep(10)
+
+    with api.requests:
+        _wait_for(lambda: len(started) >= 3)
+
+
+def test_failures_are_logged_and_counted(api, caplog):
+    @api.every(0.01, run_on_startup=True, name="broken")
+    async def broken():
+        raise RuntimeError("nope")
+
+    with api.requests:
+        task = api.router.scheduler.tasks[0]
+        _wait_for(lambda: task.failures >= 1)
+    assert "Scheduled task broken failed" in caplog.text
+
+
+def test_scheduled_task_metrics():
+    api = responder.API(metrics_route="/metrics", allowed_hosts=[";"])
+
+    @api.every(0.01, run_on_startup=True, name="refresh")
+    def refresh():
+        pass
+
+    with api.requests as client:
+        _wait_for(lambda: api.router.scheduler.tasks[0].runs >= 1)
+        body = client.get("/metrics").text
+    assert 'responder_scheduled_task_runs_total{task="refresh",outcome="success"}' in body
+    assert 'responder_scheduled_task_duration_seconds_count{task="refresh"}' in body
+
+
+def test_cron_registers_and_rejects_bad_expressions(api):
+    @api.cron("*/5 * * * *")
+    def every_five():
+        pass
+
+    assert api.router.scheduler.tasks[0].cron.minutes == set(range(0, 60, 5))
+    with pytest.raises(ValueError, match="5 fields"):
+        api.cron("* * *")
+    with pytest.raises(ValueError, match="out of range"):
+        api.cron("61 * * * *")
+
+
+@pytest.mark.parametrize(
+    "expression, moment, expected",
+    [
+        ("*/5 * * * *", datetime(2026, 1, 1, 10, 3, 30), datetime(2026, 1, 1, 10, 5)),
+        ("*/5 * * * *", datetime(2026, 1, 1, 10, 5), datetime(2026, 1, 1, 10, 10)),
+        ("0 9 * * mon-fri", datetime(2026, 1, 2, 9, 30), datetime(2026, 1, 5, 9, 0)),
+        ("@daily", datetime(2026, 12, 31, 23, 59), datetime(2027, 1, 1, 0, 0)),
+        ("0 0 29 feb *", datetime(2026, 3, 1), datetime(2028, 2, 29, 0, 0)),
+        # Both day fields restricted: either one matches (the 1st, or Sunday).
+        ("0 0 1 * 0", datetime(2026, 1, 2), datetime(2026, 1, 4, 0, 0)),
+    ],
+)
+def test_cron_next_after(expression, moment, expected):
+    assert CronSchedule(expression).next_after(moment) == expected
+
+
+def test_cron_that_never_matches():
+    with pytest.raises(ValueError, match="never matches"):
+        CronSchedule("0 0 31 feb *").next_after(datetime(2026, 1, 1))
@@ -0,0 +1,213 @@
+"""Write-behind session persistence: queued writes, collapsed touches."""
+
+import asyncio
+
+import pytest
+
+import responder
+from responder.ext import sessions
+from responder.ext.sessions import (
+    MemorySessionBackend,
+    RedisSessionBackend,
+    WriteBehindSessionBackend,
+)
+
+
+class BatchCountingBackend(MemorySessionBackend):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self.fail = False
+
+    def write_batch(self, sets, touches, deletes):
+        if self.fail:
+            raise ConnectionError("backend down")
+        self.batches.append((sets, touches, deletes))
+        super().write_batch(sets, touches, deletes)
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, *args))
+
+    def execute(self):
+        self.client.round_trips.append(self.commands)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.round_trips = []
+
+    def pipeline(self, transaction=True):
+        assert transaction is False
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sessions.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _api(backend):
+    api = responder.API(
+        allowed_hosts=[";"], session_backend=backend, session_https_only=False
+    )
+
+    @api.route("/login", methods=["POST"])
+    def login(req, resp):
+        req.session["user"] = "kenneth"
+        resp.media = {"stored": backend.backend.sets_seen()}
+
+    @api.route("/whoami")
+    def whoami(req, resp):
+        resp.media = {"user": req.session.get("user")}
+
+    return api
+
+
+def test_writes_are_queued_and_drained_at_shutdown(clock):
+    inner = BatchCountingBackend()
+    inner.sets_seen = lambda: len(inner._store)
+    backend = WriteBehindSessionBackend(inner, flush_interval=3600)
+    api = _api(backend)
+
+    with api.requests as client:
+        # The response went out before the backend saw the write...
+        assert client.post("/login").json() == {"stored": 0}
+        # ...but the session is readable at once, and TTL slides are collapsed.
+        for _ in range(5):
+            assert client.get("/whoami").json() == {"user": "kenneth"}
+        assert inner.batches == []
+        assert backend.pending == 1
+
+    ((sets, touches, deletes),) = inner.batches
+    assert [data for _, data, _ in sets] == [{"user": "kenneth"}]
+    assert (touches, deletes) == ([], [])
+    assert backend.pending == 0
+
+
+def test_touches_are_collapsed_per_interval(clock):
+    inner = BatchCountingBackend()
+    backend = WriteBehindSessionBackend(inner, touch_interval=60)
+
+    async def run():
+        await backend.start()
+        await backend.aset("s1", {"a": 1}, 100)
+        await backend.flush()
+        for _ in range(10):
+            await backend.atouch("s1", 100)
+        assert backend.pending == 0  # refreshed by the write just now
+        clock[0] += 61
+        for _ in range(10):
+            await backend.atouch("s1", 100)
+        await backend.stop()
+
+    asyncio.run(run())
+    assert [touches for _, touches, _ in inner.batches] == [[], [("s1", 100)]]
+
+
+def test_batches_are_bounded_and_flushed_early():
+    inner = BatchCountingBackend()
+    backend = WriteBehindSessionBackend(inner, flush_interval=3600, max_batch=3)
+
+    async def run():
+        await backend.start()
+        for i in range(7):
+            await backend.aset(f"s{i}", {"i": i}, 100)
+        for _ in range(200):  # the full batch wakes the flush task
+            if inner.batches:
+                break
+            await asyncio.sleep(0.01)
+        flushed = len(inner.batches)
+        await backend.adelete("s0")
+        assert await backend.aget("s0") is None
+        await backend.stop()
+        return flushed
+
+    assert asyncio.run(run()) >= 1
+    assert all(len(sets) + len(deletes) <= 3 for sets, _, deletes in inner.batches)
+    assert sorted(inner._store) == [f"s{i}" for i in range(1, 7)]
+
+
+def test_failed_flush_is_retried():
+    inner = BatchCountingBackend()
+    backend = WriteBehindSessionBackend(inner, flush_interval=3600)
+
+    async def run():
+        await backend.start()
+        await backend.aset("s1", {"a": 1}, 100)
+        inner.fail = True
+        assert await backend.flush() is False
+        assert await backend.aget("s1") == {"a": 1}
+        inner.fail = False
+        await backend.stop()
+
+    asyncio.run(run())
+    assert inner.get("s1") == {"a": 1}
+
+
+def test_failed_flush_keeps_its_touches(clock):
+    inner = BatchCountingBackend()
+    backend = WriteBehindSessionBackend(inner, flush_interval=3600, touch_interval=60)
+    inner.set("s1", {"a": 1}, 100)
+
+    async def run():
+        await backend.start()
+        await backend.atouch("s1", 100)
+        inner.fail = True
+        assert await backend.flush() is False
+        # Still queued, though the refresh was recorded and won't be re-queued.
+        await backend.atouch("s1", 100)
+        assert backend.pending == 1
+        inner.fail = False
+        await backend.stop()
+
+    asyncio.run(run())
+    assert [touches for _, touches, _ in inner.batches] == [[("s1", 100)]]
+
+
+def test_restarts_on_a_new_event_loop():
+    inner = BatchCountingBackend()
+    backend = WriteBehindSessionBackend(inner)
+
+    async def run(i):
+        await backend.start()
+        await backend.aset(f"s{i}", {"i": i}, 100)
+        await asyncio.sleep(0.1)  # the flush task waits on the wakeup event
+        await backend.stop()
+
+    asyncio.run(run(1))
+    asyncio.run(run(2))
+    assert sorted(inner._store) == ["s1", "s2"]
+
+
+def test_writes_go_straight_through_without_lifespan():
+    inner = BatchCountingBackend()
+    inner.sets_seen = lambda: len(inner._store)
+    api = _api(WriteBehindSessionBackend(inner))
+    assert api.requests.post("/login").json() == {"stored": 0}
+    assert len(inner._store) == 1
+
+
+def test_redis_batches_are_pipelined():
+    client = FakeRedis()
+    backend = RedisSessionBackend(client=client, prefix="s:")
+    backend.write_batch([("a", {"x": 1}, 60)], [("b", 60)], ["c", "d"])
+    assert client.round_trips == [
+        [
+            ("setex", "s:a", 60, '{"x": 1}'),
+            ("expire", "s:b", 60),
+            ("delete", "s:c", "s:d"),
+        ]
+    ]
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError, match="flush_interval"):
+        WriteBehindSessionBackend(MemorySessionBackend(), flush_interval=0)
@@ -0,0 +1,145 @@
+"""SQLiteSessionBackend: a persistent, host-wide session store."""
+
+import asyncio
+import multiprocessing
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import responder
+from responder.ext import sessions
+from responder.ext.sessions import (
+    AsyncSessionBackend,
+    SessionBackend,
+    SQLiteSessionBackend,
+    WriteBehindSessionBackend,
+)
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteSessionBackend(tmp_path / "sessions.db")
+    yield backend
+    backend.close()
+
+
+def test_sync_and_async_round_trip(backend):
+    assert isinstance(backend, SessionBackend)
+    assert isinstance(backend, AsyncSessionBackend)
+    backend.set("s1", {"user": "kenneth", "cart": [1, 2]}, 60)
+    assert backend.get("s1") == {"user": "kenneth", "cart": [1, 2]}
+
+    async def run():
+        await backend.aset("s2", {"n": 1}, 60)
+        await backend.atouch("s2", 120)
+        value = await backend.aget("s2")
+        await backend.adelete("s1")
+        return value, await backend.aget("s1")
+
+    assert asyncio.run(run()) == ({"n": 1}, None)
+
+
+def test_wal_mode_and_expiry_index(backend):
+    backend.set("s1", {}, 60)
+    conn = sqlite3.connect(backend.path)
+    assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    indexes = [row[1] for row in conn.execute("PRAGMA index_list(responder_sessions)")]
+    assert "responder_sessions_expires" in indexes
+    conn.close()
+
+
+def test_expired_rows_are_hidden_then_swept_in_batches(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sessions.time, "time", lambda: now[0])
+    backend = SQLiteSessionBackend(tmp_path / "s.db", sweep_batch=2)
+    backend.write_batch([(f"s{i}", {"i": i}, 10) for i in range(5)], [], [])
+    backend.set("live", {"i": 99}, 100)
+    now[0] += 11
+    assert backend.get("s0") is None
+    assert [backend.sweep() for _ in range(4)] == [2, 2, 1, 0]
+    assert backend.get("live") == {"i": 99}
+    backend.close()
+
+
+def test_sweeps_run_on_a_timer(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sessions.time, "time", lambda: now[0])
+    backend = SQLiteSessionBackend(tmp_path / "s.db", sweep_interval=0.01)
+    backend.set("old", {}, 1)
+    now[0] += 2
+    conn = sqlite3.connect(backend.path)
+    for _ in range(200):
+        if not conn.execute("SELECT count(*) FROM responder_sessions").fetchone()[0]:
+            break
+        time.sleep(0.01)
+    assert conn.execute("SELECT count(*) FROM responder_sessions").fetchone() == (0,)
+    conn.close()
+    backend.close()
+
+
+def test_sweeps_are_not_postponed_by_a_busy_queue(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(sessions.time, "time", lambda: now[0])
+    backend = SQLiteSessionBackend(tmp_path / "s.db", sweep_interval=0.05)
+    backend.set("old", {}, 1)
+    now[0] += 2
+    release = threading.Event()
+    blocker = backend._submit(lambda conn: release.wait(5))
+    # Queued behind the blocker, so the worker never finds its queue empty.
+    count = backend._submit(
+        lambda conn: conn.execute("SELECT count(*) FROM responder_sessions").fetchone()
+    )
+    time.sleep(0.1)  # the sweep is now due
+    release.set()
+    blocker.result(timeout=5)
+    assert count.result(timeout=5) == (0,)
+    backend.close()
+
+
+def _worker(path, i):
+    backend = SQLiteSessionBackend(path)
+    backend.set(f"s{i}", {"worker": i}, 60)
+    seen = backend.get("s0")
+    backend.close()
+    return seen
+
+
+def test_sessions_are_shared_across_processes(tmp_path):
+    path = str(tmp_path / "shared.db")
+    SQLiteSessionBackend(path).set("s0", {"worker": 0}, 60)
+    with multiprocessing.get_context("spawn").Pool(3) as pool:
+        seen = pool.starmap(_worker, [(path, i) for i in range(1, 4)])
+    assert seen == [{"worker": 0}] * 3
+    assert SQLiteSessionBackend(path).get("s3") == {"worker": 3}
+
+
+def test_as_api_session_backend(tmp_path):
+    backend = WriteBehindSessionBackend(SQLiteSessionBackend(tmp_path / "s.db"))
+    api = responder.API(
+        allowed_hosts=[";"], session_backend=backend, session_https_only=False
+    )
+
+    @api.route("/login", methods=["POST"])
+    def login(req, resp):
+        req.session["user"] = "kenneth"
+
+    @api.route("/whoami")
+    def whoami(req, resp):
+        resp.media = {"user": req.session.get("user")}
+
+    with api.requests as client:
+        client.post("/login")
+        assert client.get("/whoami").json() == {"user": "kenneth"}
+    # Drained at shutdown: a fresh process would find the session on disk.
+    (stored,) = SQLiteSessionBackend(tmp_path / "s.db")._call(
+        lambda conn: conn.execute("SELECT data FROM responder_sessions").fetchall()
+    )
+    assert stored == ('{"user": "kenneth"}',)
+
+
+def test_closed_backend_restarts_on_next_use(backend):
+    backend.set("s1", {"a": 1}, 60)
+    backend.close()
+    assert backend.get("s1") == {"a": 1}
@@ -0,0 +1,96 @@
+"""Slow-request watchdog: requests over the threshold are logged with stacks."""
+
+import asyncio
+import logging
+import time
+
+import pytest
+
+import responder
+
+
+@pytest.fixture
+def slow_log(caplog):
+    caplog.set_level(logging.WARNING, logger="responder.slow")
+    return caplog
+
+
+def _api(**options):
+    return responder.API(allowed_hosts=[";"], slow_request_threshold=0.05, **options)
+
+
+def _reports(caplog):
+    return [r.getMessage() for r in caplog.records if r.name == "responder.slow"]
+
+
+def test_sync_handler_logs_worker_stack(slow_log):
+    api = _api()
+
+    @api.route("/users/{id}")
+    def stuck_in_sync_code(req, resp, *, id):
+        time.sleep(0.2)
+        resp.text = "ok"
+
+    response = api.requests.get("/users/1", headers={"X-Request-ID": "rid-1"})
+    assert response.headers["x-request-id"] == "rid-1"
+    (report,) = _reports(slow_log)
+    assert "GET /users/{id} [req:rid-1] still running after" in report
+    assert "Worker thread stack:" in report
+    assert "in stuck_in_sync_code" in report
+    assert "Coroutine stack" in report
+
+
+def test_async_handler_logs_coroutine_stack(slow_log):
+    api = _api()
+
+    @api.route("/wait")
+    async def waiting_on_upstream(req, resp):
+        await asyncio.sleep(0.2)
+
+    api.requests.get("/wait")
+    (report,) = _reports(slow_log)
+    assert "in waiting_on_upstream" in report
+    assert "Worker thread stack" not in report
+
+
+def test_loop_blocking_code_logs_loop_stack(slow_log):
+    api = _api()
+
+    @api.route("/block")
+    async def blocks_the_loop(req, resp):
+        time.sleep(0.2)
+
+    api.requests.get("/block")
+    (report,) = _reports(slow_log)
+    assert "Event loop thread stack:" in report
+    assert "in blocks_the_loop" in report
+
+
+def test_fast_requests_are_not_logged(slow_log):
+    api = _api(enable_logging=True)
+
+    @api.route("/")
+    def index(req, resp):
+        resp.text = "ok"
+
+    for _ in range(5):
+        api.requests.get("/")
+    time.sleep(0.1)
+    assert _reports(slow_log) == []
+
+
+def test_works_with_logging_middleware(slow_log):
+    api = _api(enable_logging=True)
+
+    @api.route("/slow")
+    def slow(req, resp):
+        time.sleep(0.2)
+
+    api.requests.get("/slow", headers={"X-Request-ID": "abc"})
+    (report,) = _reports(slow_log)
+    assert "[req:abc]" in report
+
+
+def test_invalid_threshold():
+    with pytest.raises(ValueError, match="positive"):
+        responder.API(slow_request_threshold=0)
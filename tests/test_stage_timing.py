@@ -0,0 +1,104 @@
+"""Per-stage dispatch timing: stage histograms and the Server-Timing header."""
+
+import time
+
+import pytest
+
+import responder
+from responder.ext.metrics import MetricsCollector
+
+
+def _api(**options):
+    api = responder.API(allowed_hosts=[";"], **options)
+
+    @api.route("/slow")
+    def slow(req, resp):
+        time.sleep(0.02)
+        resp.text = "ok"
+
+    return api
+
+
+def _timings(response):
+    header = response.headers["server-timing"]
+    return {
+        name: float(dur.split("=")[1])
+        for name, dur in (entry.split(";") for entry in header.split(", "))
+    }
+
+
+def test_stage_histograms_are_recorded():
+    api = _api(metrics_route="/metrics")
+    api.requests.get("/slow")
+    sums = api.metrics.stage_sum
+    assert {stage for method, path, stage in sums} >= {
+        "auth",
+        "dependencies",
+        "handler",
+        "response",
+    }
+    assert sums[("GET", "/slow", "handler")] >= 0.02
+    assert sums[("GET", "/slow", "auth")] < 0.02
+
+    body = api.requests.get("/metrics").text
+    assert "# TYPE responder_request_stage_seconds histogram" in body
+    assert (
+        'responder_request_stage_seconds_count{method="GET",path="/slow",'
+        'stage="handler"} 1' in body
+    )
+    # Stage series don't leak into the request counters.
+    assert set(api.metrics.latency_count) == {("GET", "/slow"), ("GET", "/metrics")}
+
+
+def test_hooks_are_timed():
+    api = _api(metrics_route="/metrics")
+
+    @api.route(before_request=True)
+    def before(req, resp):
+        time.sleep(0.01)
+
+    @api.after_request()
+    def after(req, resp):
+        time.sleep(0.01)
+
+    api.requests.get("/slow")
+    sums = api.metrics.stage_sum
+    assert sums[("GET", "/slow", "before_hook")] >= 0.01
+    assert sums[("GET", "/slow", "after_hook")] >= 0.01
+
+
+def test_server_timing_header():
+    api = _api(server_timing=True)
+    timings = _timings(api.requests.get("/slow"))
+    assert timings["handler"] >= 20
+    assert timings["total"] >= timings["handler"]
+    assert "auth" in timings
+
+
+def test_server_timing_off_by_default():
+    api = _api(metrics_route="/metrics")
+    assert "server-timing" not in api.requests.get("/slow").headers
+
+
+@pytest.mark.parametrize("rate, present", [(1.0, True), (0.0, False)])
+def test_server_timing_sample_rate(rate, present):
+    api = _api(server_timing=rate)
+    assert ("server-timing" in api.requests.get("/slow").headers) is present
+
+
+def test_server_timing_trusted_predicate():
+    api = _api(server_timing=lambda conn: conn.headers.get("x-internal") == "1")
+    assert "server-timing" not in api.requests.get("/slow").headers
+    response = api.requests.get("/slow", headers={"X-Internal": "1"})
+    assert "handler" in _timings(response)
+
+
+def test_stage_series_in_multiprocess_mode(tmp_path):
+    collector = MetricsCollector(multiprocess_dir=tmp_path)
+    collector.record("GET", "/a", 200, 0.01)
+    collector.record_stages("GET", "/a", {"handler": 0.004, "auth": 0.0002})
+    other = MetricsCollector(multiprocess_dir=tmp_path)
+    other.record_stages("GET", "/a", {"handler": 0.006})
+    assert other.stage_sum[("GET", "/a", "handler")] == pytest.approx(0.01)
+    assert other.requests == {("GET", "/a", "200"): 1}
+    assert 'stage="auth",le="0.00025"} 1' in other.render()